@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ConventionConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'convention'
+
+    def ready(self):
+        import convention.signals  # noqa: F401
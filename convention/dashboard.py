@@ -0,0 +1,187 @@
+"""
+Live dashboard counters for HQ convention staff.
+
+Each tracked row (member registration, guest, travel plan, accommodation)
+contributes a small set of counter deltas to its convention. convention/signals.py
+captures a row's contribution before it is saved and applies the difference
+afterwards as a single F() UPDATE on ConventionDashboardCounter, inside the same
+transaction as the change itself. QuerySet.update() and bulk_create() bypass
+signals; run `python manage.py rebuild_convention_dashboard --verify` after any
+bulk edit.
+"""
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .models import (
+    ConventionRegistration,
+    ConventionGuest,
+    ConventionTravel,
+    ConventionAccommodation,
+    ConventionDashboardCounter,
+)
+
+COUNTER_FIELDS = (
+    'registered', 'confirmed', 'checked_in', 'cancelled', 'waitlisted',
+    'guests', 'travel_booked', 'travel_pending', 'rooms_assigned', 'resumes_uploaded',
+)
+
+def _travel_is_booked(outbound_flight_number, return_flight_number):
+    # Same definition as admin_travel_list's ?booked=true filter
+    return bool(outbound_flight_number) and bool(return_flight_number)
+
+
+def registration_contribution(convention_id, is_guest, status_code, resume):
+    counts = {}
+    if not is_guest and status_code in COUNTER_FIELDS:
+        counts[status_code] = 1
+    if resume:
+        counts['resumes_uploaded'] = 1
+    return {convention_id: counts} if counts else {}
+
+
+def guest_contribution(convention_id):
+    return {convention_id: {'guests': 1}}
+
+
+def travel_contribution(convention_id, travel_method, outbound_flight_number, return_flight_number):
+    if _travel_is_booked(outbound_flight_number, return_flight_number):
+        return {convention_id: {'travel_booked': 1}}
+    if travel_method == 'need_booking':
+        return {convention_id: {'travel_pending': 1}}
+    return {}
+
+
+def accommodation_contribution(convention_id, room_number):
+    return {convention_id: {'rooms_assigned': 1}} if room_number else {}
+
+
+# Fields each tracked model's contribution is computed from, in argument order,
+# and the foreign key that leads to its convention.
+CONTRIBUTIONS = {
+    ConventionRegistration: ('convention', ('is_guest', 'status_code', 'resume'), registration_contribution),
+    ConventionGuest: ('registration', (), guest_contribution),
+    ConventionTravel: (
+        'registration',
+        ('travel_method', 'outbound_flight_number', 'return_flight_number'),
+        travel_contribution,
+    ),
+    ConventionAccommodation: ('registration', ('room_number',), accommodation_contribution),
+}
+
+
+def tracks_update(model, update_fields):
+    """False when a save(update_fields=...) cannot change the model's contribution."""
+    if update_fields is None:
+        return True
+    parent, fields, _ = CONTRIBUTIONS[model]
+    return bool(set(update_fields) & {parent, f'{parent}_id', *fields})
+
+
+def instance_contribution(instance, convention_id):
+    _, fields, func = CONTRIBUTIONS[type(instance)]
+    return func(convention_id, *(getattr(instance, f) for f in fields))
+
+
+def stored_contribution(model, pk):
+    """Contribution of the row as currently stored, or {} if it does not exist."""
+    parent, fields, func = CONTRIBUTIONS[model]
+    convention_path = 'convention_id' if parent == 'convention' else 'registration__convention_id'
+    row = model.objects.filter(pk=pk).values_list(convention_path, *fields).first()
+    return func(*row) if row else {}
+
+
+def diff_contributions(old, new):
+    """Return {convention_id: {field: delta}} with zero deltas dropped."""
+    deltas = {}
+    for sign, contribution in ((-1, old), (1, new)):
+        for convention_id, counts in contribution.items():
+            for field, n in counts.items():
+                conv = deltas.setdefault(convention_id, {})
+                conv[field] = conv.get(field, 0) + sign * n
+    return {
+        convention_id: {f: d for f, d in counts.items() if d}
+        for convention_id, counts in deltas.items()
+        if any(counts.values())
+    }
+
+
+def apply_deltas(deltas):
+    """
+    Adjust counters in place. Conventions without a counter row are skipped;
+    rebuild_dashboard_counter creates the row before it counts.
+    """
+    now = timezone.now()
+    for convention_id, counts in deltas.items():
+        if not convention_id or not counts:
+            continue
+        updates = {field: F(field) + delta for field, delta in counts.items()}
+        ConventionDashboardCounter.objects.filter(convention_id=convention_id).update(
+            version=F('version') + 1, updated_at=now, **updates
+        )
+
+
+def compute_counts(convention_id):
+    """Count everything from scratch — used to build, rebuild and verify."""
+    counts = dict.fromkeys(COUNTER_FIELDS, 0)
+
+    registrations = ConventionRegistration.objects.filter(convention_id=convention_id)
+    for row in (
+        registrations.filter(is_guest=False)
+        .values('status_code').annotate(count=Count('id')).order_by()
+    ):
+        if row['status_code'] in counts:
+            counts[row['status_code']] += row['count']
+    counts['resumes_uploaded'] = registrations.exclude(resume='').exclude(resume__isnull=True).count()
+
+    counts['guests'] = ConventionGuest.objects.filter(registration__convention_id=convention_id).count()
+
+    booked = ~Q(outbound_flight_number='') & ~Q(return_flight_number='')
+    travel = ConventionTravel.objects.filter(registration__convention_id=convention_id).aggregate(
+        booked=Count('id', filter=booked),
+        pending=Count('id', filter=~booked & Q(travel_method='need_booking')),
+    )
+    counts['travel_booked'] = travel['booked']
+    counts['travel_pending'] = travel['pending']
+
+    counts['rooms_assigned'] = (
+        ConventionAccommodation.objects.filter(registration__convention_id=convention_id)
+        .exclude(room_number='').count()
+    )
+    return counts
+
+
+def rebuild_dashboard_counter(convention_id):
+    """
+    Overwrite a convention's counters with freshly computed totals.
+
+    The row is created (and committed) before counting, and locked while the
+    totals are computed and written. A change committed before the lock is in
+    the count; one committed after it waits for the lock and adds its delta on
+    top, so nothing slips through while the row is being built.
+    """
+    ConventionDashboardCounter.objects.get_or_create(convention_id=convention_id)
+    with transaction.atomic():
+        counter = ConventionDashboardCounter.objects.select_for_update().get(convention_id=convention_id)
+        for field, value in compute_counts(convention_id).items():
+            setattr(counter, field, value)
+        counter.version += 1
+        counter.save()
+    return counter
+
+
+def get_dashboard_counter(convention):
+    """Return the counter row for a convention, building it on first use."""
+    try:
+        return ConventionDashboardCounter.objects.get(convention=convention)
+    except ConventionDashboardCounter.DoesNotExist:
+        return rebuild_dashboard_counter(convention.id)
+
+
+def serialize_dashboard_counter(counter):
+    return {
+        'convention_id': counter.convention_id,
+        **{field: getattr(counter, field) for field in COUNTER_FIELDS},
+        'version': counter.version,
+        'updated_at': counter.updated_at.isoformat(),
+    }
@@ -0,0 +1,323 @@
+"""
+Management command to load-test the member convention registration flow.
+
+Run with:
+  python manage.py bench_convention                              # 50 users, 10 threads
+  python manage.py bench_convention --users 300 --concurrency 30
+  python manage.py bench_convention --output bench.json --max-p95-ms 500
+
+Replays a registration-open spike against a throwaway test database built from
+the configured DATABASES entry (a temporary SQLite file locally, test_<name> on
+MySQL), so it never touches live data:
+
+  1. register — every simulated member POSTs /api/convention/my-registration/
+                at the same moment.
+  2. updates  — every member then loads their registration and submits travel,
+                accommodation and a guest (add + edit), concurrently.
+
+For each endpoint it reports throughput, latency percentiles, SQL query counts
+and time spent in SELECT ... FOR UPDATE (lock waits). SQLite has no row locks:
+contention there surfaces as 500s from "database is locked" when a transaction
+that has already read tries to write, so use MySQL settings for capacity numbers.
+"""
+
+import json
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+
+def _percentile(values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return 0.0
+    index = max(0, min(len(values) - 1, int(round(pct / 100 * len(values))) - 1))
+    return values[index]
+
+
+class _QueryRecorder:
+    """connection.execute_wrapper hook counting queries and row-lock wait time."""
+
+    def __init__(self):
+        self.queries = 0
+        self.lock_wait = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries += 1
+        if 'FOR UPDATE' not in sql.upper():
+            return execute(sql, params, many, context)
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.lock_wait += time.perf_counter() - start
+
+
+class Command(BaseCommand):
+    help = 'Benchmark concurrent convention registration, travel, accommodation and guest updates'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50, help='Number of simulated members (default 50)')
+        parser.add_argument('--concurrency', type=int, default=10, help='Worker threads (default 10)')
+        parser.add_argument('--seed', type=int, default=None, help='Random seed for a repeatable request mix')
+        parser.add_argument('--output', help='Write the results as JSON to this path')
+        parser.add_argument(
+            '--max-p95-ms',
+            type=float,
+            default=None,
+            help='Exit with an error if any endpoint p95 latency exceeds this many milliseconds',
+        )
+        parser.add_argument('--keepdb', action='store_true', help='Keep the benchmark test database afterwards')
+
+    def handle(self, *args, **options):
+        if settings.ENVIRONMENT == 'production':
+            raise CommandError('Refusing to run the benchmark with production settings.')
+        if options['users'] < 1 or options['concurrency'] < 1:
+            raise CommandError('--users and --concurrency must be at least 1.')
+
+        self.random = random.Random(options['seed'])
+        self.stats = defaultdict(lambda: {
+            'latencies': [], 'queries': 0, 'lock_wait': 0.0, 'lock_wait_max': 0.0,
+            'statuses': defaultdict(int), 'phase': None,
+        })
+        self.stats_lock = threading.Lock()
+        self.phase_elapsed = {}
+
+        tmp_dir = None
+        settings_dict = connection.settings_dict
+        if settings_dict['ENGINE'].endswith('sqlite3'):
+            # A file (not :memory:) so every worker thread sees the same database
+            tmp_dir = tempfile.mkdtemp(prefix='bench_convention_')
+            settings_dict['TEST']['NAME'] = os.path.join(tmp_dir, 'bench.sqlite3')
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False, keepdb=options['keepdb'],
+        )
+        try:
+            self.stdout.write(f"Benchmark database: {connection.settings_dict['NAME']} ({connection.vendor})")
+            clients = self.seed(options['users'])
+            registration_ids = {}
+            self.run_phase('register', clients, options['concurrency'], self.register_member, registration_ids)
+            self.run_phase('updates', clients, options['concurrency'], self.update_member, registration_ids)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+            teardown_test_environment()
+            if tmp_dir:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        results = self.summarize(options)
+        self.report(results)
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+
+        if options['max_p95_ms'] is not None:
+            slow = [name for name, row in results['endpoints'].items() if row['p95_ms'] > options['max_p95_ms']]
+            if slow:
+                raise CommandError(f"p95 latency above {options['max_p95_ms']:.0f}ms for: {', '.join(slow)}")
+
+    # -------------------------------------------------------------------------
+    # setup
+    # -------------------------------------------------------------------------
+    def seed(self, user_count):
+        """Create the active convention, guest meals and logged-in member clients."""
+        from accounts.models import Person, User
+        from convention.models import Convention, ConventionMeal
+
+        today = date.today()
+        convention = Convention.objects.create(
+            name='Benchmark Convention',
+            year=today.year,
+            location='Benchmark City',
+            start_date=today + timedelta(days=60),
+            end_date=today + timedelta(days=63),
+            registration_open_date=today,
+            registration_close_date=today + timedelta(days=30),
+            is_active=True,
+        )
+        self.meal_ids = [
+            ConventionMeal.objects.create(convention=convention, name=name, price=price, sort_order=i).id
+            for i, (name, price) in enumerate([('Banquet', 65), ('Awards Lunch', 35)])
+        ]
+        self.convention = convention
+
+        clients = []
+        for i in range(user_count):
+            person = Person.objects.create(first_name=f'Bench{i}', last_name=f'Member{i:05d}')
+            user = User.objects.create_user(email=f'bench{i}@example.invalid', person=person)
+            # Server errors come back as 500s; the test client's re-raise hook is
+            # a global signal and would leak one thread's exception into another.
+            client = Client(raise_request_exception=False)
+            client.force_login(user)
+            clients.append(client)
+
+        self.stdout.write(f'Seeded {user_count} members for {convention}.')
+        return clients
+
+    # -------------------------------------------------------------------------
+    # scenarios
+    # -------------------------------------------------------------------------
+    def run_phase(self, phase, clients, concurrency, scenario, registration_ids):
+        self.current_phase = phase
+        start_gate = threading.Event()
+
+        def worker(index):
+            start_gate.wait()
+            try:
+                scenario(index, clients[index], registration_ids)
+            finally:
+                connection.close()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = pool.map(worker, range(len(clients)))
+            # Every task is queued; release the first wave of workers together
+            start_gate.set()
+            list(results)
+        self.phase_elapsed[phase] = time.perf_counter() - started
+        self.stdout.write(f'Phase {phase!r} finished in {self.phase_elapsed[phase]:.2f}s')
+
+    def register_member(self, index, client, registration_ids):
+        response = self.call(client, 'post', 'POST my-registration', '/api/convention/my-registration/', {})
+        if response.status_code == 201:
+            registration_ids[index] = response.json()['id']
+
+    def update_member(self, index, client, registration_ids):
+        response = self.call(client, 'get', 'GET my-registration', '/api/convention/my-registration/')
+        registration_id = registration_ids.get(index)
+        if registration_id is None and response.status_code == 200:
+            registration_id = response.json().get('id')
+        if registration_id is None:
+            return
+
+        base = f'/api/convention/registration/{registration_id}'
+        departure = self.convention.start_date - timedelta(days=1)
+        steps = [
+            ('PUT travel', 'put', f'{base}/travel/', {
+                'travel_method': self.random.choice(['need_booking', 'self_booking', 'driving']),
+                'departure_airport': 'ATL',
+                'departure_date': departure.isoformat(),
+                'departure_time_preference': self.random.randrange(0, 1410, 30),
+                'return_airport': 'ATL',
+                'return_date': (self.convention.end_date + timedelta(days=1)).isoformat(),
+                'seat_preference': self.random.choice(['none', 'window', 'aisle']),
+            }),
+            ('PUT accommodation', 'put', f'{base}/accommodation/', {
+                'package_choice': self.random.choice(['full', 'partial', 'commuter']),
+                'roommate_preference': self.random.choice(['single', 'any']),
+                'food_allergies': self.random.sample(['milk', 'eggs', 'peanuts', 'soy'], k=self.random.randint(0, 2)),
+                'dietary_restrictions': self.random.sample(['vegetarian', 'vegan', 'halal'], k=self.random.randint(0, 1)),
+            }),
+            ('POST guests', 'post', f'{base}/guests/', {
+                'guest_first_name': f'Guest{index}',
+                'guest_last_name': 'Bench',
+                'guest_meal_ids': self.random.sample(self.meal_ids, k=self.random.randint(0, len(self.meal_ids))),
+            }),
+        ]
+        self.random.shuffle(steps)
+
+        for endpoint, method, path, payload in steps:
+            response = self.call(client, method, endpoint, path, payload)
+            if endpoint == 'POST guests' and response.status_code == 201:
+                guest_path = f"{base}/guests/{response.json()['id']}/"
+                self.call(client, 'put', 'PUT guest', guest_path, {'guest_special_requests': 'Aisle seat at banquet'})
+
+    def call(self, client, method, endpoint, path, payload=None):
+        recorder = _QueryRecorder()
+        kwargs = {} if payload is None else {'data': json.dumps(payload), 'content_type': 'application/json'}
+        start = time.perf_counter()
+        try:
+            with connection.execute_wrapper(recorder):
+                response = getattr(client, method)(path, **kwargs)
+            status_code = response.status_code
+        except Exception as exc:
+            response = None
+            status_code = type(exc).__name__
+        elapsed = time.perf_counter() - start
+
+        with self.stats_lock:
+            row = self.stats[endpoint]
+            row['phase'] = self.current_phase
+            row['latencies'].append(elapsed)
+            row['queries'] += recorder.queries
+            row['lock_wait'] += recorder.lock_wait
+            row['lock_wait_max'] = max(row['lock_wait_max'], recorder.lock_wait)
+            row['statuses'][status_code] += 1
+
+        if response is None:
+            return _FailedResponse()
+        return response
+
+    # -------------------------------------------------------------------------
+    # reporting
+    # -------------------------------------------------------------------------
+    def summarize(self, options):
+        endpoints = {}
+        for name, row in self.stats.items():
+            latencies = sorted(row['latencies'])
+            count = len(latencies)
+            errors = sum(n for code, n in row['statuses'].items() if not (isinstance(code, int) and code < 400))
+            elapsed = self.phase_elapsed.get(row['phase']) or 1e-9
+            endpoints[name] = {
+                'phase': row['phase'],
+                'requests': count,
+                'errors': errors,
+                'throughput_rps': round(count / elapsed, 2),
+                'p50_ms': round(_percentile(latencies, 50) * 1000, 1),
+                'p95_ms': round(_percentile(latencies, 95) * 1000, 1),
+                'p99_ms': round(_percentile(latencies, 99) * 1000, 1),
+                'max_ms': round(latencies[-1] * 1000, 1) if latencies else 0.0,
+                'queries_per_request': round(row['queries'] / count, 1) if count else 0.0,
+                'lock_wait_total_ms': round(row['lock_wait'] * 1000, 1),
+                'lock_wait_max_ms': round(row['lock_wait_max'] * 1000, 1),
+                'statuses': {str(code): n for code, n in sorted(row['statuses'].items(), key=str)},
+            }
+        return {
+            'database': connection.vendor,
+            'users': options['users'],
+            'concurrency': options['concurrency'],
+            'seed': options['seed'],
+            'phases': {name: round(seconds, 3) for name, seconds in self.phase_elapsed.items()},
+            'endpoints': endpoints,
+        }
+
+    def report(self, results):
+        header = (
+            f"{'endpoint':<22}{'reqs':>6}{'err':>5}{'req/s':>9}{'p50':>9}{'p95':>9}"
+            f"{'p99':>9}{'queries':>9}{'lock ms':>10}{'lock max':>10}"
+        )
+        self.stdout.write('')
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for name, row in sorted(results['endpoints'].items(), key=lambda item: (item[1]['phase'] != 'register', item[0])):
+            line = (
+                f"{name:<22}{row['requests']:>6}{row['errors']:>5}{row['throughput_rps']:>9.1f}"
+                f"{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}"
+                f"{row['queries_per_request']:>9.1f}{row['lock_wait_total_ms']:>10.1f}{row['lock_wait_max_ms']:>10.1f}"
+            )
+            self.stdout.write(self.style.ERROR(line) if row['errors'] else line)
+        self.stdout.write('Latencies in ms. Non-2xx responses per endpoint:')
+        for name, row in sorted(results['endpoints'].items()):
+            failures = {code: n for code, n in row['statuses'].items() if not code.startswith(('1', '2', '3'))}
+            if failures:
+                self.stdout.write(f'  {name}: {failures}')
+
+
+class _FailedResponse:
+    """Stand-in for a request that raised before returning a response."""
+    status_code = None
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from core.storage import BLOB_GRACE_PERIOD, content_addressed_storages
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete content-addressed resume and receipt blobs that no record points at any more. '
+        f'Blobs written or reused in the last {BLOB_GRACE_PERIOD} are kept. Schedule from cron, e.g. daily.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='List unreferenced blobs without deleting them',
+        )
+
+    def handle(self, *args, **options):
+        deleted = freed = 0
+        for storage in content_addressed_storages():
+            for name in storage.unreferenced_blobs():
+                size = storage.size(name)
+                if options['dry_run']:
+                    self.stdout.write(f'  {name} ({size} bytes)')
+                else:
+                    # delete() re-checks references, in case an upload reused the blob meanwhile
+                    storage.delete(name)
+                    if storage.exists(name):
+                        continue
+                deleted += 1
+                freed += size
+
+        verb = 'Would delete' if options['dry_run'] else 'Deleted'
+        self.stdout.write(self.style.SUCCESS(
+            f'Done. {verb} {deleted} unreferenced blob(s), {freed / (1024 * 1024):.1f} MB.'
+        ))
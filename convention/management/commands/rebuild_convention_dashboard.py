@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand, CommandError
+from convention.dashboard import COUNTER_FIELDS, compute_counts, rebuild_dashboard_counter
+from convention.models import Convention, ConventionDashboardCounter
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the HQ dashboard counters from scratch, or verify them against live counts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--convention-id', type=int,
+            help='Only this convention (default: every convention)',
+        )
+        parser.add_argument(
+            '--verify', action='store_true',
+            help='Compare stored counters with live counts without writing; exits non-zero on drift',
+        )
+
+    def handle(self, *args, **options):
+        conventions = Convention.objects.order_by('-year')
+        if options['convention_id']:
+            conventions = conventions.filter(id=options['convention_id'])
+            if not conventions.exists():
+                raise CommandError(f"Convention {options['convention_id']} does not exist.")
+
+        if options['verify']:
+            self._verify(conventions)
+            return
+
+        for convention in conventions:
+            counter = rebuild_dashboard_counter(convention.id)
+            summary = ', '.join(f'{field}={getattr(counter, field)}' for field in COUNTER_FIELDS)
+            self.stdout.write(f'  {convention}: {summary}')
+        self.stdout.write(self.style.SUCCESS(f'Done. {len(conventions)} convention(s) rebuilt.'))
+
+    def _verify(self, conventions):
+        stored = {c.convention_id: c for c in ConventionDashboardCounter.objects.filter(convention__in=conventions)}
+        drifted = 0
+        for convention in conventions:
+            counter = stored.get(convention.id)
+            if counter is None:
+                self.stdout.write(f'  {convention}: no counter row yet (built on first read)')
+                continue
+            live = compute_counts(convention.id)
+            mismatches = [
+                f'{field} stored={getattr(counter, field)} live={live[field]}'
+                for field in COUNTER_FIELDS
+                if getattr(counter, field) != live[field]
+            ]
+            if mismatches:
+                drifted += 1
+                self.stdout.write(self.style.WARNING(f'  {convention}: ' + '; '.join(mismatches)))
+            else:
+                self.stdout.write(f'  {convention}: OK')
+
+        if drifted:
+            raise CommandError(
+                f'{drifted} convention(s) have drifted. Run without --verify to rebuild.'
+            )
+        self.stdout.write(self.style.SUCCESS('All counters match.'))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from convention.travel_digest import send_travel_digests
+
+
+class Command(BaseCommand):
+    help = (
+        'Email travel coordinators a digest of travel plans submitted since the last run. '
+        'Schedule from cron, e.g. every 30 minutes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Render the digests and report counts without sending or marking anything',
+        )
+
+    def handle(self, *args, **options):
+        submissions, emails = send_travel_digests(dry_run=options['dry_run'])
+        if not submissions:
+            self.stdout.write('No pending travel submissions.')
+            return
+        verb = 'Would send' if options['dry_run'] else 'Sent'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {emails} digest email(s) covering {submissions} submission(s).'
+        ))
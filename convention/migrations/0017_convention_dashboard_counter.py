@@ -0,0 +1,36 @@
+# Generated by Django 5.0 on 2026-10-19 16:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('convention', '0016_convention_fully_paid_chapters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConventionDashboardCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('registered', models.IntegerField(default=0)),
+                ('confirmed', models.IntegerField(default=0)),
+                ('checked_in', models.IntegerField(default=0)),
+                ('cancelled', models.IntegerField(default=0)),
+                ('waitlisted', models.IntegerField(default=0)),
+                ('guests', models.IntegerField(default=0)),
+                ('travel_booked', models.IntegerField(default=0)),
+                ('travel_pending', models.IntegerField(default=0)),
+                ('rooms_assigned', models.IntegerField(default=0)),
+                ('resumes_uploaded', models.IntegerField(default=0)),
+                ('version', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('convention', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='dashboard_counter', to='convention.convention')),
+            ],
+            options={
+                'db_table': 'convention_dashboard_counter',
+            },
+        ),
+    ]
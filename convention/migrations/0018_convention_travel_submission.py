@@ -0,0 +1,27 @@
+# Generated by Django 5.0 on 2026-10-19 16:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('convention', '0017_convention_dashboard_counter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConventionTravelSubmission',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('digest_sent_at', models.DateTimeField(blank=True, null=True)),
+                ('travel', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='submissions', to='convention.conventiontravel')),
+            ],
+            options={
+                'db_table': 'convention_travel_submission',
+                'indexes': [models.Index(fields=['digest_sent_at', 'created_at'], name='convention__digest__c311df_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-19 16:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('convention', '0018_convention_travel_submission'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='convention',
+            name='resume_set_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.0 on 2026-10-19 17:19
+
+import convention.models
+import core.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('convention', '0019_convention_resume_set_version'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='conventionregistration',
+            name='resume',
+            field=models.FileField(blank=True, null=True, storage=core.storage.ContentAddressedStorage('resumes'), upload_to=convention.models.resume_upload_path),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-19 17:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('convention', '0020_alter_conventionregistration_resume'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conventiontravelsubmission',
+            name='digest_claimed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
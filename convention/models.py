@@ -4,6 +4,8 @@ from datetime import date
 from django.db import models
 from django.core.validators import MinValueValidator
 
+from core.storage import resume_storage
+
 
 def resume_upload_path(instance, filename):
     ext = os.path.splitext(filename)[1].lower()
@@ -47,6 +49,10 @@ class Convention(models.Model):
     late_fee = models.DecimalField(max_digits=8, decimal_places=2, null=True, blank=True, default=0)
     days_prior_to_start = models.IntegerField(default=3)
     is_active = models.BooleanField(default=True)
+    # Bumped after commit whenever the set of resumes recruiters can see changes
+    # (upload, removal, visibility, status, names, school or curricula); keys
+    # the prebuilt resume bundles.
+    resume_set_version = models.PositiveIntegerField(default=0, editable=False)
 
     # Accommodation package prices
     price_full_package_3_nights = models.DecimalField(max_digits=8, decimal_places=2, null=True, blank=True)
@@ -149,7 +155,8 @@ class ConventionRegistration(models.Model):
         choices=VISIBILITY_CHOICES,
         default='both',
     )
-    resume = models.FileField(upload_to=resume_upload_path, blank=True, null=True)
+    # Stored by content hash; see core/storage.py
+    resume = models.FileField(upload_to=resume_upload_path, storage=resume_storage, blank=True, null=True)
     resume_uploaded_at = models.DateTimeField(null=True, blank=True)
     resume_curricula = models.ManyToManyField(
         'accounts.ResumeCurriculum',
@@ -360,6 +367,7 @@ class ConventionTravel(models.Model):
     return_confirmation = models.CharField(max_length=50, blank=True)
     
     flight_notes = models.TextField(blank=True)
+    # Set once the first submission is queued for the coordinator digest
     travel_notification_sent = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -371,6 +379,31 @@ class ConventionTravel(models.Model):
         return f"Travel for {self.registration}"
 
 
+class ConventionTravelSubmission(models.Model):
+    """
+    A member's first travel plan submission, queued for the travel coordinators'
+    digest email. Sent in batches by `python manage.py send_travel_digest`;
+    digest_claimed_at marks rows a run has taken and is still sending.
+    """
+    travel = models.ForeignKey(
+        ConventionTravel,
+        on_delete=models.CASCADE,
+        related_name='submissions'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    digest_claimed_at = models.DateTimeField(null=True, blank=True)
+    digest_sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'convention_travel_submission'
+        indexes = [
+            models.Index(fields=['digest_sent_at', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"Travel submission for {self.travel.registration}"
+
+
 class ConventionAccommodation(models.Model):
     """
     Hotel and package information for a convention registration.
@@ -482,3 +515,37 @@ class ConventionTermsToken(models.Model):
 
     def __str__(self):
         return f"TermsToken for {self.registration}"
+
+
+class ConventionDashboardCounter(models.Model):
+    """
+    Running totals for the HQ convention dashboard, one row per convention.
+    Adjusted in place by convention/signals.py as registrations, travel,
+    accommodation and guests change, so polling never has to COUNT the
+    underlying tables. Rebuild or verify with
+    `python manage.py rebuild_convention_dashboard`.
+    """
+    convention = models.OneToOneField(
+        Convention,
+        on_delete=models.CASCADE,
+        related_name='dashboard_counter'
+    )
+    # Member (non-guest) registrations by status
+    registered = models.IntegerField(default=0)
+    confirmed = models.IntegerField(default=0)
+    checked_in = models.IntegerField(default=0)
+    cancelled = models.IntegerField(default=0)
+    waitlisted = models.IntegerField(default=0)
+    guests = models.IntegerField(default=0)
+    travel_booked = models.IntegerField(default=0)
+    travel_pending = models.IntegerField(default=0)
+    rooms_assigned = models.IntegerField(default=0)
+    resumes_uploaded = models.IntegerField(default=0)
+    version = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'convention_dashboard_counter'
+
+    def __str__(self):
+        return f"Dashboard counters for {self.convention}"
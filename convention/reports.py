@@ -0,0 +1,167 @@
+"""
+Aggregate reports for HQ convention staff.
+
+Counts are computed with GROUP BY queries in the database rather than by
+walking registrations in Python, and cached per convention. convention/signals.py
+drops a convention's cached report whenever the rows it is built from change.
+"""
+from django.core.cache import cache
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import (
+    ConventionRegistration,
+    ConventionGuest,
+    ConventionMeal,
+    ConventionAccommodation,
+)
+
+# Statuses that still expect to be fed
+ATTENDING_STATUSES = ('registered', 'confirmed', 'checked_in')
+
+CATERING_REPORT_TIMEOUT = 60 * 60  # safety net; signals invalidate on change
+
+
+def catering_report_cache_key(convention_id):
+    return f'convention:{convention_id}:catering_report'
+
+
+def invalidate_catering_report(convention_id):
+    if convention_id:
+        cache.delete(catering_report_cache_key(convention_id))
+
+
+def get_catering_report(convention):
+    """Return the cached catering report for a convention, building it on a miss."""
+    key = catering_report_cache_key(convention.id)
+    report = cache.get(key)
+    if report is None:
+        report = build_catering_report(convention)
+        cache.set(key, report, CATERING_REPORT_TIMEOUT)
+    return report
+
+
+def _empty_counts():
+    return {code: 0 for code, _ in ConventionRegistration.STATUS_CHOICES}
+
+
+def _with_totals(by_status):
+    return {
+        'by_status': by_status,
+        'attending': sum(by_status[s] for s in ATTENDING_STATUSES),
+        'total': sum(by_status.values()),
+    }
+
+
+def _tally_choice_lists(queryset, field, status_field, tallies):
+    """
+    Add per-choice counts for a JSON list field to `tallies`.
+    The database groups identical lists; only the distinct combinations are
+    expanded here, never individual registrations.
+    """
+    rows = queryset.values(field, status_field).annotate(count=Count('id')).order_by()
+    for row in rows:
+        for choice in row[field] or []:
+            tallies.setdefault(choice, _empty_counts())[row[status_field]] += row['count']
+
+
+def _tally_other_text(queryset, field, status_field, counts):
+    rows = (
+        queryset.exclude(**{field: ''})
+        .values(status_field)
+        .annotate(count=Count('id'))
+        .order_by()
+    )
+    for row in rows:
+        counts[row[status_field]] += row['count']
+
+
+def build_catering_report(convention):
+    """
+    Headcounts for catering: attendees, accommodation packages, guest meal
+    orders, food allergies and dietary restrictions, each by registration status.
+    Member allergies come from ConventionAccommodation, guest allergies from
+    ConventionGuest; both are combined per choice.
+    """
+    status_labels = dict(ConventionRegistration.STATUS_CHOICES)
+
+    # Attendees
+    members = _empty_counts()
+    for row in (
+        ConventionRegistration.objects.filter(convention=convention, is_guest=False)
+        .values('status_code').annotate(count=Count('id')).order_by()
+    ):
+        members[row['status_code']] += row['count']
+
+    guest_qs = ConventionGuest.objects.filter(registration__convention=convention)
+    guests = _empty_counts()
+    for row in guest_qs.values('registration__status_code').annotate(count=Count('id')).order_by():
+        guests[row['registration__status_code']] += row['count']
+
+    # Accommodation packages (which meals members are entitled to)
+    accommodation_qs = ConventionAccommodation.objects.filter(registration__convention=convention)
+    packages = {}
+    for row in (
+        accommodation_qs.values('package_choice', 'registration__status_code')
+        .annotate(count=Count('id')).order_by()
+    ):
+        packages.setdefault(row['package_choice'], _empty_counts())[row['registration__status_code']] += row['count']
+    package_labels = dict(ConventionAccommodation.PACKAGE_CHOICES)
+
+    # Guest meal orders — one GROUP BY over the guest_meals join table
+    GuestMeal = ConventionGuest.guest_meals.through
+    meal_counts = {}
+    for row in (
+        GuestMeal.objects.filter(conventionmeal__convention=convention)
+        .values('conventionmeal_id', 'conventionguest__registration__status_code')
+        .annotate(count=Count('id')).order_by()
+    ):
+        counts = meal_counts.setdefault(row['conventionmeal_id'], _empty_counts())
+        counts[row['conventionguest__registration__status_code']] += row['count']
+
+    meals = [
+        {
+            'id': meal.id,
+            'name': meal.name,
+            'is_active': meal.is_active,
+            **_with_totals(meal_counts.get(meal.id, _empty_counts())),
+        }
+        for meal in ConventionMeal.objects.filter(convention=convention)
+    ]
+
+    # Allergies and dietary restrictions (members + guests)
+    allergies, dietary = {}, {}
+    _tally_choice_lists(accommodation_qs, 'food_allergies', 'registration__status_code', allergies)
+    _tally_choice_lists(guest_qs, 'guest_food_allergies', 'registration__status_code', allergies)
+    _tally_choice_lists(accommodation_qs, 'dietary_restrictions', 'registration__status_code', dietary)
+    _tally_choice_lists(guest_qs, 'guest_dietary_restrictions', 'registration__status_code', dietary)
+
+    other_allergies, other_dietary = _empty_counts(), _empty_counts()
+    _tally_other_text(accommodation_qs, 'other_allergies', 'registration__status_code', other_allergies)
+    _tally_other_text(guest_qs, 'guest_food_allergies_other', 'registration__status_code', other_allergies)
+    _tally_other_text(accommodation_qs, 'dietary_restrictions_other', 'registration__status_code', other_dietary)
+    _tally_other_text(guest_qs, 'guest_dietary_restrictions_other', 'registration__status_code', other_dietary)
+
+    return {
+        'convention_id': convention.id,
+        'generated_at': timezone.now().isoformat(),
+        'statuses': [{'code': code, 'label': label} for code, label in status_labels.items()],
+        'attending_statuses': list(ATTENDING_STATUSES),
+        'headcount': {
+            'members': _with_totals(members),
+            'guests': _with_totals(guests),
+        },
+        'packages': [
+            {'package_choice': choice, 'label': package_labels.get(choice, choice), **_with_totals(counts)}
+            for choice, counts in sorted(packages.items())
+        ],
+        'meals': meals,
+        'food_allergies': [
+            {'value': value, **_with_totals(counts)} for value, counts in sorted(allergies.items())
+        ],
+        'food_allergies_other': _with_totals(other_allergies),
+        'dietary_restrictions': [
+            {'value': value, **_with_totals(counts)} for value, counts in sorted(dietary.items())
+        ],
+        'dietary_restrictions_other': _with_totals(other_dietary),
+    }
@@ -1206,6 +1206,9 @@ class PersonSearchSerializer(serializers.ModelSerializer):
         return None
 
     def get_has_active_registration(self, obj):
+        # Prefer the Exists() annotation from admin_person_search (no per-row query)
+        if hasattr(obj, 'has_active_registration'):
+            return obj.has_active_registration
         convention = self.context.get('convention')
         if not convention:
             return False
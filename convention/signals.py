@@ -0,0 +1,110 @@
+"""
+Django signals for convention caches and dashboard counters.
+Drops cached per-convention reports when the rows they are built from change,
+and keeps ConventionDashboardCounter in step with registrations, guests,
+travel and accommodation.
+"""
+
+from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from .models import (
+    ConventionRegistration,
+    ConventionGuest,
+    ConventionMeal,
+    ConventionAccommodation,
+    ConventionTravel,
+)
+from .dashboard import (
+    apply_deltas,
+    diff_contributions,
+    instance_contribution,
+    stored_contribution,
+    tracks_update,
+)
+from .reports import invalidate_catering_report
+
+
+def _registration_convention_id(registration_id):
+    return (
+        ConventionRegistration.objects.filter(pk=registration_id)
+        .values_list('convention_id', flat=True)
+        .first()
+    )
+
+
+def _convention_id(instance):
+    """Convention of a registration or of a registration's sub-record."""
+    if isinstance(instance, ConventionRegistration):
+        return instance.convention_id
+    if type(instance).registration.is_cached(instance):
+        return instance.registration.convention_id
+    # Remember the lookup so the catering and dashboard receivers share it
+    cached = instance.__dict__.get('_registration_convention')
+    if cached is None or cached[0] != instance.registration_id:
+        cached = (instance.registration_id, _registration_convention_id(instance.registration_id))
+        instance._registration_convention = cached
+    return cached[1]
+
+
+@receiver([post_save, post_delete], sender=ConventionRegistration)
+def registration_changed(sender, instance, **kwargs):
+    invalidate_catering_report(instance.convention_id)
+
+
+@receiver([post_save, post_delete], sender=ConventionMeal)
+def meal_changed(sender, instance, **kwargs):
+    invalidate_catering_report(instance.convention_id)
+
+
+@receiver([post_save, post_delete], sender=ConventionGuest)
+@receiver([post_save, post_delete], sender=ConventionAccommodation)
+def registration_detail_changed(sender, instance, **kwargs):
+    invalidate_catering_report(_convention_id(instance))
+
+
+@receiver(m2m_changed, sender=ConventionGuest.guest_meals.through)
+def guest_meals_changed(sender, instance, action, reverse, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if reverse:
+        # instance is a ConventionMeal
+        invalidate_catering_report(instance.convention_id)
+    else:
+        invalidate_catering_report(_convention_id(instance))
+
+
+# ── Dashboard counters ─────────────────────────────────────────────────────
+
+@receiver(pre_save, sender=ConventionRegistration)
+@receiver(pre_save, sender=ConventionGuest)
+@receiver(pre_save, sender=ConventionTravel)
+@receiver(pre_save, sender=ConventionAccommodation)
+def capture_dashboard_contribution(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Remember what the row counted for before this save overwrites it."""
+    if raw or not tracks_update(sender, update_fields):
+        instance._dashboard_before = None
+    elif instance._state.adding:
+        instance._dashboard_before = {}
+    else:
+        instance._dashboard_before = stored_contribution(sender, instance.pk)
+
+
+@receiver(post_save, sender=ConventionRegistration)
+@receiver(post_save, sender=ConventionGuest)
+@receiver(post_save, sender=ConventionTravel)
+@receiver(post_save, sender=ConventionAccommodation)
+def update_dashboard_on_save(sender, instance, **kwargs):
+    before = instance.__dict__.pop('_dashboard_before', None)
+    if before is None:
+        return
+    after = instance_contribution(instance, _convention_id(instance))
+    apply_deltas(diff_contributions(before, after))
+
+
+@receiver(post_delete, sender=ConventionRegistration)
+@receiver(post_delete, sender=ConventionGuest)
+@receiver(post_delete, sender=ConventionTravel)
+@receiver(post_delete, sender=ConventionAccommodation)
+def update_dashboard_on_delete(sender, instance, **kwargs):
+    apply_deltas(diff_contributions(instance_contribution(instance, _convention_id(instance)), {}))
@@ -0,0 +1,200 @@
+"""
+Travel coordinator digest emails.
+
+update_travel only records a ConventionTravelSubmission row; this module rolls
+the pending rows up into one email per coordinator per convention. It runs from
+cron via `python manage.py send_travel_digest`, never inside a request. Rows
+are claimed in a short locking transaction and the emails are sent after it
+commits, so SMTP never holds row locks.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import Q
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from accounts.models import User
+from .models import ConventionTravelSubmission
+
+logger = logging.getLogger(__name__)
+
+DOMAIN = getattr(settings, 'DOMAIN', 'localhost:8000')
+
+TRAVEL_METHOD_LABELS = {
+    'need_booking': 'Need Convention to Book',
+    'self_booking': 'Booking My Own',
+    'driving': 'Driving',
+}
+
+# Submissions claimed this long ago by a run that never finished are sent again
+STALE_CLAIM_AGE = timedelta(minutes=30)
+
+SUBMISSION_RELATED = (
+    'travel__registration__convention',
+    'travel__registration__person__member',
+    'travel__registration__person__user',
+)
+
+
+def _format_time_preference(minutes):
+    if minutes is None:
+        return 'No preference'
+    h, m = divmod(int(minutes), 60)
+    period = 'AM' if h < 12 else 'PM'
+    display_h = h % 12 or 12
+    return f"{display_h}:{m:02d} {period}"
+
+
+def _format_timestamp(n):
+    return f"{n.strftime('%B')} {n.day}, {n.year} at {n.hour % 12 or 12}:{n.strftime('%M')} {'AM' if n.hour < 12 else 'PM'}"
+
+
+def _submission_context(submission):
+    travel = submission.travel
+    return {
+        'person': travel.registration.person,
+        'travel': travel,
+        'travel_method_display': TRAVEL_METHOD_LABELS.get(travel.travel_method, travel.travel_method),
+        'departure_time_display': _format_time_preference(travel.departure_time_preference),
+        'return_time_display': _format_time_preference(travel.return_time_preference),
+        'submitted_at': _format_timestamp(submission.created_at),
+    }
+
+
+def _build_messages(convention, submissions, recipients):
+    entries = [_submission_context(s) for s in submissions]
+    needs_booking = sum(1 for e in entries if e['travel'].travel_method == 'need_booking')
+    html = render_to_string('convention/travel_plan_digest_email.html', {
+        'convention': convention,
+        'entries': entries,
+        'needs_booking_count': needs_booking,
+        'domain': DOMAIN,
+    })
+    subject = f'{convention.name} — {len(entries)} Travel Plan(s) Submitted'
+    messages = []
+    for email in recipients:
+        msg = EmailMultiAlternatives(subject=subject, body='', to=[email])
+        msg.attach_alternative(html, 'text/html')
+        messages.append(msg)
+    return messages
+
+
+def pending_submissions():
+    """Submissions not yet sent and not held by a running digest, oldest first."""
+    return (
+        ConventionTravelSubmission.objects
+        .filter(digest_sent_at__isnull=True)
+        .filter(
+            Q(digest_claimed_at__isnull=True) |
+            Q(digest_claimed_at__lt=timezone.now() - STALE_CLAIM_AGE)
+        )
+        .order_by('created_at')
+    )
+
+
+def _claim_pending():
+    """
+    Mark every pending submission as claimed by this run and return them.
+    Rows are locked with SKIP LOCKED only while claiming, so overlapping runs
+    never take the same submission and no lock is held while sending.
+    """
+    claimed_at = timezone.now()
+    with transaction.atomic():
+        pks = list(
+            pending_submissions()
+            .select_for_update(skip_locked=True, of=('self',))
+            .values_list('pk', flat=True)
+        )
+        ConventionTravelSubmission.objects.filter(pk__in=pks).update(digest_claimed_at=claimed_at)
+    submissions = list(
+        ConventionTravelSubmission.objects
+        .filter(pk__in=pks)
+        .select_related(*SUBMISSION_RELATED)
+        .order_by('created_at')
+    )
+    return submissions, claimed_at
+
+
+def _finish(submissions, claimed_at, sent):
+    """
+    Mark `submissions` sent, or release them for the next run if not every
+    email was delivered. No-op for rows another run has since reclaimed.
+    """
+    claimed = ConventionTravelSubmission.objects.filter(
+        pk__in=[s.pk for s in submissions], digest_claimed_at=claimed_at,
+    )
+    if sent:
+        return claimed.update(digest_sent_at=timezone.now())
+    return claimed.update(digest_claimed_at=None)
+
+
+def _by_convention(submissions):
+    by_convention = {}
+    for submission in submissions:
+        convention = submission.travel.registration.convention
+        by_convention.setdefault(convention.id, (convention, []))[1].append(submission)
+    return by_convention.values()
+
+
+def send_travel_digests(dry_run=False):
+    """
+    Send one digest per coordinator for every convention with pending submissions.
+    Returns (submissions_sent, emails_sent).
+
+    A convention's submissions are only marked sent once every coordinator's
+    email for it is delivered; otherwise they are released and go out in the
+    next run, which may repeat the digest for coordinators who did get it.
+    """
+    recipients = list(
+        User.objects.filter(groups__name='hq_convention_travel', is_active=True)
+        .exclude(email='')
+        .values_list('email', flat=True)
+        .distinct()
+    )
+    if not recipients:
+        logger.warning('Travel digest skipped: no active hq_convention_travel users')
+        return 0, 0
+
+    if dry_run:
+        pending = list(pending_submissions().select_related(*SUBMISSION_RELATED))
+        messages = [
+            message
+            for convention, submissions in _by_convention(pending)
+            for message in _build_messages(convention, submissions, recipients)
+        ]
+        return len(pending), len(messages)
+
+    pending, claimed_at = _claim_pending()
+    if not pending:
+        return 0, 0
+
+    submissions_sent = emails_sent = 0
+    # One SMTP connection for the whole batch
+    with get_connection() as connection:
+        for convention, submissions in _by_convention(pending):
+            messages = _build_messages(convention, submissions, recipients)
+            try:
+                sent = connection.send_messages(messages) or 0
+            except Exception:
+                logger.exception('Travel digest for convention %s failed; will retry', convention.id)
+                sent = 0
+            emails_sent += sent
+            delivered = sent == len(messages)
+            _finish(submissions, claimed_at, delivered)
+            if delivered:
+                submissions_sent += len(submissions)
+            else:
+                logger.warning(
+                    'Travel digest for convention %s: %d of %d email(s) sent; %d submission(s) left pending',
+                    convention.id, sent, len(messages), len(submissions),
+                )
+
+    logger.info(
+        'Travel digest sent: %d submission(s) to %d recipient(s) in %d email(s)',
+        submissions_sent, len(recipients), emails_sent,
+    )
+    return submissions_sent, emails_sent
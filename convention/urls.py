@@ -65,6 +65,10 @@ urlpatterns = [
     path('admin/fully-paid-chapters/', views.admin_fully_paid_chapters, name='admin-fully-paid-chapters'),
     path('admin/fully-paid-chapters/<int:record_id>/', views.admin_fully_paid_chapter_detail, name='admin-fully-paid-chapter-detail'),
 
+    # Reports (HQ staff)
+    path('admin/reports/catering/', views.admin_catering_report, name='admin-catering-report'),
+    path('admin/reports/dashboard/', views.admin_dashboard_counters, name='admin-dashboard-counters'),
+
     # Check-in endpoints (staff only)
     path('check-in/list/', views.check_in_list, name='check-in-list'),
     path('check-in/registration/<int:registration_id>/status/', views.update_registration_status, name='update-registration-status'),
@@ -32,6 +32,7 @@ from .models import (
     ConventionGuest,
     ConventionMeal,
     ConventionTravel,
+    ConventionTravelSubmission,
     ConventionAccommodation,
     ConventionTermsToken,
     ConventionFullyPaidChapter,
@@ -62,7 +63,9 @@ from .serializers import (
     FullyPaidChapterSerializer,
     FullyPaidChapterUpdateSerializer,
 )
-from accounts.models import Person, Address, PhoneNumber, User
+from .dashboard import get_dashboard_counter, serialize_dashboard_counter
+from .reports import get_catering_report
+from accounts.models import Person, Address, PhoneNumber
 import logging
 
 # Set up logging for audit trail
@@ -81,6 +84,15 @@ class AdminRateThrottle(UserRateThrottle):
     rate = '100/hour'
 
 
+class DashboardPollThrottle(UserRateThrottle):
+    """
+    Rate limiting for the live dashboard poll - 6 requests per minute,
+    enough for one open dashboard refreshing every 10 seconds.
+    """
+    scope = 'convention_dashboard'
+    rate = '6/minute'
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def current_convention(request):
@@ -432,22 +444,6 @@ def guest_detail(request, registration_id, guest_id):
         )
 
 
-def _format_time_preference(minutes):
-    if minutes is None:
-        return 'No preference'
-    h, m = divmod(int(minutes), 60)
-    period = 'AM' if h < 12 else 'PM'
-    display_h = h % 12 or 12
-    return f"{display_h}:{m:02d} {period}"
-
-
-TRAVEL_METHOD_LABELS = {
-    'need_booking': 'Need Convention to Book',
-    'self_booking': 'Booking My Own',
-    'driving': 'Driving',
-}
-
-
 @api_view(['PUT'])
 @permission_classes([IsAuthenticated])
 def update_travel(request, registration_id):
@@ -471,10 +467,15 @@ def update_travel(request, registration_id):
     )
 
     if serializer.is_valid():
-        updated_travel = serializer.save()
+        with transaction.atomic():
+            updated_travel = serializer.save()
 
-        if not travel.travel_notification_sent:
-            _notify_travel_coordinators(updated_travel, registration)
+            # Coordinators hear about the first submission in their next digest
+            # (manage.py send_travel_digest); nothing is emailed from the request.
+            if not updated_travel.travel_notification_sent:
+                ConventionTravelSubmission.objects.create(travel=updated_travel)
+                updated_travel.travel_notification_sent = True
+                updated_travel.save(update_fields=['travel_notification_sent'])
 
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -483,52 +484,6 @@ def update_travel(request, registration_id):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-def _notify_travel_coordinators(travel, registration):
-    """Send travel plan submission notification to all hq_convention_travel users."""
-    try:
-        from django.utils import timezone
-        recipients = list(
-            User.objects.filter(groups__name='hq_convention_travel', is_active=True)
-            .values_list('email', flat=True)
-        )
-        if not recipients:
-            return
-
-        person = registration.person
-        convention = registration.convention
-
-        message = render_to_string('convention/travel_plan_submitted_email.html', {
-            'person': person,
-            'convention': convention,
-            'travel': travel,
-            'registration': registration,
-            'travel_method_display': TRAVEL_METHOD_LABELS.get(travel.travel_method, travel.travel_method),
-            'departure_time_display': _format_time_preference(travel.departure_time_preference),
-            'return_time_display': _format_time_preference(travel.return_time_preference),
-            'submitted_at': (lambda n: f"{n.strftime('%B')} {n.day}, {n.year} at {n.hour % 12 or 12}:{n.strftime('%M')} {'AM' if n.hour < 12 else 'PM'}")(timezone.now()),
-            'domain': DOMAIN,
-        })
-
-        email_msg = EmailMultiAlternatives(
-            subject=f'{convention.name} — Travel Plan Submitted: {person.first_name} {person.last_name}',
-            body='',
-            to=recipients,
-        )
-        email_msg.attach_alternative(message, 'text/html')
-        email_msg.send()
-
-        travel.travel_notification_sent = True
-        travel.save(update_fields=['travel_notification_sent'])
-
-        logger.info(
-            'Travel plan notification sent for registration_id=%s to %d recipients',
-            registration.id, len(recipients),
-            extra={'person_id': person.id, 'travel_id': travel.id},
-        )
-    except Exception:
-        logger.exception('Failed to send travel plan notification for registration_id=%s', registration.id)
-
-
 @api_view(['PUT'])
 @permission_classes([IsAuthenticated])
 def update_accommodation(request, registration_id):
@@ -1427,6 +1382,7 @@ def admin_person_search(request):
     """
     Search persons by name or member_id.
     Returns up to 20 results annotated with whether they have an active convention registration.
+    Prefix matches on last name, first name or member ID rank ahead of substring hits.
     Query params: ?q=search_term
     """
     if not request.user.has_role('hq_staff'):
@@ -1441,12 +1397,26 @@ def admin_person_search(request):
     if not q or len(q) < 2:
         return Response([], status=status.HTTP_200_OK)
 
-    from django.db.models import Q
+    from django.db.models import Q, Exists, OuterRef, Case, When, Value, IntegerField
+    prefix_match = (
+        Q(last_name__istartswith=q) |
+        Q(first_name__istartswith=q) |
+        Q(member__member_id__istartswith=q)
+    )
     persons = Person.objects.filter(
         Q(first_name__icontains=q) |
         Q(last_name__icontains=q) |
         Q(member__member_id__icontains=q)
-    ).select_related('user', 'member')[:20]
+    ).annotate(
+        has_active_registration=Exists(
+            ConventionRegistration.objects.filter(person=OuterRef('pk'), convention=convention)
+        ),
+        match_rank=Case(
+            When(prefix_match, then=Value(0)),
+            default=Value(1),
+            output_field=IntegerField(),
+        ),
+    ).select_related('user', 'member').order_by('match_rank', 'last_name', 'first_name', 'id')[:20]
 
     serializer = PersonSearchSerializer(persons, many=True, context={'convention': convention})
     return Response(serializer.data, status=status.HTTP_200_OK)
@@ -1635,6 +1605,70 @@ def admin_registration_guest_detail(request, registration_id, guest_id):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+# ---------------------------------------------------------------------------
+# Reports
+# ---------------------------------------------------------------------------
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@throttle_classes([AdminRateThrottle])
+def admin_catering_report(request):
+    """
+    Meal, package, allergy and dietary headcounts for catering, broken down by
+    registration status. Cached per convention and invalidated by signals when
+    registrations, guests, guest meals or accommodation change.
+    Query params: ?convention_id= (optional, defaults to the active convention)
+    Requires hq_staff role.
+    """
+    if not request.user.has_role('hq_staff'):
+        raise PermissionDenied('You do not have permission to view convention reports.')
+
+    convention_id = request.query_params.get('convention_id')
+    if convention_id:
+        convention = get_object_or_404(Convention, id=convention_id)
+    else:
+        try:
+            convention = Convention.objects.filter(is_active=True).latest('year')
+        except Convention.DoesNotExist:
+            return Response({'error': 'No active convention found.'}, status=status.HTTP_404_NOT_FOUND)
+
+    return Response(get_catering_report(convention), status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@throttle_classes([DashboardPollThrottle])
+def admin_dashboard_counters(request):
+    """
+    Live convention totals for the HQ dashboard, read from a single
+    incrementally maintained counter row. Send the returned ETag back in
+    If-None-Match to get a 304 when nothing has changed.
+    Query params: ?convention_id= (optional, defaults to the active convention)
+    Requires hq_staff role.
+    """
+    if not request.user.has_role('hq_staff'):
+        raise PermissionDenied('You do not have permission to view convention reports.')
+
+    convention_id = request.query_params.get('convention_id')
+    if convention_id:
+        convention = get_object_or_404(Convention, id=convention_id)
+    else:
+        try:
+            convention = Convention.objects.filter(is_active=True).latest('year')
+        except Convention.DoesNotExist:
+            return Response({'error': 'No active convention found.'}, status=status.HTTP_404_NOT_FOUND)
+
+    counter = get_dashboard_counter(convention)
+    etag = f'"{counter.convention_id}-{counter.version}"'
+    if request.headers.get('If-None-Match') == etag:
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response(serialize_dashboard_counter(counter), status=status.HTTP_200_OK)
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
 # ---------------------------------------------------------------------------
 # Fully Paid Chapters
 # ---------------------------------------------------------------------------
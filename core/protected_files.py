@@ -0,0 +1,118 @@
+"""
+Responses for private media (resumes, receipts, invoices, resume bundles).
+
+Those files are never served from /media/ directly: a view checks access and
+then hands the file to nginx with X-Accel-Redirect or, in DEBUG, streams it
+itself. protected_file_response adds validators built from the file name and
+the timestamp recorded when the file was written, so a repeat request with
+If-None-Match / If-Modified-Since gets a 304 without storage being touched.
+When Django streams the file it also answers single byte-range requests;
+behind nginx, ranges are handled by nginx (see the notes in core/settings.py).
+"""
+
+import hashlib
+import re
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+RANGE_CHUNK_SIZE = 64 * 1024
+
+
+def file_etag(name, modified=None):
+    """Strong ETag for a stored file. Names change whenever content is replaced."""
+    stamp = modified.isoformat() if modified else ''
+    return '"%s"' % hashlib.sha256(f'{name}|{stamp}'.encode()).hexdigest()[:32]
+
+
+def _requested_range(request, size, etag, last_modified):
+    """
+    (start, end) of a satisfiable single range, None to send the whole file,
+    or False if the range can't be satisfied.
+    """
+    header = request.META.get('HTTP_RANGE', '').strip()
+    if not header or request.method != 'GET':
+        return None
+    if_range = request.META.get('HTTP_IF_RANGE', '').strip()
+    if if_range and if_range != etag and (
+        last_modified is None or parse_http_date_safe(if_range) != last_modified
+    ):
+        return None
+    match = RANGE_RE.match(header)
+    if not match:
+        # Multiple or malformed ranges: a full 200 response is always acceptable
+        return None
+    first, last = match.groups()
+    if not first:
+        if not last or int(last) == 0:
+            return False
+        return max(size - int(last), 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or (last and int(last) < start):
+        return False
+    return start, end
+
+
+def _read_range(f, start, length):
+    try:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(RANGE_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        f.close()
+
+
+def _streamed_response(request, file_field, content_type, etag, last_modified):
+    size = file_field.size
+    byte_range = _requested_range(request, size, etag, last_modified)
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    f = file_field.open('rb')
+    if byte_range is None:
+        response = FileResponse(f, content_type=content_type)
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(_read_range(f, start, end - start + 1), status=206, content_type=content_type)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = end - start + 1
+    response['Accept-Ranges'] = 'bytes'
+    return response
+
+
+def protected_file_response(request, file_field, content_type, modified=None, filename=None,
+                            as_attachment=False, cache_control='private, no-cache'):
+    """
+    Serve a stored private file after the caller has checked access.
+
+    `modified` is when the file was written (e.g. resume_uploaded_at); with the
+    file name it forms the ETag and Last-Modified. `cache_control` defaults to
+    revalidating on every use, which costs a 304 once the browser has the file.
+    """
+    etag = file_etag(file_field.name, modified)
+    last_modified = int(modified.timestamp()) if modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        if settings.DEBUG:
+            response = _streamed_response(request, file_field, content_type, etag, last_modified)
+        else:
+            response = HttpResponse(content_type=content_type)
+            response['X-Accel-Redirect'] = f'/protected-media/{file_field.name}'
+        if filename or as_attachment:
+            response['Content-Disposition'] = content_disposition_header(as_attachment, filename)
+
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = cache_control
+    return response
@@ -110,6 +110,24 @@ else:
         }
     }
 
+# Cache
+# Outside local dev the cache lives in the database so every gunicorn worker sees
+# the same entries and signal-driven invalidation reaches all of them.
+# The table is created by `python manage.py createcachetable` (run in deploy.sh).
+if ENVIRONMENT == 'local':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'django_cache',
+        }
+    }
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -153,18 +171,41 @@ MEDIA_ROOT = '/portal/vue-session/media'
 
 # Align with per-file limits enforced in upload views (10 MB per file, 50 MB receipt total).
 # Without these, Django rejects multipart bodies over the 2.5 MB default before view logic runs.
+# The receipt, resume and logo endpoints replace the default upload handlers with
+# core.uploads.ValidatedUploadHandler, which checks type and size while the body streams
+# in and always writes files to disk, so FILE_UPLOAD_MAX_MEMORY_SIZE doesn't apply to them.
 DATA_UPLOAD_MAX_MEMORY_SIZE = 55 * 1024 * 1024   # 55 MB
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024   # 10 MB
 
-# Production nginx config required for private file serving (resumes, receipts):
+# Queue uploaded resume PDFs for rewriting to a smaller file (recruiters/resume_optimization.py,
+# processed by the optimize_resumes cron command). Uses ghostscript when installed.
+RESUME_PDF_OPTIMIZATION = config('RESUME_PDF_OPTIMIZATION', default=True, cast=bool)
+
+# First month (1-12) of the fiscal year the expense analytics endpoint reports on.
+# A fiscal year is named for the calendar year it ends in.
+EXPENSE_FISCAL_YEAR_START_MONTH = config('EXPENSE_FISCAL_YEAR_START_MONTH', default=1, cast=int)
+
+# Production nginx config required for private file serving (resumes, receipts, invoices):
 #
 #   location /protected-media/ {
 #       internal;
 #       alias /portal/vue-session/media/;
+#       # Keep the ETag Django computed (core/protected_files.py) so the next
+#       # If-None-Match is answered by the view with a 304; nginx handles Range.
+#       etag off;
+#       add_header ETag $upstream_http_etag;
 #   }
-#   location ~* ^/media/(resumes|receipts)/ {
+#   location ~* ^/media/(resumes|receipts|invoices)/ {
 #       return 403;
 #   }
+#
+# Organization logos are stored under content-hash names (recruiters/logos.py),
+# so they can be cached indefinitely:
+#
+#   location /media/org_logos/ {
+#       alias /portal/vue-session/media/org_logos/;
+#       add_header Cache-Control "public, max-age=31536000, immutable";
+#   }
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
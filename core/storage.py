@@ -0,0 +1,146 @@
+"""
+Content-addressed storage for resumes and combined receipt PDFs.
+
+Members upload the same receipts to several reports and the same resume to
+every convention. ContentAddressedStorage names each file by the SHA-256 of
+its bytes, in two levels of sharded directories under a fixed prefix
+(resumes/ab/cd/abcd...pdf), so identical uploads share one blob no matter
+what they were called. Only the extension of the name a field generates is
+kept.
+
+A blob's reference count is the number of rows whose file fields (any field
+using a storage with the same prefix) hold its name. delete() only removes a
+blob nobody references any more, so callers must clear or repoint the field
+before deleting the old name. The collect_blobs command sweeps what delete()
+leaves behind. Blobs touched within BLOB_GRACE_PERIOD are never removed: an
+upload that just reused a blob may not have committed the row pointing at it.
+
+Files stored before a field switched to this storage keep their names and
+are deleted by the same reference-count rule.
+"""
+
+import hashlib
+import os
+import re
+import time
+from datetime import timedelta
+
+from django.apps import apps
+from django.core.files.base import File
+from django.core.files.storage import FileSystemStorage
+from django.db import models
+from django.utils.deconstruct import deconstructible
+
+BLOB_GRACE_PERIOD = timedelta(hours=1)
+BLOB_NAME_RE = re.compile(r'^[0-9a-f]{64}(\.[a-z0-9]+)?$')
+SHARD_RE = re.compile(r'^[0-9a-f]{2}$')
+HASH_CHUNK_SIZE = 64 * 1024
+
+
+@deconstructible(path='core.storage.ContentAddressedStorage')
+class ContentAddressedStorage(FileSystemStorage):
+    def __init__(self, prefix, **kwargs):
+        super().__init__(**kwargs)
+        self.prefix = prefix.strip('/')
+
+    def blob_name(self, digest, ext=''):
+        return f'{self.prefix}/{digest[:2]}/{digest[2:4]}/{digest}{ext}'
+
+    def _digest(self, content):
+        # ValidatedUploadHandler has already hashed files as they streamed in
+        digest = getattr(content, 'sha256', None)
+        if digest:
+            return digest
+        hasher = hashlib.sha256()
+        for chunk in content.chunks(HASH_CHUNK_SIZE):
+            hasher.update(chunk)
+        content.seek(0)
+        return hasher.hexdigest()
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        ext = os.path.splitext(name)[1].lower()
+        name = self.blob_name(self._digest(content), ext)
+
+        if self.exists(name):
+            # Restart the grace period so a concurrent delete leaves it alone
+            os.utime(self.path(name))
+            return name
+        stored = self._save(name, content)
+        if stored != name:
+            # Lost a race with an identical upload; keep the first copy
+            super().delete(stored)
+        return name
+
+    def referencing_fields(self):
+        """(model, field name) for every file field that stores its files here."""
+        return [
+            (model, field.name)
+            for model in apps.get_models()
+            for field in model._meta.concrete_fields
+            if isinstance(field, models.FileField)
+            and isinstance(field.storage, ContentAddressedStorage)
+            and field.storage.prefix == self.prefix
+        ]
+
+    def reference_count(self, name):
+        return sum(
+            model._default_manager.filter(**{field: name}).count()
+            for model, field in self.referencing_fields()
+        )
+
+    def referenced_names(self):
+        names = set()
+        for model, field in self.referencing_fields():
+            names.update(
+                model._default_manager.filter(**{f'{field}__startswith': f'{self.prefix}/'})
+                .values_list(field, flat=True)
+            )
+        return names
+
+    def is_recent(self, name):
+        try:
+            modified = os.path.getmtime(self.path(name))
+        except FileNotFoundError:
+            return False
+        return time.time() - modified < BLOB_GRACE_PERIOD.total_seconds()
+
+    def delete(self, name):
+        if name and not self.is_recent(name) and self.reference_count(name) == 0:
+            super().delete(name)
+
+    def blobs(self):
+        """Names of every blob under the sharded directories."""
+        for shard in self._subdirs(self.prefix):
+            for subshard in self._subdirs(f'{self.prefix}/{shard}'):
+                directory = f'{self.prefix}/{shard}/{subshard}'
+                for filename in self.listdir(directory)[1]:
+                    if BLOB_NAME_RE.match(filename):
+                        yield f'{directory}/{filename}'
+
+    def _subdirs(self, path):
+        if not self.exists(path):
+            return []
+        return [d for d in self.listdir(path)[0] if SHARD_RE.match(d)]
+
+    def unreferenced_blobs(self):
+        """Blobs no row points at and nobody has touched within the grace period."""
+        referenced = self.referenced_names()
+        return [name for name in self.blobs() if name not in referenced and not self.is_recent(name)]
+
+
+def content_addressed_storages():
+    """One storage per prefix in use by a model field."""
+    storages = {}
+    for model in apps.get_models():
+        for field in model._meta.concrete_fields:
+            if isinstance(field, models.FileField) and isinstance(field.storage, ContentAddressedStorage):
+                storages.setdefault(field.storage.prefix, field.storage)
+    return list(storages.values())
+
+
+resume_storage = ContentAddressedStorage('resumes')
+receipt_storage = ContentAddressedStorage('receipts')
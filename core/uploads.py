@@ -0,0 +1,140 @@
+"""
+Upload handling for the receipt, resume and logo endpoints.
+
+Django's default handlers hold any file under FILE_UPLOAD_MAX_MEMORY_SIZE in
+memory and only let a view look at an upload once the whole request body has
+been read. ValidatedUploadHandler checks each file while it streams in: the
+magic bytes of the first chunk, the per-file and per-request size limits, and
+it writes straight to a temporary file on disk, hashing as it goes. The first
+violation stops the upload; the rest of the body is read and discarded
+without being stored, so the client still gets a normal error response.
+
+Handlers must be in place before anything reads request.POST/FILES, which for
+DRF views includes the CSRF check in SessionAuthentication. Apply
+@validated_uploads above @api_view and have the view call upload_error()
+before it uses request.FILES.
+"""
+
+import hashlib
+from functools import wraps
+
+from django.core.files.uploadhandler import SkipFile, StopUpload, TemporaryFileUploadHandler
+
+# Magic bytes for file type verification
+FILE_SIGNATURES = {
+    b'%PDF': 'pdf',
+    b'\x89PNG': 'png',
+    b'\xff\xd8\xff': 'jpeg',
+}
+FILE_TYPE_LABELS = {'pdf': 'PDF', 'png': 'PNG', 'jpeg': 'JPEG'}
+SIGNATURE_LENGTH = max(len(signature) for signature in FILE_SIGNATURES)
+
+
+def detect_file_type(header):
+    """Return 'pdf', 'png' or 'jpeg' for a file starting with `header`, else None."""
+    for signature, file_type in FILE_SIGNATURES.items():
+        if header.startswith(signature):
+            return file_type
+    return None
+
+
+def _megabytes(size):
+    return f'{size / (1024 * 1024):.0f}MB'
+
+
+def _type_list(file_types):
+    labels = [FILE_TYPE_LABELS[t] for t in FILE_TYPE_LABELS if t in file_types]
+    return labels[0] if len(labels) == 1 else f'{", ".join(labels[:-1])} or {labels[-1]}'
+
+
+class ValidatedUploadHandler(TemporaryFileUploadHandler):
+    """
+    Stream accepted files to disk, rejecting bad ones as early as possible.
+
+    `fields` maps each file field the view reads to the file types allowed in
+    it; files sent under any other field are skipped without being stored.
+    Completed files carry a `sha256` attribute with the hex digest of their
+    content.
+    """
+
+    def __init__(self, request=None, fields=None, max_file_size=None, max_total_size=None):
+        super().__init__(request)
+        self.fields = fields or {}
+        self.max_file_size = max_file_size
+        self.max_total_size = max_total_size
+        self.total_size = 0
+        self.error = None
+
+    def new_file(self, field_name, file_name, *args, **kwargs):
+        if field_name not in self.fields:
+            raise SkipFile()
+        super().new_file(field_name, file_name, *args, **kwargs)
+        self.header = b''
+        self.file_type = None
+        self.received = 0
+        self.hasher = hashlib.sha256()
+
+    def _reject(self, message):
+        self.error = message
+        # Read and drop the rest of the body so the view can still answer normally
+        raise StopUpload(connection_reset=False)
+
+    def _check_type(self):
+        self.file_type = detect_file_type(self.header)
+        if self.file_type not in self.fields[self.field_name]:
+            self._reject(
+                f'File {self.file_name} does not appear to be a valid '
+                f'{_type_list(self.fields[self.field_name])} file.'
+            )
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        self.total_size += len(raw_data)
+        if self.max_file_size and self.received > self.max_file_size:
+            self._reject(f'File {self.file_name} is too large. Maximum size is {_megabytes(self.max_file_size)}.')
+        if self.max_total_size and self.total_size > self.max_total_size:
+            self._reject(f'Total file size is too large. Maximum total size is {_megabytes(self.max_total_size)}.')
+
+        if self.file_type is None and len(self.header) < SIGNATURE_LENGTH:
+            self.header += raw_data[:SIGNATURE_LENGTH - len(self.header)]
+            if len(self.header) == SIGNATURE_LENGTH:
+                self._check_type()
+
+        self.hasher.update(raw_data)
+        self.file.write(raw_data)
+
+    def file_complete(self, file_size):
+        if self.file_type is None:
+            # Shorter than any signature
+            self._check_type()
+        uploaded_file = super().file_complete(file_size)
+        uploaded_file.sha256 = self.hasher.hexdigest()
+        # The parser closes every handler's `file` when a later part is skipped,
+        # which would delete this one's temporary file
+        del self.file
+        return uploaded_file
+
+
+def validated_uploads(fields, max_file_size=None, max_total_size=None):
+    """
+    Install a ValidatedUploadHandler for the view's request. Goes above
+    @api_view so the handler is set before DRF parses the body.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapped_view(request, *args, **kwargs):
+            request.upload_handlers = [ValidatedUploadHandler(
+                request, fields=fields, max_file_size=max_file_size, max_total_size=max_total_size,
+            )]
+            return view(request, *args, **kwargs)
+        return wrapped_view
+    return decorator
+
+
+def upload_error(request):
+    """Message explaining why ValidatedUploadHandler stopped this request's upload, or None."""
+    request.FILES  # Parse the body if nothing has yet
+    for handler in request.upload_handlers:
+        if getattr(handler, 'error', None):
+            return handler.error
+    return None
@@ -12,6 +12,8 @@ pip install -r requirements.txt
 
 echo "=== Running migrations ==="
 python manage.py migrate
+python manage.py createcachetable
+python manage.py rebuild_resume_pool
 
 echo "=== Collecting static files ==="
 python manage.py collectstatic --noinput
@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from .models import ExpenseReportType, ExpenseReport, ExpenseReportDetail
+from .totals import OPEN_STATUSES, recalculate_totals, summarize_changes
 
 
 class ExpenseReportDetailInline(admin.StackedInline):
@@ -108,6 +109,16 @@ class ExpenseReportTypeAdmin(admin.ModelAdmin):
         return obj.expense_reports.count()
     get_report_count.short_description = 'Reports Using This Type'
 
+    actions = ['recalculate_open_report_totals']
+
+    def recalculate_open_report_totals(self, request, queryset):
+        """Apply the selected types' current rates to their open reports"""
+        reports = ExpenseReport.objects.filter(report_type__in=queryset, status__in=OPEN_STATUSES)
+        checked, changes = recalculate_totals(reports)
+        self.message_user(request, summarize_changes(checked, changes), level='SUCCESS')
+
+    recalculate_open_report_totals.short_description = "Recalculate totals of open reports using these types"
+
 
 @admin.register(ExpenseReport)
 class ExpenseReportAdmin(admin.ModelAdmin):
@@ -266,7 +277,7 @@ class ExpenseReportAdmin(admin.ModelAdmin):
     get_status_badge.admin_order_field = 'status'
 
     def get_total_formatted(self, obj):
-        return format_html('${:,.2f}', obj.total_amount)
+        return format_html('${}', f'{obj.total_amount:,.2f}')
     get_total_formatted.short_description = 'Total Amount'
     get_total_formatted.admin_order_field = 'total_amount'
 
@@ -316,6 +327,15 @@ class ExpenseReportAdmin(admin.ModelAdmin):
         return "No receipt uploaded"
     get_receipt_link.short_description = 'Receipt'
 
+    actions = ['recalculate_selected_totals']
+
+    def recalculate_selected_totals(self, request, queryset):
+        """Recalculate the selected reports' totals from their report type's current rates"""
+        checked, changes = recalculate_totals(queryset)
+        self.message_user(request, summarize_changes(checked, changes), level='SUCCESS')
+
+    recalculate_selected_totals.short_description = "Recalculate totals from current rates"
+
     def save_model(self, request, obj, form, change):
         super().save_model(request, obj, form, change)
 
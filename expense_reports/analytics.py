@@ -0,0 +1,221 @@
+"""
+Spend rollups for the expense analytics endpoint.
+
+ExpenseReportRollup holds one row per (month, chapter, report type, status)
+with the number of reports and their summed total_amount, built with a
+GROUP BY over ExpenseReport. Only the groups a change touches are rebuilt:
+signals.py refreshes a report's old and new group once a save that changes
+its status, total, chapter, type or report date commits, and bulk total
+recalculation refreshes the groups it wrote to. rebuild_rollups recomputes a
+whole fiscal year (or everything) for the rebuild_expense_rollups command.
+
+Analytics responses are aggregated from the rollup table and cached per
+fiscal year under a version key; refreshing any group in a fiscal year bumps
+that year's version, so other years stay cached.
+"""
+
+import uuid
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import ExpenseReport, ExpenseReportRollup
+
+ANALYTICS_TIMEOUT = 60 * 60 * 24  # safety net; the version in the key handles invalidation
+
+# Breakdowns returned by get_expense_analytics: name -> (rollup field, label field)
+ANALYTICS_DIMENSIONS = {
+    'by_chapter': ('chapter', None),
+    'by_report_type': ('report_type__report_code', 'report_type__report_name'),
+    'by_month': ('month', None),
+    'by_status': ('status', None),
+}
+
+STATUS_LABELS = dict(ExpenseReport.STATUS_CHOICES)
+
+# Statuses counted as spend unless the request asks for others
+ANALYTICS_DEFAULT_STATUSES = ('submitted', 'reviewed', 'approved', 'paid')
+
+
+def fiscal_year_start_month():
+    return getattr(settings, 'EXPENSE_FISCAL_YEAR_START_MONTH', 1)
+
+
+def fiscal_year(day):
+    """Fiscal year `day` falls in, named for the calendar year it ends in."""
+    start_month = fiscal_year_start_month()
+    return day.year + 1 if start_month > 1 and day.month >= start_month else day.year
+
+
+def fiscal_year_range(year):
+    """(first day, first day of the next fiscal year) for fiscal `year`."""
+    start_month = fiscal_year_start_month()
+    start = date(year - 1 if start_month > 1 else year, start_month, 1)
+    return start, date(start.year + 1, start_month, 1)
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def _next_month(month):
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def rollup_group(chapter, report_type_id, report_date):
+    """The (chapter, report type id, month) a report with these values rolls up into."""
+    # Instances created with a date string keep the string until reloaded
+    report_date = ExpenseReport._meta.get_field('report_date').to_python(report_date)
+    return chapter, report_type_id, month_start(report_date)
+
+
+def _upsert_rollups(rows, **group):
+    """Write aggregate `rows` as rollups, replacing any existing row with the same key."""
+    conflict_options = {
+        'update_conflicts': True,
+        'update_fields': ['report_count', 'total_amount', 'updated_at'],
+    }
+    # MySQL's ON DUPLICATE KEY UPDATE matches any unique key and takes no conflict target
+    if connection.features.supports_update_conflicts_with_target:
+        conflict_options['unique_fields'] = ['month', 'chapter', 'report_type', 'status']
+    return ExpenseReportRollup.objects.bulk_create(
+        [
+            ExpenseReportRollup(
+                month=group.get('month', row.get('month')),
+                chapter=group.get('chapter', row.get('chapter')),
+                report_type_id=group.get('report_type_id', row.get('report_type_id')),
+                status=row['status'], report_count=row['report_count'], total_amount=row['total'],
+            )
+            for row in rows
+        ],
+        batch_size=1000,
+        # A concurrent refresh of the same group may have written these rows already
+        **conflict_options,
+    )
+
+
+def refresh_rollups(groups):
+    """Rebuild the rollup rows for each (chapter, report type id, month) in `groups`."""
+    groups = {group for group in groups if None not in group}
+    if not groups:
+        return
+    with transaction.atomic():
+        for chapter, report_type_id, month in groups:
+            rows = list(
+                ExpenseReport.objects.filter(
+                    chapter=chapter,
+                    report_type_id=report_type_id,
+                    report_date__gte=month,
+                    report_date__lt=_next_month(month),
+                )
+                .values('status')
+                .annotate(report_count=Count('id'), total=Sum('total_amount'))
+                .order_by()
+            )
+            ExpenseReportRollup.objects.filter(
+                chapter=chapter, report_type_id=report_type_id, month=month,
+            ).exclude(status__in=[row['status'] for row in rows]).delete()
+            _upsert_rollups(rows, chapter=chapter, report_type_id=report_type_id, month=month)
+    for year in {fiscal_year(month) for _, _, month in groups}:
+        invalidate_expense_analytics(year)
+
+
+def rebuild_rollups(year=None):
+    """
+    Recompute the rollup rows for fiscal `year`, or for all reports, in one
+    GROUP BY query. Returns the number of rollup rows written.
+    """
+    reports = ExpenseReport.objects.all()
+    rollups = ExpenseReportRollup.objects.all()
+    if year is not None:
+        start, end = fiscal_year_range(year)
+        reports = reports.filter(report_date__gte=start, report_date__lt=end)
+        rollups = rollups.filter(month__gte=start, month__lt=end)
+
+    rows = (
+        reports.annotate(month=TruncMonth('report_date'))
+        .values('month', 'chapter', 'report_type_id', 'status')
+        .annotate(report_count=Count('id'), total=Sum('total_amount'))
+        .order_by()
+    )
+    with transaction.atomic():
+        years = {fiscal_year(month) for month in rollups.values_list('month', flat=True).distinct()}
+        rollups.delete()
+        created = _upsert_rollups(rows)
+    years.update(fiscal_year(rollup.month) for rollup in created)
+    for year in years:
+        invalidate_expense_analytics(year)
+    return len(created)
+
+
+def _version_key(year):
+    return f'expense_reports:analytics:fy{year}:version'
+
+
+def expense_analytics_cache_key(year, version, statuses):
+    return f'expense_reports:analytics:fy{year}:v{version}:{",".join(sorted(statuses))}'
+
+
+def invalidate_expense_analytics(year):
+    cache.set(_version_key(year), uuid.uuid4().hex, None)
+
+
+def get_expense_analytics(year, statuses):
+    """Return the cached analytics for fiscal `year` and report `statuses`, building on a miss."""
+    version = cache.get(_version_key(year))
+    if version is None:
+        version = uuid.uuid4().hex
+        cache.set(_version_key(year), version, None)
+    key = expense_analytics_cache_key(year, version, statuses)
+    analytics = cache.get(key)
+    if analytics is None:
+        analytics = build_expense_analytics(year, statuses)
+        cache.set(key, analytics, ANALYTICS_TIMEOUT)
+    return analytics
+
+
+def _totals(rows):
+    return {
+        'report_count': rows.get('report_count') or 0,
+        'total_amount': f"{rows.get('total_amount') or 0:.2f}",
+    }
+
+
+def build_expense_analytics(year, statuses):
+    """Spend per chapter, report type, month and status for fiscal `year`."""
+    start, end = fiscal_year_range(year)
+    rollups = ExpenseReportRollup.objects.filter(month__gte=start, month__lt=end, status__in=statuses)
+
+    analytics = {
+        'fiscal_year': year,
+        'start_date': start.isoformat(),
+        'end_date': (end - timedelta(days=1)).isoformat(),
+        'statuses': sorted(statuses),
+        'generated_at': timezone.now().isoformat(),
+        'totals': _totals(rollups.aggregate(report_count=Sum('report_count'), total_amount=Sum('total_amount'))),
+    }
+    for name, (field, label_field) in ANALYTICS_DIMENSIONS.items():
+        fields = [field, label_field] if label_field else [field]
+        rows = (
+            rollups.values(*fields)
+            .annotate(report_count=Sum('report_count'), total_amount=Sum('total_amount'))
+            .order_by(field)
+        )
+        analytics[name] = [_breakdown_row(field, label_field, row) for row in rows]
+    return analytics
+
+
+def _breakdown_row(field, label_field, row):
+    key = row[field]
+    if field == 'month':
+        label, key = f'{key:%B %Y}', key.isoformat()
+    elif field == 'status':
+        label = STATUS_LABELS.get(key, key)
+    else:
+        label = row[label_field] if label_field else key
+    return {'key': key, 'label': label, **_totals(row)}
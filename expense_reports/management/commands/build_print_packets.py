@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from expense_reports.print_packets import build_print_packet, claimable_print_packets, prune_print_packets
+
+
+class Command(BaseCommand):
+    help = (
+        'Build queued finance print packets and delete expired ones. '
+        'Schedule from cron, e.g. every minute, or run with --watch under a process supervisor.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--watch', type=float, default=None, metavar='SECONDS',
+            help='Keep running, checking for new packets every SECONDS',
+        )
+
+    def handle(self, *args, **options):
+        removed = prune_print_packets()
+        if removed:
+            self.stdout.write(f'Pruned {removed} expired print packet(s).')
+
+        while True:
+            # A long-running --watch process must not hold on to a dropped connection
+            close_old_connections()
+            built = failed = 0
+            for packet in claimable_print_packets().order_by('created_at'):
+                if build_print_packet(packet):
+                    built += 1
+                else:
+                    failed += 1
+            if built or failed or not options['watch']:
+                self.stdout.write(self.style.SUCCESS(
+                    f'Done. {built} print packet(s) built, {failed} failed or skipped.'
+                ))
+            if not options['watch']:
+                return
+            time.sleep(options['watch'])
@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from expense_reports.receipt_jobs import claimable_receipt_jobs, process_receipt_job
+
+
+class Command(BaseCommand):
+    help = (
+        'Combine queued receipt uploads into expense report receipt PDFs. '
+        'Schedule from cron, e.g. every minute, or run with --watch under a process supervisor.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--watch', type=float, default=None, metavar='SECONDS',
+            help='Keep running, checking for new uploads every SECONDS',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            # A long-running --watch process must not hold on to a dropped connection
+            close_old_connections()
+            done = failed = 0
+            for job in claimable_receipt_jobs().order_by('created_at'):
+                if process_receipt_job(job):
+                    done += 1
+                else:
+                    failed += 1
+            if done or failed or not options['watch']:
+                self.stdout.write(self.style.SUCCESS(
+                    f'Done. {done} receipt upload(s) combined, {failed} failed or skipped.'
+                ))
+            if not options['watch']:
+                return
+            time.sleep(options['watch'])
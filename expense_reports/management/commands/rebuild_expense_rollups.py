@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from expense_reports.analytics import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the expense analytics rollup table from expense reports. The rollups are kept '
+        'current as reports change; run this after bulk imports or direct database edits.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fiscal-year', type=int,
+            help='Only rebuild this fiscal year (default: all reports)',
+        )
+
+    def handle(self, *args, **options):
+        written = rebuild_rollups(options['fiscal_year'])
+        scope = f'fiscal year {options["fiscal_year"]}' if options['fiscal_year'] else 'all fiscal years'
+        self.stdout.write(self.style.SUCCESS(f'Done. Wrote {written} rollup row(s) for {scope}.'))
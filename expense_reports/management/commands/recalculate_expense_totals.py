@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+from expense_reports.models import ExpenseReport, ExpenseReportType
+from expense_reports.totals import OPEN_STATUSES, RECALCULATE_CHUNK_SIZE, recalculate_totals, summarize_changes
+
+
+class Command(BaseCommand):
+    help = (
+        'Recalculate expense report totals from the current report type rates and limits. '
+        'Run after changing an expense report type. Only open (not yet paid or rejected) '
+        'reports are updated unless --all-statuses is given.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--report-type', action='append', dest='report_types', metavar='CODE',
+            help='Only reports of this report type code; may be repeated',
+        )
+        parser.add_argument(
+            '--all-statuses', action='store_true',
+            help='Include paid and rejected reports',
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=RECALCULATE_CHUNK_SIZE,
+            help=f'Reports read and written per query (default {RECALCULATE_CHUNK_SIZE})',
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Show which totals would change without saving them',
+        )
+
+    def handle(self, *args, **options):
+        reports = ExpenseReport.objects.all()
+        if options['report_types']:
+            codes = set(options['report_types'])
+            unknown = codes - set(ExpenseReportType.objects.filter(report_code__in=codes).values_list('report_code', flat=True))
+            if unknown:
+                raise CommandError(f'Unknown report type code(s): {", ".join(sorted(unknown))}')
+            reports = reports.filter(report_type__report_code__in=codes)
+        if not options['all_statuses']:
+            reports = reports.filter(status__in=OPEN_STATUSES)
+
+        checked, changes = recalculate_totals(reports, dry_run=options['dry_run'], chunk_size=options['chunk_size'])
+        for report_id, old, new in changes:
+            self.stdout.write(f'  Report {report_id}: ${old:,.2f} -> ${new:,.2f} ({new - old:+,.2f})')
+
+        prefix = 'Dry run. ' if options['dry_run'] else 'Done. '
+        self.stdout.write(self.style.SUCCESS(prefix + summarize_changes(checked, changes)))
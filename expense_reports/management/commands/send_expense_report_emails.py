@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from expense_reports.notifications import claimable_notifications, deliver_notification
+
+
+class Command(BaseCommand):
+    help = (
+        'Send queued expense report status emails. Failed sends are retried on later runs. '
+        'Schedule from cron, e.g. every minute.'
+    )
+
+    def handle(self, *args, **options):
+        sent = failed = 0
+        for notification in claimable_notifications().order_by('created_at'):
+            if deliver_notification(notification):
+                sent += 1
+            else:
+                failed += 1
+        self.stdout.write(self.style.SUCCESS(
+            f'Done. {sent} expense report email(s) sent, {failed} failed or skipped.'
+        ))
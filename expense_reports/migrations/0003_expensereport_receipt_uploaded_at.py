@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-19 17:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expense_reports', '0002_year_based_upload_paths'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='expensereport',
+            name='receipt_uploaded_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
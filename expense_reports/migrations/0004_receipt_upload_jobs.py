@@ -0,0 +1,56 @@
+# Generated by Django 5.0 on 2026-10-19 17:10
+
+import django.db.models.deletion
+import expense_reports.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expense_reports', '0003_expensereport_receipt_uploaded_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReceiptUploadJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('processing', 'Processing'), ('done', 'Done'), ('failed', 'Failed'), ('superseded', 'Superseded')], default='queued', max_length=20)),
+                ('file_count', models.IntegerField(default=0)),
+                ('total_size', models.BigIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('expense_report', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='receipt_jobs', to='expense_reports.expensereport')),
+                ('uploaded_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='receipt_upload_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'receipt_upload_job',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ReceiptUploadFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveSmallIntegerField()),
+                ('file', models.FileField(upload_to=expense_reports.models.receipt_job_upload_path)),
+                ('original_name', models.CharField(max_length=255)),
+                ('content_type', models.CharField(max_length=100)),
+                ('size', models.BigIntegerField()),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='files', to='expense_reports.receiptuploadjob')),
+            ],
+            options={
+                'db_table': 'receipt_upload_file',
+                'ordering': ['position'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='receiptuploadjob',
+            index=models.Index(fields=['status'], name='receipt_upl_status_06389e_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.0 on 2026-10-19 17:19
+
+import core.storage
+import expense_reports.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expense_reports', '0004_receipt_upload_jobs'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='expensereport',
+            name='receipt',
+            field=models.FileField(blank=True, help_text='Combined PDF of all receipt images', null=True, storage=core.storage.ContentAddressedStorage('receipts'), upload_to=expense_reports.models.receipt_upload_path),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.0 on 2026-10-19 17:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expense_reports', '0005_alter_expensereport_receipt'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExpenseReportNotification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('email_type', models.CharField(choices=[('rejected', 'Rejected'), ('approved', 'Approved'), ('paid', 'Paid')], max_length=20)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('sending', 'Sending'), ('sent', 'Sent'), ('failed', 'Failed')], default='queued', max_length=20)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('expense_report', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to='expense_reports.expensereport')),
+            ],
+            options={
+                'db_table': 'expense_report_notification',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['status'], name='expense_rep_status_93875f_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.0 on 2026-10-19 17:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0014_delete_staff'),
+        ('expense_reports', '0006_expensereportnotification'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='expensereport',
+            index=models.Index(fields=['report_type', 'report_date'], name='expense_rep_report__31a0d2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expensereport',
+            index=models.Index(fields=['chapter', 'report_date'], name='expense_rep_chapter_7417c4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expensereport',
+            index=models.Index(fields=['total_amount'], name='expense_rep_total_a_a7be02_idx'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.0 on 2026-10-19 17:29
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+
+
+def build_rollups(apps, schema_editor):
+    ExpenseReport = apps.get_model('expense_reports', 'ExpenseReport')
+    ExpenseReportRollup = apps.get_model('expense_reports', 'ExpenseReportRollup')
+    rows = (
+        ExpenseReport.objects.annotate(month=TruncMonth('report_date'))
+        .values('month', 'chapter', 'report_type_id', 'status')
+        .annotate(report_count=Count('id'), total=Sum('total_amount'))
+        .order_by()
+    )
+    ExpenseReportRollup.objects.bulk_create([
+        ExpenseReportRollup(
+            month=row['month'], chapter=row['chapter'], report_type_id=row['report_type_id'],
+            status=row['status'], report_count=row['report_count'], total_amount=row['total'],
+        )
+        for row in rows
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expense_reports', '0007_staff_report_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExpenseReportRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the report_date month')),
+                ('chapter', models.CharField(max_length=100)),
+                ('status', models.CharField(choices=[('submitted', 'Submitted'), ('reviewed', 'Reviewed'), ('approved', 'Approved'), ('paid', 'Paid'), ('rejected', 'Rejected')], max_length=20)),
+                ('report_count', models.PositiveIntegerField(default=0)),
+                ('total_amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('report_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rollups', to='expense_reports.expensereporttype')),
+            ],
+            options={
+                'db_table': 'expense_report_rollup',
+                'ordering': ['month', 'chapter'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='expensereportrollup',
+            constraint=models.UniqueConstraint(fields=('month', 'chapter', 'report_type', 'status'), name='unique_expense_report_rollup'),
+        ),
+        migrations.RunPython(build_rollups, migrations.RunPython.noop),
+    ]
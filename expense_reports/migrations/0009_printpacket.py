@@ -0,0 +1,38 @@
+# Generated by Django 5.0 on 2026-10-19 17:32
+
+import django.db.models.deletion
+import expense_reports.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expense_reports', '0008_expensereportrollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PrintPacket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('report_ids', models.JSONField(default=list, help_text='Expense report IDs, in print order')),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('processing', 'Processing'), ('done', 'Done'), ('failed', 'Failed')], default='queued', max_length=20)),
+                ('file', models.FileField(blank=True, upload_to=expense_reports.models.print_packet_upload_path)),
+                ('page_count', models.IntegerField(default=0)),
+                ('file_size', models.BigIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('requested_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='print_packets', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'print_packet',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status'], name='print_packe_status_430bff_idx')],
+            },
+        ),
+    ]
@@ -5,6 +5,7 @@ from decimal import Decimal
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 from accounts.models import User
+from core.storage import receipt_storage
 
 
 def receipt_upload_path(instance, filename):
@@ -101,6 +102,10 @@ class ExpenseReportType(models.Model):
         return f"{self.report_code} - {self.report_name}"
 
 
+# ExpenseReport fields that feed ExpenseReportRollup
+ROLLUP_SOURCE_FIELDS = ('chapter', 'report_type_id', 'report_date', 'status', 'total_amount')
+
+
 class ExpenseReport(models.Model):
     """
     Main expense report submitted by a member.
@@ -193,13 +198,15 @@ class ExpenseReport(models.Model):
         help_text="Total reimbursement amount"
     )
     
-    # Receipt file (combined PDF)
+    # Receipt file (combined PDF), stored by content hash; see core/storage.py
     receipt = models.FileField(
         upload_to=receipt_upload_path,
+        storage=receipt_storage,
         blank=True,
         null=True,
         help_text="Combined PDF of all receipt images"
     )
+    receipt_uploaded_at = models.DateTimeField(null=True, blank=True)
     
     # Notes
     notes = models.TextField(blank=True, help_text="Internal notes")
@@ -216,6 +223,10 @@ class ExpenseReport(models.Model):
             models.Index(fields=['person', 'status']),
             models.Index(fields=['status', 'created_at']),
             models.Index(fields=['report_date']),
+            # Staff list filters (reporting.filter_staff_reports)
+            models.Index(fields=['report_type', 'report_date']),
+            models.Index(fields=['chapter', 'report_date']),
+            models.Index(fields=['total_amount']),
         ]
     
     def __str__(self):
@@ -226,66 +237,92 @@ class ExpenseReport(models.Model):
         Calculate total reimbursement based on expense details.
         Returns the total amount.
         """
+        total = Decimal('0.00')
+        for _, amount in self.total_breakdown():
+            total += amount
+        return total
+
+    def total_breakdown(self):
+        """
+        Line items of the reimbursement calculate_total adds up, as
+        (label, amount) pairs, with the report type's rates and limits applied.
+        """
         if not hasattr(self, 'details'):
-            return Decimal('0.00')
+            return []
         
         details = self.details
         report_type = self.report_type
-        total = Decimal('0.00')
+        lines = []
         
         # Automobile mileage
         if details.automobile_miles:
-            base_mileage = details.automobile_miles * report_type.mileage_rate
-            passenger_mileage = (
+            lines.append(('Mileage', details.automobile_miles * report_type.mileage_rate))
+            lines.append((
+                'Passenger mileage',
                 details.automobile_miles * 
                 details.passengers * 
                 report_type.passenger_mileage_rate
-            )
-            total += base_mileage + passenger_mileage
+            ))
         
         # Tolls
-        total += details.automobile_tolls
+        lines.append(('Tolls', details.automobile_tolls))
         
         # Lodging
         if details.lodging_nights and details.lodging_per_night:
-            lodging_total = min(
+            lines.append(('Lodging', min(
                 details.lodging_per_night * details.lodging_nights,
                 report_type.max_lodging_per_night * details.lodging_nights
-            )
-            total += lodging_total
+            )))
         
         # En route meals
-        total += min(details.breakfast_enroute * report_type.max_breakfast_daily, 
-                     details.breakfast_enroute * Decimal('100.00'))
-        total += min(details.lunch_enroute * report_type.max_lunch_daily,
-                     details.lunch_enroute * Decimal('100.00'))
-        total += min(details.dinner_enroute * report_type.max_dinner_daily,
-                     details.dinner_enroute * Decimal('100.00'))
+        lines.append(('Breakfasts en route', min(details.breakfast_enroute * report_type.max_breakfast_daily,
+                                                 details.breakfast_enroute * Decimal('100.00'))))
+        lines.append(('Lunches en route', min(details.lunch_enroute * report_type.max_lunch_daily,
+                                              details.lunch_enroute * Decimal('100.00'))))
+        lines.append(('Dinners en route', min(details.dinner_enroute * report_type.max_dinner_daily,
+                                              details.dinner_enroute * Decimal('100.00'))))
         
         # On-site meals
-        total += min(details.breakfast_onsite * report_type.max_breakfast_onsite,
-                     details.breakfast_onsite * Decimal('100.00'))
-        total += min(details.lunch_onsite * report_type.max_lunch_onsite,
-                     details.lunch_onsite * Decimal('100.00'))
+        lines.append(('Breakfasts on site', min(details.breakfast_onsite * report_type.max_breakfast_onsite,
+                                                details.breakfast_onsite * Decimal('100.00'))))
+        lines.append(('Lunches on site', min(details.lunch_onsite * report_type.max_lunch_onsite,
+                                             details.lunch_onsite * Decimal('100.00'))))
         
         # Other costs
-        total += details.terminal_cost
-        total += details.public_carrier_cost
-        total += details.other_onsite_cost
+        lines.append(('Terminal costs', details.terminal_cost))
+        lines.append(('Public carrier', details.public_carrier_cost))
+        lines.append(('Other on-site costs', details.other_onsite_cost))
         
-        return total
+        return lines
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Status as loaded, so signals can spot a change without re-reading the row
+        instance._original_status = instance.__dict__.get('status')
+        instance._original_rollup = instance.rollup_values()
+        return instance
+
+    def rollup_values(self):
+        """The fields ExpenseReportRollup is built from, as currently set on this instance."""
+        return tuple(self.__dict__.get(field) for field in ROLLUP_SOURCE_FIELDS)
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        if fields is None or 'status' in fields:
+            self._original_status = self.status
+        self._original_rollup = self.rollup_values()
+
     def save(self, *args, **kwargs):
-        # Recalculate total before saving
-        is_new = self.pk is None
+        # Recalculate total before the write so the report is saved once
+        update_fields = kwargs.get('update_fields')
+        recalculate = update_fields is None or 'total_amount' in update_fields
+        if recalculate and self.pk is not None and hasattr(self, 'details'):
+            self.total_amount = self.calculate_total()
         super().save(*args, **kwargs)
-        
-        # Recalculate after save if details exist
-        if not is_new and hasattr(self, 'details'):
-            calculated_total = self.calculate_total()
-            if self.total_amount != calculated_total:
-                self.total_amount = calculated_total
-                super().save(update_fields=['total_amount'])
+        if update_fields is None or 'status' in update_fields:
+            self._original_status = self.status
+        self._original_rollup = self.rollup_values()
 
 
 class ExpenseReportDetail(models.Model):
@@ -410,3 +447,192 @@ class ExpenseReportDetail(models.Model):
         super().save(*args, **kwargs)
         # Trigger recalculation on parent report
         self.expense_report.save()
+
+
+def receipt_job_upload_path(instance, filename):
+    # Under receipts/ so nginx's direct-access deny rule covers raw uploads too
+    return f'receipts/uploads/{instance.job_id}/{instance.position:02d}_{filename}'
+
+
+class ReceiptUploadJob(models.Model):
+    """
+    A batch of receipt files waiting to be combined into a report's receipt PDF.
+    upload_receipts stores the raw files and returns the job; the
+    process_receipt_uploads command (run from cron) builds the PDF and attaches it.
+    """
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('processing', 'Processing'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+        ('superseded', 'Superseded'),
+    ]
+
+    expense_report = models.ForeignKey(
+        ExpenseReport,
+        on_delete=models.CASCADE,
+        related_name='receipt_jobs'
+    )
+    uploaded_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='receipt_upload_jobs'
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    file_count = models.IntegerField(default=0)
+    total_size = models.BigIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'receipt_upload_job'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status']),
+        ]
+
+    def __str__(self):
+        return f"Receipt upload {self.pk} for report {self.expense_report_id} ({self.status})"
+
+
+class ReceiptUploadFile(models.Model):
+    """One raw file of a ReceiptUploadJob, deleted once the job finishes."""
+    job = models.ForeignKey(
+        ReceiptUploadJob,
+        on_delete=models.CASCADE,
+        related_name='files'
+    )
+    position = models.PositiveSmallIntegerField()
+    file = models.FileField(upload_to=receipt_job_upload_path)
+    original_name = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100)
+    size = models.BigIntegerField()
+
+    class Meta:
+        db_table = 'receipt_upload_file'
+        ordering = ['position']
+
+    def __str__(self):
+        return f"{self.original_name} (job {self.job_id})"
+
+
+class ExpenseReportNotification(models.Model):
+    """
+    A status-change email to a report's owner. The post_save signal queues one
+    once the change commits; the send_expense_report_emails command (run from
+    cron) delivers it.
+    """
+    EMAIL_TYPE_CHOICES = [
+        ('rejected', 'Rejected'),
+        ('approved', 'Approved'),
+        ('paid', 'Paid'),
+    ]
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    expense_report = models.ForeignKey(
+        ExpenseReport,
+        on_delete=models.CASCADE,
+        related_name='notifications'
+    )
+    email_type = models.CharField(max_length=20, choices=EMAIL_TYPE_CHOICES)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'expense_report_notification'
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status']),
+        ]
+
+    def __str__(self):
+        return f"{self.email_type} email for report {self.expense_report_id} ({self.status})"
+
+
+def print_packet_upload_path(instance, filename):
+    # Under receipts/ so nginx's direct-access deny rule covers packets too
+    return f'receipts/packets/{instance.created_at.year}/{filename}'
+
+
+class PrintPacket(models.Model):
+    """
+    One combined PDF of expense reports for finance to print: a cover page per
+    report followed by its receipt. Requested through the staff print-packet
+    endpoint; the build_print_packets command (run from cron) builds it.
+    """
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('processing', 'Processing'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    requested_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='print_packets'
+    )
+    report_ids = models.JSONField(default=list, help_text="Expense report IDs, in print order")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    file = models.FileField(upload_to=print_packet_upload_path, blank=True)
+    page_count = models.IntegerField(default=0)
+    file_size = models.BigIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'print_packet'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status']),
+        ]
+
+    def __str__(self):
+        return f"Print packet {self.pk} ({len(self.report_ids)} reports, {self.status})"
+
+
+class ExpenseReportRollup(models.Model):
+    """
+    Report count and total spend for one (month, chapter, report type, status).
+    Maintained from ExpenseReport by expense_reports/analytics.py so the
+    analytics endpoint aggregates a few rows per month instead of every report.
+    """
+    month = models.DateField(help_text="First day of the report_date month")
+    chapter = models.CharField(max_length=100)
+    report_type = models.ForeignKey(
+        ExpenseReportType,
+        on_delete=models.CASCADE,
+        related_name='rollups'
+    )
+    status = models.CharField(max_length=20, choices=ExpenseReport.STATUS_CHOICES)
+    report_count = models.PositiveIntegerField(default=0)
+    total_amount = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'))
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'expense_report_rollup'
+        ordering = ['month', 'chapter']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['month', 'chapter', 'report_type', 'status'],
+                name='unique_expense_report_rollup',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.month:%Y-%m} {self.chapter} {self.report_type_id} {self.status}"
@@ -0,0 +1,148 @@
+"""
+Status-change emails for expense reports.
+
+Saving a report never talks to the mail server. The post_save signal queues
+an ExpenseReportNotification once the status change commits, and the
+send_expense_report_emails command (cron) delivers queued notifications,
+retrying failed sends up to MAX_ATTEMPTS times.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import send_mail
+from django.db.models import Q
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .models import ExpenseReportNotification
+
+logger = logging.getLogger(__name__)
+
+# Report statuses whose arrival emails the report's owner
+NOTIFY_STATUSES = ('rejected', 'approved', 'paid')
+
+MAX_ATTEMPTS = 3
+
+# A notification left in 'sending' this long is assumed abandoned by a crashed run
+STALE_SENDING_AGE = timedelta(minutes=15)
+
+
+def send_expense_report_email(report, email_type):
+    """
+    Send email notification for expense report status changes.
+
+    Args:
+        report: ExpenseReport instance
+        email_type: 'rejected', 'approved', or 'paid'
+
+    Returns:
+        True if sent, False if there is nobody to send it to.
+        Raises if the mail server refuses it.
+    """
+    # Get person's email
+    person = report.person
+    if not hasattr(person, 'user') or not person.user or not person.user.email:
+        logger.warning(f"Cannot send email for report {report.id}: No email address found")
+        return False
+
+    recipient_email = person.user.email
+
+    # Prepare common context
+    context = {
+        'person': person,
+        'report_id': report.id,
+        'report_type_name': report.report_type.report_name,
+        'total_amount': f"{report.total_amount:.2f}",
+        'submitted_date': report.created_at.strftime('%B %d, %Y'),
+        'domain': getattr(settings, 'DOMAIN', 'localhost:9000'),
+        'frontend_url': getattr(settings, 'FRONTEND_URL', 'http://localhost:5173'),
+    }
+
+    # Set email subject and template based on type
+    if email_type == 'rejected':
+        subject = f'Expense Report #{report.id} - Rejected'
+        template = 'expense_reports/expense_report_rejected_email.html'
+        context['rejection_reason'] = report.rejection_reason or 'No reason provided'
+
+    elif email_type == 'approved':
+        subject = f'Expense Report #{report.id} - Approved'
+        template = 'expense_reports/expense_report_approved_email.html'
+        context['approval_date'] = report.approval_date.strftime('%B %d, %Y') if report.approval_date else 'N/A'
+
+    elif email_type == 'paid':
+        subject = f'Expense Report #{report.id} - Payment Issued'
+        template = 'expense_reports/expense_report_paid_email.html'
+        context['payment_method'] = report.payment_method
+        context['payment_method_display'] = report.get_payment_method_display()
+        context['payment_check_number'] = report.payment_check_number
+        context['payment_payer'] = report.payment_payer
+        context['payment_date'] = report.paid_date.strftime('%B %d, %Y') if report.paid_date else 'N/A'
+    else:
+        logger.error(f"Invalid email type: {email_type}")
+        return False
+
+    # Render HTML email
+    html_message = render_to_string(template, context)
+
+    # Send email
+    send_mail(
+        subject=subject,
+        message='',  # Plain text version (optional)
+        from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@tbp.org'),
+        recipient_list=[recipient_email],
+        html_message=html_message,
+        fail_silently=False,
+    )
+
+    logger.info(f"Sent {email_type} email for report {report.id} to {recipient_email}")
+    return True
+
+
+def queue_expense_report_email(report_id, email_type):
+    return ExpenseReportNotification.objects.create(expense_report_id=report_id, email_type=email_type)
+
+
+def claimable_notifications():
+    """Notifications waiting to go out, including ones abandoned mid-send."""
+    return ExpenseReportNotification.objects.filter(
+        Q(status='queued') |
+        Q(status='sending', updated_at__lt=timezone.now() - STALE_SENDING_AGE)
+    ).select_related('expense_report__person__user', 'expense_report__report_type')
+
+
+def deliver_notification(notification):
+    """
+    Send one queued notification. Returns True if it was sent; False if another
+    worker claimed it, there was no recipient, or the send failed (it is
+    re-queued until MAX_ATTEMPTS is reached).
+    """
+    claimed = ExpenseReportNotification.objects.filter(
+        pk=notification.pk, status=notification.status, updated_at=notification.updated_at
+    ).update(status='sending', attempts=notification.attempts + 1, updated_at=timezone.now())
+    if not claimed:
+        return False
+
+    attempts = notification.attempts + 1
+    try:
+        sent = send_expense_report_email(notification.expense_report, notification.email_type)
+    except Exception as e:
+        logger.error(
+            f"Failed to send {notification.email_type} email for report {notification.expense_report_id}: {str(e)}",
+            extra={'report_id': notification.expense_report_id, 'attempts': attempts}
+        )
+        ExpenseReportNotification.objects.filter(pk=notification.pk).update(
+            status='queued' if attempts < MAX_ATTEMPTS else 'failed',
+            error=str(e), updated_at=timezone.now(),
+        )
+        return False
+
+    now = timezone.now()
+    ExpenseReportNotification.objects.filter(pk=notification.pk).update(
+        status='sent' if sent else 'failed',
+        error='' if sent else 'No email address on file.',
+        sent_at=now if sent else None,
+        updated_at=now,
+    )
+    return sent
@@ -0,0 +1,279 @@
+"""
+Finance print packets: many expense reports combined into one PDF.
+
+The staff print-packet endpoint records the reports to print as a
+PrintPacket and answers 202 straight away. The build_print_packets command
+(cron, or --watch under a process supervisor) then writes, for each report
+in order, a generated cover page with the payee, mailing address and the
+total_breakdown line items, followed by the report's stored receipt PDF.
+Receipts are opened one at a time from storage and the merged document is
+written to a temporary file before it is stored, so memory use is bounded
+by MAX_PRINT_PACKET_REPORTS and MAX_PRINT_PACKET_RECEIPT_SIZE. The finished
+PDF is served through protected_file_response (X-Accel-Redirect behind
+nginx) and removed after PRINT_PACKET_RETENTION.
+"""
+
+import io
+import logging
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.files.base import File
+from django.db.models import Q
+from django.utils import timezone
+from PyPDF2 import PdfReader, PdfWriter
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from .models import ExpenseReport, PrintPacket
+
+logger = logging.getLogger(__name__)
+
+# Reports printed when no report IDs are given: approved and not yet paid
+PRINT_PACKET_DEFAULT_STATUSES = ('approved',)
+
+MAX_PRINT_PACKET_REPORTS = 250
+MAX_PRINT_PACKET_RECEIPT_SIZE = 250 * 1024 * 1024  # 250 MB of stored receipts
+
+# A packet left in 'processing' this long is assumed abandoned by a crashed run
+STALE_PROCESSING_AGE = timedelta(minutes=30)
+
+# Finished packets (and their files) are deleted after this long
+PRINT_PACKET_RETENTION = timedelta(days=7)
+
+
+def _receipt_size(report):
+    if not report.receipt:
+        return 0
+    try:
+        return report.receipt.size
+    except OSError:
+        return 0
+
+
+def select_packet_reports(report_ids=None):
+    """
+    Resolve the reports for a new packet. With `report_ids`, those reports in
+    that order; otherwise every approved, unpaid report, oldest first.
+    Returns (list of report ids, error message or None).
+    """
+    if report_ids is None:
+        reports = list(
+            ExpenseReport.objects.filter(status__in=PRINT_PACKET_DEFAULT_STATUSES)
+            .order_by('approval_date', 'id')
+            .only('id', 'receipt')
+        )
+        if not reports:
+            return [], 'There are no approved, unpaid expense reports to print.'
+    else:
+        if not isinstance(report_ids, list) or not all(isinstance(i, int) and not isinstance(i, bool) for i in report_ids):
+            return [], 'report_ids must be a list of expense report IDs.'
+        report_ids = list(dict.fromkeys(report_ids))
+        if not report_ids:
+            return [], 'report_ids must not be empty.'
+        found = ExpenseReport.objects.filter(pk__in=report_ids).only('id', 'receipt').in_bulk()
+        missing = [i for i in report_ids if i not in found]
+        if missing:
+            return [], f'Expense report(s) not found: {", ".join(map(str, missing))}'
+        reports = [found[i] for i in report_ids]
+
+    if len(reports) > MAX_PRINT_PACKET_REPORTS:
+        return [], (
+            f'A print packet can hold at most {MAX_PRINT_PACKET_REPORTS} reports; '
+            f'{len(reports)} were selected. Please select fewer reports.'
+        )
+    if sum(_receipt_size(report) for report in reports) > MAX_PRINT_PACKET_RECEIPT_SIZE:
+        return [], (
+            f'The selected receipts exceed {MAX_PRINT_PACKET_RECEIPT_SIZE // (1024 * 1024)}MB. '
+            f'Please select fewer reports.'
+        )
+    return [report.id for report in reports], None
+
+
+def queue_print_packet(user, report_ids):
+    return PrintPacket.objects.create(requested_by=user, report_ids=report_ids)
+
+
+def claimable_print_packets():
+    """Packets waiting to be built, including ones abandoned mid-build."""
+    return PrintPacket.objects.filter(
+        Q(status='queued') |
+        Q(status='processing', updated_at__lt=timezone.now() - STALE_PROCESSING_AGE)
+    )
+
+
+def _money(amount):
+    return f'${amount:,.2f}'
+
+
+def _cover_page(report, receipt_note):
+    """Render the cover page for one report and return it as PDF bytes."""
+    person = report.person
+    member = getattr(person, 'member', None)
+    address = report.mailing_address
+
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter)
+    page_width, page_height = letter
+    left, right = 72, page_width - 72
+    y = page_height - 72
+
+    c.setFont('Helvetica-Bold', 16)
+    c.drawString(left, y, f'Expense Report #{report.id}')
+    c.setFont('Helvetica', 10)
+    c.drawRightString(right, y, report.get_status_display())
+    y -= 28
+
+    details = [
+        ('Payee', f'{person.first_name} {person.last_name}'),
+        ('Member ID', str(member.member_id) if member and member.member_id else 'N/A'),
+        ('Chapter', report.chapter),
+        ('Report type', f'{report.report_type.report_code} - {report.report_type.report_name}'),
+        ('Report date', report.report_date.strftime('%B %d, %Y')),
+        ('Approved', report.approval_date.strftime('%B %d, %Y') if report.approval_date else 'N/A'),
+        ('Payment method', report.get_payment_method_display() if report.payment_method else 'Not set'),
+    ]
+    for label, value in details:
+        c.setFont('Helvetica-Bold', 10)
+        c.drawString(left, y, label)
+        c.setFont('Helvetica', 10)
+        c.drawString(left + 110, y, value)
+        y -= 16
+
+    c.setFont('Helvetica-Bold', 10)
+    c.drawString(left, y, 'Mail to')
+    c.setFont('Helvetica', 10)
+    address_lines = [
+        address.add_line1,
+        address.add_line2,
+        ', '.join(part for part in (address.add_city, f'{address.add_state or ""} {address.add_zip}'.strip()) if part),
+        address.add_country if address.add_country != 'United States' else '',
+    ]
+    for line in filter(None, address_lines):
+        c.drawString(left + 110, y, line)
+        y -= 14
+    y -= 16
+
+    c.setFont('Helvetica-Bold', 12)
+    c.drawString(left, y, 'Reimbursement')
+    y -= 6
+    c.line(left, y, right, y)
+    y -= 16
+    c.setFont('Helvetica', 10)
+    for label, amount in report.total_breakdown():
+        if amount:
+            c.drawString(left, y, label)
+            c.drawRightString(right, y, _money(amount))
+            y -= 15
+    y += 4
+    c.line(left, y, right, y)
+    y -= 16
+    total = report.calculate_total()
+    c.setFont('Helvetica-Bold', 11)
+    c.drawString(left, y, 'Total')
+    c.drawRightString(right, y, _money(total))
+    y -= 16
+    if total.quantize(Decimal('0.01')) != report.total_amount:
+        c.setFont('Helvetica-Oblique', 10)
+        c.drawString(left, y, f'Stored report total is {_money(report.total_amount)}; rates have changed since it was saved.')
+        y -= 16
+
+    y -= 12
+    c.setFont('Helvetica', 10)
+    c.drawString(left, y, receipt_note)
+    c.showPage()
+    c.save()
+    return buffer.getvalue()
+
+
+def _append_report(writer, report):
+    """Add one report's cover page and receipt to `writer`."""
+    receipt_file = None
+    receipt = None
+    if not report.receipt:
+        note = 'No receipt on file.'
+    else:
+        try:
+            receipt_file = report.receipt.open('rb')
+            receipt = PdfReader(receipt_file)
+            note = f'Receipt: {len(receipt.pages)} page(s) follow.'
+        except Exception:
+            logger.exception('Could not read receipt for expense report %s', report.id)
+            receipt = None
+            note = 'The receipt on file could not be read; open it from the report instead.'
+
+    try:
+        writer.append(io.BytesIO(_cover_page(report, note)))
+        if receipt is not None:
+            writer.append(receipt)
+    finally:
+        # Appended pages are copied into the writer, so the receipt can be closed now
+        if receipt_file is not None:
+            receipt_file.close()
+
+
+def build_print_packet(packet):
+    """
+    Build one packet's PDF and store it. Returns True on success; False if
+    another worker claimed it or it failed.
+    """
+    claimed = PrintPacket.objects.filter(
+        pk=packet.pk, status=packet.status, updated_at=packet.updated_at
+    ).update(status='processing', updated_at=timezone.now())
+    if not claimed:
+        return False
+
+    reports = (
+        ExpenseReport.objects.filter(pk__in=packet.report_ids)
+        .select_related('person__member', 'report_type', 'details', 'mailing_address')
+        .in_bulk()
+    )
+    writer = PdfWriter()
+    try:
+        with tempfile.TemporaryFile(suffix='.pdf') as output:
+            for report_id in packet.report_ids:
+                # Reports deleted since the packet was requested are left out
+                if report_id in reports:
+                    _append_report(writer, reports[report_id])
+            writer.write(output)
+            page_count = len(writer.pages)
+            writer.close()
+            output.seek(0)
+            packet.file.save(f'print_packet_{packet.pk}.pdf', File(output), save=False)
+    except Exception:
+        logger.exception('Failed to build print packet %s', packet.pk)
+        PrintPacket.objects.filter(pk=packet.pk).update(
+            status='failed', error='Failed to build the print packet. Please try again.', updated_at=timezone.now(),
+        )
+        return False
+
+    packet.status = 'done'
+    packet.page_count = page_count
+    packet.file_size = packet.file.size
+    packet.completed_at = timezone.now()
+    packet.save(update_fields=['file', 'status', 'page_count', 'file_size', 'completed_at', 'updated_at'])
+    logger.info(
+        f"Built print packet {packet.pk}",
+        extra={
+            'packet_id': packet.pk,
+            'report_count': len(packet.report_ids),
+            'page_count': page_count,
+            'file_size': packet.file_size,
+        }
+    )
+    return True
+
+
+def prune_print_packets():
+    """Delete finished packets (and their files) older than PRINT_PACKET_RETENTION."""
+    expired = PrintPacket.objects.filter(
+        status__in=('done', 'failed'), created_at__lt=timezone.now() - PRINT_PACKET_RETENTION,
+    )
+    removed = 0
+    for packet in expired:
+        if packet.file:
+            packet.file.delete(save=False)
+        packet.delete()
+        removed += 1
+    return removed
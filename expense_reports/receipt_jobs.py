@@ -0,0 +1,144 @@
+"""
+Background combining of uploaded receipt files.
+
+upload_receipts validates the files, stores them as a ReceiptUploadJob and
+answers 202 straight away. The process_receipt_uploads command (cron, or
+--watch under a process supervisor) then merges them with
+combine_receipts_to_pdf and attaches the PDF to the expense report. Clients
+poll the job's status endpoint until it is done or failed.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.core.exceptions import ValidationError
+from django.core.files.base import File
+from django.core.files.uploadedfile import UploadedFile
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import ExpenseReport, ReceiptUploadFile, ReceiptUploadJob
+from .utils import combine_receipts_to_pdf, create_receipt_filename
+
+logger = logging.getLogger(__name__)
+
+# Report statuses that still accept new receipts
+RECEIPT_EDITABLE_STATUSES = ('submitted',)
+
+# A job left in 'processing' this long is assumed abandoned by a crashed run
+STALE_PROCESSING_AGE = timedelta(minutes=15)
+
+
+def _delete_job_files(job):
+    for upload in job.files.all():
+        upload.file.delete(save=False)
+    job.files.all().delete()
+
+
+def queue_receipt_upload(expense_report, user, uploaded_files):
+    """Store already-validated receipt files and queue them for combining."""
+    with transaction.atomic():
+        job = ReceiptUploadJob.objects.create(
+            expense_report=expense_report,
+            uploaded_by=user,
+            file_count=len(uploaded_files),
+            total_size=sum(f.size for f in uploaded_files),
+        )
+        for position, uploaded_file in enumerate(uploaded_files):
+            ReceiptUploadFile.objects.create(
+                job=job,
+                position=position,
+                file=uploaded_file,
+                original_name=uploaded_file.name[:255],
+                content_type=uploaded_file.content_type,
+                size=uploaded_file.size,
+            )
+
+    # An earlier upload nobody has started on would only be overwritten
+    for older in expense_report.receipt_jobs.filter(status='queued', created_at__lte=job.created_at).exclude(pk=job.pk):
+        _finish(older, 'superseded', expected_status='queued')
+    return job
+
+
+def claimable_receipt_jobs():
+    """Jobs waiting to run, including ones abandoned mid-run."""
+    return ReceiptUploadJob.objects.filter(
+        Q(status='queued') |
+        Q(status='processing', updated_at__lt=timezone.now() - STALE_PROCESSING_AGE)
+    )
+
+
+def _finish(job, status, error='', expected_status='processing'):
+    """Record a final status and drop the raw files. No-op if someone else already finished it."""
+    now = timezone.now()
+    finished = ReceiptUploadJob.objects.filter(pk=job.pk, status=expected_status).update(
+        status=status, error=error, completed_at=now, updated_at=now,
+    )
+    if finished:
+        _delete_job_files(job)
+    return finished
+
+
+def process_receipt_job(job):
+    """
+    Combine one job's files and attach the PDF to its report. Returns True on
+    success; False if another worker claimed it, it failed, or a newer upload
+    for the same report made it moot.
+    """
+    claimed = ReceiptUploadJob.objects.filter(
+        pk=job.pk, status=job.status, updated_at=job.updated_at
+    ).update(status='processing', updated_at=timezone.now())
+    if not claimed:
+        return False
+
+    report = ExpenseReport.objects.get(pk=job.expense_report_id)
+    if report.status not in RECEIPT_EDITABLE_STATUSES:
+        _finish(job, 'failed', f'Cannot upload receipts for a report with status: {report.get_status_display()}')
+        return False
+
+    uploads = [
+        UploadedFile(upload.file.open('rb'), name=upload.original_name,
+                     content_type=upload.content_type, size=upload.size)
+        for upload in job.files.all()
+    ]
+    try:
+        with combine_receipts_to_pdf(uploads) as combined_pdf, transaction.atomic():
+            report = ExpenseReport.objects.select_for_update().get(pk=job.expense_report_id)
+            newer = report.receipt_jobs.filter(
+                created_at__gt=job.created_at, status__in=('queued', 'processing', 'done'),
+            ).exists()
+            if newer:
+                _finish(job, 'superseded')
+                return False
+
+            old_name = report.receipt.name if report.receipt else ''
+            report.receipt_uploaded_at = timezone.now()
+            report.receipt.save(create_receipt_filename(report), File(combined_pdf), save=True)
+            new_name = report.receipt.name
+            if old_name and old_name != new_name:
+                transaction.on_commit(lambda: report.receipt.storage.delete(old_name))
+    except ValidationError as e:
+        logger.warning('Receipt upload %s for report %s could not be combined: %s',
+                       job.pk, job.expense_report_id, ' '.join(e.messages))
+        _finish(job, 'failed', 'One or more receipt files could not be read. Please check them and upload again.')
+        return False
+    except Exception:
+        logger.exception('Failed to process receipt upload %s for report %s', job.pk, job.expense_report_id)
+        _finish(job, 'failed', 'Failed to process receipt files. Please try uploading them again.')
+        return False
+    finally:
+        for upload in uploads:
+            upload.close()
+
+    _finish(job, 'done')
+    logger.info(
+        f"Combined receipts for expense report {job.expense_report_id}",
+        extra={
+            'report_id': job.expense_report_id,
+            'job_id': job.pk,
+            'file_count': job.file_count,
+            'total_size': job.total_size,
+        }
+    )
+    return True
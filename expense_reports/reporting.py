@@ -0,0 +1,164 @@
+"""
+Staff listing filters and the finance CSV export for expense reports.
+
+all_expense_reports and export_expense_reports share filter_staff_reports,
+so an export always matches what the list shows. List rows carry their
+member and report type names as query annotations rather than joined model
+instances. The export reads plain value rows with .iterator() and streams
+them out as CSV, one report and its detail line items per row, so a full
+year never sits in memory.
+"""
+
+import csv
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+
+from django.db.models import F, Value
+from django.db.models.functions import Concat
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from .models import ExpenseReport
+
+EXPORT_CHUNK_SIZE = 2000
+
+# Sort keys accepted in ?ordering= (each may be prefixed with '-')
+STAFF_REPORT_ORDERING = ('created_at', 'report_date', 'total_amount', 'chapter', 'status', 'id')
+
+# (CSV header, value path) for every export column
+EXPORT_COLUMNS = [
+    ('Report ID', 'id'),
+    ('Member ID', 'person__member__member_id'),
+    ('First Name', 'person__first_name'),
+    ('Last Name', 'person__last_name'),
+    ('Email', 'person__user__email'),
+    ('Chapter', 'chapter'),
+    ('Report Type', 'report_type__report_code'),
+    ('Report Date', 'report_date'),
+    ('Status', 'status'),
+    ('Submitted', 'created_at'),
+    ('Approved', 'approval_date'),
+    ('Paid', 'paid_date'),
+    ('Payment Method', 'payment_method'),
+    ('Check Number', 'payment_check_number'),
+    ('Payer', 'payment_payer'),
+    ('Automobile Miles', 'details__automobile_miles'),
+    ('Passengers', 'details__passengers'),
+    ('Tolls', 'details__automobile_tolls'),
+    ('Lodging Nights', 'details__lodging_nights'),
+    ('Lodging Per Night', 'details__lodging_per_night'),
+    ('Breakfasts En Route', 'details__breakfast_enroute'),
+    ('Lunches En Route', 'details__lunch_enroute'),
+    ('Dinners En Route', 'details__dinner_enroute'),
+    ('Breakfasts On Site', 'details__breakfast_onsite'),
+    ('Lunches On Site', 'details__lunch_onsite'),
+    ('Terminal Cost', 'details__terminal_cost'),
+    ('Public Carrier Cost', 'details__public_carrier_cost'),
+    ('Other On-Site Cost', 'details__other_onsite_cost'),
+    ('Billed to HQ', 'details__billed_to_hq'),
+    ('Total Amount', 'total_amount'),
+]
+
+STATUS_LABELS = dict(ExpenseReport.STATUS_CHOICES)
+PAYMENT_METHOD_LABELS = dict(ExpenseReport.PAYMENT_METHOD_CHOICES)
+
+
+def _parse_amount(value):
+    try:
+        amount = Decimal(value)
+    except InvalidOperation:
+        return None
+    return amount if amount.is_finite() else None
+
+
+def filter_staff_reports(queryset, params):
+    """
+    Apply the staff list filters in `params` (request.query_params).
+    Returns (queryset, error message or None).
+
+    status        one or more statuses, comma-separated
+    report_type   report type code, e.g. CV
+    chapter       exact chapter
+    date_from/to  report_date range, inclusive (YYYY-MM-DD)
+    min/max_amount  total_amount range, inclusive
+    ordering      one of STAFF_REPORT_ORDERING, '-' for descending
+    """
+    statuses = [s for s in params.get('status', '').split(',') if s]
+    if statuses:
+        unknown = set(statuses) - set(STATUS_LABELS)
+        if unknown:
+            return queryset, f'Invalid status: {", ".join(sorted(unknown))}'
+        queryset = queryset.filter(status__in=statuses)
+
+    if params.get('report_type'):
+        queryset = queryset.filter(report_type__report_code=params['report_type'])
+    if params.get('chapter'):
+        queryset = queryset.filter(chapter=params['chapter'])
+
+    for param, lookup in (('date_from', 'report_date__gte'), ('date_to', 'report_date__lte')):
+        if params.get(param):
+            try:
+                value = parse_date(params[param])
+            except ValueError:
+                value = None
+            if value is None:
+                return queryset, f'{param} must be a date in YYYY-MM-DD format.'
+            queryset = queryset.filter(**{lookup: value})
+
+    for param, lookup in (('min_amount', 'total_amount__gte'), ('max_amount', 'total_amount__lte')):
+        if params.get(param):
+            value = _parse_amount(params[param])
+            if value is None:
+                return queryset, f'{param} must be a number.'
+            queryset = queryset.filter(**{lookup: value})
+
+    ordering = params.get('ordering')
+    if ordering:
+        if ordering.lstrip('-') not in STAFF_REPORT_ORDERING:
+            return queryset, f'ordering must be one of: {", ".join(STAFF_REPORT_ORDERING)}'
+        # id breaks ties so pages don't overlap
+        queryset = queryset.order_by(ordering, '-id')
+    return queryset, None
+
+
+def annotate_staff_list(queryset):
+    """Names the list serializer shows, computed in the query."""
+    return queryset.annotate(
+        member_name=Concat('person__first_name', Value(' '), 'person__last_name'),
+        report_type_code=F('report_type__report_code'),
+        report_type_name=F('report_type__report_name'),
+    )
+
+
+class _Echo:
+    """File-like object whose write() hands back the line for a streaming response."""
+    def write(self, value):
+        return value
+
+
+def _csv_value(path, value):
+    if value is None:
+        return ''
+    if path == 'status':
+        return STATUS_LABELS.get(value, value)
+    if path == 'payment_method':
+        return PAYMENT_METHOD_LABELS.get(value, value)
+    if isinstance(value, bool):
+        return 'Yes' if value else 'No'
+    if isinstance(value, datetime):
+        return timezone.localtime(value).strftime('%Y-%m-%d %H:%M')
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(('=', '+', '-', '@')):
+        # Keep spreadsheet apps from evaluating member-entered text as a formula
+        return "'" + value
+    return value
+
+
+def expense_report_csv_rows(queryset):
+    """Yield CSV lines for `queryset`, header first, reading EXPORT_CHUNK_SIZE rows at a time."""
+    writer = csv.writer(_Echo())
+    paths = [path for _, path in EXPORT_COLUMNS]
+    yield writer.writerow([header for header, _ in EXPORT_COLUMNS])
+    for row in queryset.values_list(*paths).iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield writer.writerow([_csv_value(path, value) for path, value in zip(paths, row)])
@@ -1,6 +1,6 @@
 import bleach
 from rest_framework import serializers
-from .models import ExpenseReportType, ExpenseReport, ExpenseReportDetail
+from .models import ExpenseReportType, ExpenseReport, ExpenseReportDetail, PrintPacket, ReceiptUploadJob
 from accounts.models import Person
 from accounts.serializers import AddressSerializer
 
@@ -96,6 +96,16 @@ class ExpenseReportListSerializer(serializers.ModelSerializer):
         return f"{obj.person.first_name} {obj.person.last_name}"
 
 
+class ExpenseReportStaffListSerializer(ExpenseReportListSerializer):
+    """
+    List serializer for staff views. Reads names annotated onto the queryset
+    (reporting.annotate_staff_list) instead of loading related objects.
+    """
+    member_name = serializers.CharField(read_only=True)
+    report_type_code = serializers.CharField(read_only=True)
+    report_type_name = serializers.CharField(read_only=True)
+
+
 class ExpenseReportDetailedSerializer(serializers.ModelSerializer):
     """
     Detailed serializer for viewing a complete expense report.
@@ -210,16 +220,12 @@ class ExpenseReportCreateSerializer(serializers.ModelSerializer):
         # Create the expense report
         expense_report = ExpenseReport.objects.create(**validated_data)
         
-        # Create the details
+        # Create the details; saving them saves the report with its total
         ExpenseReportDetail.objects.create(
             expense_report=expense_report,
             **details_data
         )
         
-        # Calculate and save total
-        expense_report.total_amount = expense_report.calculate_total()
-        expense_report.save()
-        
         return expense_report
 
 
@@ -250,6 +256,71 @@ class ReceiptUploadSerializer(serializers.Serializer):
         return files
 
 
+class ReceiptUploadJobSerializer(serializers.ModelSerializer):
+    """Progress of a queued receipt upload; polled by the frontend until done or failed."""
+    status_url = serializers.SerializerMethodField()
+    receipt_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ReceiptUploadJob
+        fields = [
+            'id',
+            'expense_report',
+            'status',
+            'file_count',
+            'total_size',
+            'error',
+            'created_at',
+            'completed_at',
+            'status_url',
+            'receipt_url',
+        ]
+        read_only_fields = fields
+
+    def get_status_url(self, obj):
+        return f'/api/expense-reports/my-reports/{obj.expense_report_id}/receipt-jobs/{obj.id}/'
+
+    def get_receipt_url(self, obj):
+        if obj.status == 'done':
+            return f'/api/expense-reports/receipts/{obj.expense_report_id}/'
+        return None
+
+
+class PrintPacketSerializer(serializers.ModelSerializer):
+    """Progress of a queued print packet; polled by the frontend until done or failed."""
+    report_count = serializers.SerializerMethodField()
+    status_url = serializers.SerializerMethodField()
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = PrintPacket
+        fields = [
+            'id',
+            'status',
+            'report_ids',
+            'report_count',
+            'page_count',
+            'file_size',
+            'error',
+            'created_at',
+            'completed_at',
+            'status_url',
+            'download_url',
+        ]
+        read_only_fields = fields
+
+    def get_report_count(self, obj):
+        return len(obj.report_ids)
+
+    def get_status_url(self, obj):
+        return f'/api/expense-reports/staff/print-packets/{obj.id}/'
+
+    def get_download_url(self, obj):
+        if obj.status == 'done' and obj.file:
+            return f'/api/expense-reports/staff/print-packets/{obj.id}/download/'
+        return None
+
+
 class ExpenseReportUpdateSerializer(serializers.ModelSerializer):
     """
     Serializer for updating an expense report.
@@ -270,18 +341,15 @@ class ExpenseReportUpdateSerializer(serializers.ModelSerializer):
         # Update expense report fields
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-        instance.save()
         
-        # Update details if provided
+        # Update details if provided; saving them saves the report, total included
         if details_data and hasattr(instance, 'details'):
             details = instance.details
             for attr, value in details_data.items():
                 setattr(details, attr, value)
             details.save()
-        
-        # Recalculate total
-        instance.total_amount = instance.calculate_total()
-        instance.save()
+        else:
+            instance.save()
         
         return instance
 
@@ -1,129 +1,63 @@
 """
-Django signals for expense report email notifications.
-Sends automated emails when expense report status changes.
+Django signals for expense reports.
+Queues an email when an expense report's status changes (see notifications.py)
+and keeps the analytics rollups current (see analytics.py).
 """
 
-from django.db.models.signals import post_save, pre_save
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
-from django.core.mail import send_mail
-from django.template.loader import render_to_string
-from django.conf import settings
-import logging
 
+from .analytics import refresh_rollups, rollup_group
 from .models import ExpenseReport
-
-logger = logging.getLogger(__name__)
+from .notifications import NOTIFY_STATUSES, queue_expense_report_email
 
 
-def send_expense_report_email(report, email_type):
-    """
-    Send email notification for expense report status changes.
-    
-    Args:
-        report: ExpenseReport instance
-        email_type: 'rejected', 'approved', or 'paid'
+@receiver(post_save, sender=ExpenseReport)
+def expense_report_status_changed(sender, instance, created, **kwargs):
     """
-    try:
-        # Get person's email
-        person = report.person
-        if not hasattr(person, 'user') or not person.user or not person.user.email:
-            logger.warning(f"Cannot send email for report {report.id}: No email address found")
-            return
+    Queue an email when expense report status changes.
 
-        recipient_email = person.user.email
+    Triggered after every save of an ExpenseReport. The original status is
+    recorded on the instance when it is loaded (ExpenseReport.from_db), and the
+    email is queued only once the change commits.
+    """
+    # Don't send emails for newly created reports
+    if created:
+        return
 
-        # Prepare common context
-        context = {
-            'person': person,
-            'report_id': report.id,
-            'report_type_name': report.report_type.report_name,
-            'total_amount': f"{report.total_amount:.2f}",
-            'submitted_date': report.created_at.strftime('%B %d, %Y'),
-            'domain': getattr(settings, 'DOMAIN', 'localhost:9000'),
-            'frontend_url': getattr(settings, 'FRONTEND_URL', 'http://localhost:5173'),
-        }
-        
-        # Set email subject and template based on type
-        if email_type == 'rejected':
-            subject = f'Expense Report #{report.id} - Rejected'
-            template = 'expense_reports/expense_report_rejected_email.html'
-            context['rejection_reason'] = report.rejection_reason or 'No reason provided'
-            
-        elif email_type == 'approved':
-            subject = f'Expense Report #{report.id} - Approved'
-            template = 'expense_reports/expense_report_approved_email.html'
-            context['approval_date'] = report.approval_date.strftime('%B %d, %Y') if report.approval_date else 'N/A'
-            
-        elif email_type == 'paid':
-            subject = f'Expense Report #{report.id} - Payment Issued'
-            template = 'expense_reports/expense_report_paid_email.html'
-            context['payment_method'] = report.payment_method
-            context['payment_method_display'] = report.get_payment_method_display()
-            context['payment_check_number'] = report.payment_check_number
-            context['payment_payer'] = report.payment_payer
-            context['payment_date'] = report.paid_date.strftime('%B %d, %Y') if report.paid_date else 'N/A'
-        else:
-            logger.error(f"Invalid email type: {email_type}")
-            return
-        
-        # Render HTML email
-        html_message = render_to_string(template, context)
-        
-        # Send email
-        send_mail(
-            subject=subject,
-            message='',  # Plain text version (optional)
-            from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@tbp.org'),
-            recipient_list=[recipient_email],
-            html_message=html_message,
-            fail_silently=False,
-        )
-        
-        logger.info(f"Sent {email_type} email for report {report.id} to {recipient_email}")
-        
-    except Exception as e:
-        logger.error(f"Failed to send {email_type} email for report {report.id}: {str(e)}")
+    update_fields = kwargs.get('update_fields')
+    if update_fields is not None and 'status' not in update_fields:
+        return
 
+    # Unknown for instances not loaded from the database
+    old_status = getattr(instance, '_original_status', None)
+    if old_status is None:
+        return
 
-@receiver(pre_save, sender=ExpenseReport)
-def store_original_status(sender, instance, **kwargs):
-    """
-    Store the original status before saving.
-    This allows the post_save signal to detect changes.
-    """
-    if instance.pk:
-        try:
-            original = ExpenseReport.objects.get(pk=instance.pk)
-            instance._original_status = original.status
-        except ExpenseReport.DoesNotExist:
-            pass
+    new_status = instance.status
+    if old_status != new_status and new_status in NOTIFY_STATUSES:
+        transaction.on_commit(partial(queue_expense_report_email, instance.pk, new_status))
 
 
 @receiver(post_save, sender=ExpenseReport)
-def expense_report_status_changed(sender, instance, created, **kwargs):
+def expense_report_rollup_changed(sender, instance, created, **kwargs):
     """
-    Send email when expense report status changes.
-    
-    Triggered after every save of an ExpenseReport.
-    Tracks the original status using a custom attribute set in pre_save.
+    Refresh the rollups for the report's old and new (chapter, type, month)
+    once a save that changes anything they count commits.
     """
-    # Don't send emails for newly created reports
-    if created:
-        return
-    
-    # Check if we have the original status (set by pre_save signal)
-    if not hasattr(instance, '_original_status'):
+    original = getattr(instance, '_original_rollup', None)
+    if not created and original == instance.rollup_values():
         return
-    
-    old_status = instance._original_status
-    new_status = instance.status
-    
-    # Check if status changed
-    if old_status != new_status:
-        # Send appropriate email based on new status
-        if new_status == 'rejected':
-            send_expense_report_email(instance, 'rejected')
-        elif new_status == 'approved':
-            send_expense_report_email(instance, 'approved')
-        elif new_status == 'paid':
-            send_expense_report_email(instance, 'paid')
+    groups = {rollup_group(instance.chapter, instance.report_type_id, instance.report_date)}
+    if original is not None and original[2] is not None:
+        groups.add(rollup_group(*original[:3]))
+    transaction.on_commit(partial(refresh_rollups, groups))
+
+
+@receiver(post_delete, sender=ExpenseReport)
+def expense_report_rollup_deleted(sender, instance, **kwargs):
+    group = rollup_group(instance.chapter, instance.report_type_id, instance.report_date)
+    transaction.on_commit(partial(refresh_rollups, {group}))
@@ -1,3 +1,75 @@
+import datetime
+from decimal import Decimal
+from unittest import mock
+
+from django.db import connection
 from django.test import TestCase
 
-# Create your tests here.
+from accounts.models import Address, Person
+from .analytics import refresh_rollups, rollup_group
+from .models import ExpenseReport, ExpenseReportRollup, ExpenseReportType
+
+
+class RollupRefreshTests(TestCase):
+    def setUp(self):
+        self.person = Person.objects.create(first_name='Test', last_name='Member')
+        self.address = Address.objects.create(person=self.person, add_line1='1 Main St', add_city='Knoxville', add_type='home')
+        self.report_type = ExpenseReportType.objects.create(report_code='CV', report_name='Convention')
+
+    def create_report(self, **kwargs):
+        values = {
+            'person': self.person,
+            'report_type': self.report_type,
+            'chapter': 'TN A',
+            'mailing_address': self.address,
+            'report_date': datetime.date(2026, 3, 5),
+        }
+        values.update(kwargs)
+        with self.captureOnCommitCallbacks(execute=True):
+            return ExpenseReport.objects.create(**values)
+
+    def rollups(self):
+        return sorted(
+            ExpenseReportRollup.objects.values_list('month', 'chapter', 'status', 'report_count', 'total_amount')
+        )
+
+    def test_status_change_moves_report_between_rollups(self):
+        report = self.create_report(total_amount=Decimal('40.00'))
+        self.create_report(total_amount=Decimal('10.00'))
+        report = ExpenseReport.objects.get(pk=report.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            report.status = 'paid'
+            report.save()
+
+        self.assertEqual(self.rollups(), [
+            (datetime.date(2026, 3, 1), 'TN A', 'paid', 1, Decimal('40.00')),
+            (datetime.date(2026, 3, 1), 'TN A', 'submitted', 1, Decimal('10.00')),
+        ])
+
+    def test_moving_report_refreshes_old_and_new_group(self):
+        report = self.create_report(total_amount=Decimal('40.00'))
+        report = ExpenseReport.objects.get(pk=report.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            report.report_date = datetime.date(2026, 4, 2)
+            report.save()
+
+        self.assertEqual(self.rollups(), [
+            (datetime.date(2026, 4, 1), 'TN A', 'submitted', 1, Decimal('40.00')),
+        ])
+
+    def test_report_date_string_on_create(self):
+        self.create_report(report_date='2026-03-05')
+        self.assertEqual(len(self.rollups()), 1)
+
+    def test_refresh_without_conflict_target_support(self):
+        # MySQL: ON DUPLICATE KEY UPDATE without unique_fields
+        report = self.create_report(total_amount=Decimal('40.00'))
+        ExpenseReport.objects.filter(pk=report.pk).update(status='approved')
+        with mock.patch.object(connection.features, 'supports_update_conflicts_with_target', False), \
+                mock.patch.object(ExpenseReportRollup.objects, 'bulk_create', wraps=ExpenseReportRollup.objects.bulk_create) as bulk_create:
+            refresh_rollups({rollup_group('TN A', self.report_type.pk, report.report_date)})
+
+        self.assertNotIn('unique_fields', bulk_create.call_args.kwargs)
+        self.assertEqual(self.rollups(), [
+            (datetime.date(2026, 3, 1), 'TN A', 'approved', 1, Decimal('40.00')),
+        ])
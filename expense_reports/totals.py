@@ -0,0 +1,74 @@
+"""
+Bulk recalculation of expense report totals.
+
+ExpenseReport.calculate_total reads the mileage rates and meal and lodging
+caps from the report's ExpenseReportType, but a report's stored total only
+changes when that report is saved. After finance changes a type's rates,
+recalculate_totals brings existing reports up to date. It reads reports
+with their details and type in one joined query, in chunks via
+.iterator(), recomputes each total in memory and writes back only the ones
+that changed with bulk_update, one UPDATE per chunk.
+
+It is used by the recalculate_expense_totals command and the admin actions.
+bulk_update skips save() and signals, so the analytics rollups of the
+changed reports are refreshed here once all chunks are written.
+"""
+
+from decimal import Decimal
+
+from .analytics import refresh_rollups, rollup_group
+from .models import ExpenseReport
+
+RECALCULATE_CHUNK_SIZE = 1000
+
+# Reports not yet paid or rejected; closed reports keep the total they were settled at
+OPEN_STATUSES = ('submitted', 'reviewed', 'approved')
+
+
+def recalculate_totals(queryset, dry_run=False, chunk_size=RECALCULATE_CHUNK_SIZE):
+    """
+    Recompute total_amount for every report in `queryset`.
+
+    Returns (number of reports checked, list of (report id, old total, new total)
+    for the ones whose total changed). With dry_run nothing is written.
+    """
+    checked = 0
+    changes = []
+    batch = []
+    groups = set()
+
+    reports = (
+        queryset.select_related('report_type', 'details')
+        .order_by('pk')
+        .iterator(chunk_size=chunk_size)
+    )
+    for report in reports:
+        checked += 1
+        total = report.calculate_total().quantize(Decimal('0.01'))
+        if total == report.total_amount:
+            continue
+        changes.append((report.pk, report.total_amount, total))
+        report.total_amount = total
+        batch.append(report)
+        groups.add(rollup_group(report.chapter, report.report_type_id, report.report_date))
+        if len(batch) >= chunk_size:
+            _write(batch, dry_run)
+            batch = []
+    _write(batch, dry_run)
+    if not dry_run:
+        refresh_rollups(groups)
+    return checked, changes
+
+
+def _write(batch, dry_run):
+    if batch and not dry_run:
+        ExpenseReport.objects.bulk_update(batch, ['total_amount'])
+
+
+def summarize_changes(checked, changes):
+    """One-line summary of a recalculate_totals result."""
+    net = sum((new - old for _, old, new in changes), Decimal('0.00'))
+    return (
+        f'{len(changes)} of {checked} expense report total(s) changed, '
+        f'net change {"+" if net >= 0 else "-"}${abs(net):,.2f}.'
+    )
@@ -11,9 +11,15 @@ urlpatterns = [
     path('my-reports/', views.my_expense_reports, name='my-reports'),
     path('my-reports/<int:report_id>/', views.expense_report_detail, name='report-detail'),
     path('my-reports/<int:report_id>/upload-receipts/', views.upload_receipts, name='upload-receipts'),
+    path('my-reports/<int:report_id>/receipt-jobs/<int:job_id>/', views.receipt_upload_status, name='receipt-upload-status'),
     path('receipts/<int:report_id>/', views.serve_receipt, name='serve-receipt'),
     
     # Staff endpoints (for review and management)
     path('staff/reports/', views.all_expense_reports, name='staff-all-reports'),
+    path('staff/reports/export/', views.export_expense_reports, name='staff-export-reports'),
     path('staff/reports/<int:report_id>/', views.staff_expense_report_detail, name='staff-report-detail'),
+    path('staff/analytics/', views.expense_analytics, name='staff-analytics'),
+    path('staff/print-packets/', views.create_print_packet, name='staff-create-print-packet'),
+    path('staff/print-packets/<int:packet_id>/', views.print_packet_status, name='staff-print-packet-status'),
+    path('staff/print-packets/<int:packet_id>/download/', views.download_print_packet, name='staff-download-print-packet'),
 ]
@@ -5,14 +5,19 @@ Handles file validation and combining multiple files into a single PDF.
 
 import os
 import io
-from PIL import Image
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image, ImageOps
 from PyPDF2 import PdfMerger, PdfReader
+from reportlab import rl_config
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.utils import ImageReader
 from django.core.exceptions import ValidationError
 from django.core.files.uploadedfile import InMemoryUploadedFile
 
+from core.uploads import detect_file_type
+
 
 # File size limits
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB per file
@@ -23,12 +28,12 @@ ALLOWED_IMAGE_TYPES = {'image/png', 'image/jpeg', 'image/jpg'}
 ALLOWED_PDF_TYPE = 'application/pdf'
 ALLOWED_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.pdf'}
 
-# Magic bytes for file type verification
-FILE_SIGNATURES = {
-    b'%PDF': 'pdf',
-    b'\x89PNG': 'png',
-    b'\xff\xd8\xff': 'jpeg',
-}
+# Receipt images are printed no sharper than this on a letter page; larger
+# images (e.g. 12 MP phone photos) are downsampled to it before embedding.
+RECEIPT_IMAGE_DPI = 200
+RECEIPT_JPEG_QUALITY = 85
+RECEIPT_WORKERS = min(4, os.cpu_count() or 1)
+EXIF_ORIENTATION = 0x0112
 
 
 def _verify_magic_bytes(uploaded_file):
@@ -39,11 +44,7 @@ def _verify_magic_bytes(uploaded_file):
     pos = uploaded_file.tell()
     header = uploaded_file.read(8)
     uploaded_file.seek(pos)
-
-    for signature, file_type in FILE_SIGNATURES.items():
-        if header.startswith(signature):
-            return file_type
-    return None
+    return detect_file_type(header)
 
 
 def validate_receipt_file(uploaded_file):
@@ -126,117 +127,141 @@ def validate_receipt_files(files):
     return True
 
 
-def image_to_pdf_bytes(image_file):
+def _receipt_worker_init():
+    # Store image streams as raw binary; the ASCII85 default inflates every JPEG by 25%
+    rl_config.useA85 = 0
+
+
+def _flatten_to_rgb(image):
+    """Composite transparent images onto white and convert everything else to RGB."""
+    if image.mode in ('RGBA', 'LA', 'P'):
+        if image.mode == 'P':
+            image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.split()[-1])
+        return background
+    if image.mode != 'RGB':
+        return image.convert('RGB')
+    return image
+
+
+def image_to_pdf_bytes(source):
     """
-    Convert an image file to PDF bytes.
-    
+    Convert one receipt image to a single letter-size PDF page.
+
+    JPEGs that are upright and already within RECEIPT_IMAGE_DPI at their
+    printed size are embedded as-is. Anything larger is downsampled to that
+    resolution (JPEGs are scaled while decoding) and re-encoded as JPEG.
+
     Args:
-        image_file: Django UploadedFile object containing an image
-        
+        source: Image file contents as bytes, or a path to the image file
+
     Returns:
-        BytesIO object containing PDF data
+        PDF file contents as bytes
     """
-    # Open the image
-    image = Image.open(image_file)
-    
-    # Convert to RGB if necessary (for PNG with transparency)
-    if image.mode in ('RGBA', 'LA', 'P'):
-        background = Image.new('RGB', image.size, (255, 255, 255))
-        if image.mode == 'P':
-            image = image.convert('RGBA')
-        background.paste(image, mask=image.split()[-1] if image.mode in ('RGBA', 'LA') else None)
-        image = background
-    elif image.mode != 'RGB':
-        image = image.convert('RGB')
-    
-    # Get image dimensions
-    img_width, img_height = image.size
-    
-    # Determine page size based on image orientation
-    # Use letter size and scale image to fit
+    if isinstance(source, (bytes, bytearray)):
+        data = bytes(source)
+    else:
+        with open(source, 'rb') as f:
+            data = f.read()
+
+    image = Image.open(io.BytesIO(data))
+    orientation = image.getexif().get(EXIF_ORIENTATION, 1)
+    rotated = orientation in (5, 6, 7, 8)
+    img_width, img_height = (image.height, image.width) if rotated else image.size
+
+    # Scale to fit a letter page with a 5% margin, keeping the aspect ratio
     page_width, page_height = letter
-    
-    # Calculate scaling to fit page while maintaining aspect ratio
-    width_ratio = page_width / img_width
-    height_ratio = page_height / img_height
-    scale_ratio = min(width_ratio, height_ratio) * 0.95  # 95% to add margins
-    
+    scale_ratio = min(page_width / img_width, page_height / img_height) * 0.95
     new_width = img_width * scale_ratio
     new_height = img_height * scale_ratio
-    
-    # Center image on page
     x_offset = (page_width - new_width) / 2
     y_offset = (page_height - new_height) / 2
-    
-    # Create PDF in memory
+
+    # Pixels needed to print at RECEIPT_IMAGE_DPI at that size
+    max_pixels = (
+        max(1, round(new_width / 72 * RECEIPT_IMAGE_DPI)),
+        max(1, round(new_height / 72 * RECEIPT_IMAGE_DPI)),
+    )
+    fits = img_width <= max_pixels[0] and img_height <= max_pixels[1]
+
+    if image.format == 'JPEG' and orientation == 1 and image.mode in ('RGB', 'L') and fits:
+        jpeg = data
+    else:
+        if image.format == 'JPEG':
+            image.draft(None, (max_pixels[1], max_pixels[0]) if rotated else max_pixels)
+        image = _flatten_to_rgb(ImageOps.exif_transpose(image))
+        image.thumbnail(max_pixels, Image.LANCZOS)
+        buf = io.BytesIO()
+        image.save(buf, format='JPEG', quality=RECEIPT_JPEG_QUALITY)
+        jpeg = buf.getvalue()
+
     pdf_buffer = io.BytesIO()
     c = canvas.Canvas(pdf_buffer, pagesize=letter)
-    
-    # Save image to temporary buffer for reportlab
-    img_buffer = io.BytesIO()
-    image.save(img_buffer, format='JPEG', quality=95)
-    img_buffer.seek(0)
-    
-    # Draw image on PDF
-    c.drawImage(
-        ImageReader(img_buffer),
-        x_offset,
-        y_offset,
-        width=new_width,
-        height=new_height,
-        preserveAspectRatio=True
-    )
-    
+    c.drawImage(ImageReader(io.BytesIO(jpeg)), x_offset, y_offset, width=new_width, height=new_height)
     c.save()
-    pdf_buffer.seek(0)
-    
-    return pdf_buffer
+    return pdf_buffer.getvalue()
+
+
+def _images_to_pdf_pages(sources):
+    """Convert receipt images to PDF pages in parallel, preserving order."""
+    if not sources:
+        return []
+    workers = min(RECEIPT_WORKERS, len(sources))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_receipt_worker_init) as pool:
+        return list(pool.map(image_to_pdf_bytes, sources))
+
+
+def _image_source(uploaded_file):
+    """Path of an upload spooled to disk, else its bytes; either can go to a worker."""
+    if hasattr(uploaded_file, 'temporary_file_path'):
+        return uploaded_file.temporary_file_path()
+    uploaded_file.seek(0)
+    return uploaded_file.read()
 
 
 def combine_receipts_to_pdf(uploaded_files):
     """
     Combine multiple receipt files (images and PDFs) into a single PDF.
-    
+
+    Images are converted in a process pool; the merged PDF is written to a
+    temporary file rather than held in memory.
+
     Args:
         uploaded_files: List of Django UploadedFile objects
-        
+
     Returns:
-        BytesIO object containing the combined PDF
+        Temporary file object, positioned at the start, containing the combined
+        PDF. The caller must close it.
     """
+    for uploaded_file in uploaded_files:
+        if uploaded_file.content_type not in ALLOWED_IMAGE_TYPES and uploaded_file.content_type != ALLOWED_PDF_TYPE:
+            raise ValidationError(f'Unsupported file type: {uploaded_file.content_type}')
+
     merger = PdfMerger()
-    
+    output = tempfile.TemporaryFile(suffix='.pdf')
     try:
+        images = [f for f in uploaded_files if f.content_type in ALLOWED_IMAGE_TYPES]
+        pages = dict(zip(map(id, images), _images_to_pdf_pages([_image_source(f) for f in images])))
+
         for uploaded_file in uploaded_files:
-            # Reset file pointer
-            uploaded_file.seek(0)
-            
-            # Determine file type
-            content_type = uploaded_file.content_type
-            
-            if content_type in ALLOWED_IMAGE_TYPES:
-                # Convert image to PDF
-                pdf_bytes = image_to_pdf_bytes(uploaded_file)
-                merger.append(pdf_bytes)
-            
-            elif content_type == ALLOWED_PDF_TYPE:
-                # Add PDF directly
-                merger.append(uploaded_file)
-            
+            if uploaded_file.content_type in ALLOWED_IMAGE_TYPES:
+                merger.append(io.BytesIO(pages[id(uploaded_file)]))
             else:
-                raise ValidationError(f'Unsupported file type: {content_type}')
-        
-        # Write combined PDF to buffer
-        output_buffer = io.BytesIO()
-        merger.write(output_buffer)
-        merger.close()
-        
-        output_buffer.seek(0)
-        return output_buffer
-    
+                uploaded_file.seek(0)
+                merger.append(uploaded_file)
+
+        merger.write(output)
+        output.seek(0)
+        return output
+
     except Exception as e:
-        merger.close()
+        output.close()
         raise ValidationError(f'Error combining receipt files: {str(e)}')
 
+    finally:
+        merger.close()
+
 
 def create_receipt_filename(expense_report):
     """
@@ -3,29 +3,37 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.pagination import PageNumberPagination
-from django.conf import settings
-from django.http import FileResponse, HttpResponse
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 
+from core.protected_files import protected_file_response
+from core.uploads import upload_error, validated_uploads
+
 
 class ExpenseReportPagination(PageNumberPagination):
     page_size = 50
     page_size_query_param = 'page_size'
     max_page_size = 200
 
-from .models import ExpenseReportType, ExpenseReport, ExpenseReportDetail
+from .models import ExpenseReportType, ExpenseReport, ExpenseReportDetail, PrintPacket, ReceiptUploadJob
 from .serializers import (
     ExpenseReportTypeSerializer,
     ExpenseReportListSerializer,
+    ExpenseReportStaffListSerializer,
     ExpenseReportDetailedSerializer,
     ExpenseReportCreateSerializer,
     ExpenseReportUpdateSerializer,
     ExpenseReportStaffUpdateSerializer,
+    PrintPacketSerializer,
     ReceiptUploadSerializer,
+    ReceiptUploadJobSerializer,
 )
-from .utils import combine_receipts_to_pdf, create_receipt_filename
-from django.core.files.base import ContentFile
+from .analytics import ANALYTICS_DEFAULT_STATUSES, STATUS_LABELS, fiscal_year, get_expense_analytics
+from .print_packets import queue_print_packet, select_packet_reports
+from .receipt_jobs import queue_receipt_upload
+from .reporting import annotate_staff_list, expense_report_csv_rows, filter_staff_reports
+from .utils import MAX_FILE_SIZE, MAX_TOTAL_SIZE
 import logging
 
 logger = logging.getLogger(__name__)
@@ -130,11 +138,10 @@ def serve_receipt(request, report_id):
         return Response({'error': 'Not found.'}, status=status.HTTP_404_NOT_FOUND)
     if not report.receipt:
         return Response({'error': 'No receipt on file.'}, status=status.HTTP_404_NOT_FOUND)
-    if settings.DEBUG:
-        return FileResponse(report.receipt.open('rb'), content_type='application/pdf')
-    response = HttpResponse(content_type='application/pdf')
-    response['X-Accel-Redirect'] = f'/protected-media/{report.receipt.name}'
-    return response
+    # Reports with receipts from before upload times were recorded fall back to updated_at
+    return protected_file_response(
+        request, report.receipt, 'application/pdf', modified=report.receipt_uploaded_at or report.updated_at,
+    )
 
 
 @api_view(['GET'])
@@ -166,12 +173,14 @@ def expense_report_detail(request, report_id):
     return Response(serializer.data)
 
 
+@validated_uploads({'files': {'pdf', 'png', 'jpeg'}}, max_file_size=MAX_FILE_SIZE, max_total_size=MAX_TOTAL_SIZE)
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def upload_receipts(request, report_id):
     """
     POST: Upload receipt files for an expense report.
-    Combines multiple files into a single PDF.
+    Stores the files and returns 202 with a job that combines them into a
+    single PDF in the background.
     """
     person = request.user.person
 
@@ -198,7 +207,10 @@ def upload_receipts(request, report_id):
             status=status.HTTP_400_BAD_REQUEST
         )
     
-    # Get files from request
+    # Get files from request; oversized or mistyped files were refused while streaming in
+    rejected = upload_error(request)
+    if rejected:
+        return Response({'error': rejected}, status=status.HTTP_400_BAD_REQUEST)
     files = request.FILES.getlist('files')
     
     if not files:
@@ -213,53 +225,42 @@ def upload_receipts(request, report_id):
     if not serializer.is_valid():
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
-    try:
-        # Combine files into single PDF
-        combined_pdf = combine_receipts_to_pdf(files)
-        
-        # Create filename
-        filename = create_receipt_filename(expense_report)
-        
-        # Delete old receipt if exists
-        if expense_report.receipt:
-            expense_report.receipt.delete(save=False)
-        
-        # Save new receipt
-        expense_report.receipt.save(
-            filename,
-            ContentFile(combined_pdf.read()),
-            save=True
-        )
-        
-        logger.info(
-            f"User {request.user.email} uploaded receipts for expense report {report_id}",
-            extra={
-                'user_id': request.user.id,
-                'person_id': person.id,
-                'report_id': report_id,
-                'file_count': len(files),
-                'total_size': sum(f.size for f in files)
-            }
-        )
-        
-        # Return updated report
-        detail_serializer = ExpenseReportDetailedSerializer(expense_report, context={'request': request})
-        return Response(detail_serializer.data, status=status.HTTP_200_OK)
-        
-    except Exception as e:
-        logger.error(
-            f"Failed to upload receipts for report {report_id}: {str(e)}",
-            extra={
-                'user_id': request.user.id,
-                'report_id': report_id,
-                'error': str(e)
-            }
-        )
+    # Combining happens in process_receipt_uploads; poll the job for the result
+    job = queue_receipt_upload(expense_report, request.user, files)
+
+    logger.info(
+        f"User {request.user.email} uploaded receipts for expense report {report_id}",
+        extra={
+            'user_id': request.user.id,
+            'person_id': person.id,
+            'report_id': report_id,
+            'job_id': job.id,
+            'file_count': len(files),
+            'total_size': job.total_size
+        }
+    )
+
+    return Response(ReceiptUploadJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def receipt_upload_status(request, report_id, job_id):
+    """GET: Status of a receipt upload job for one of the user's reports."""
+    job = get_object_or_404(
+        ReceiptUploadJob.objects.select_related('expense_report'),
+        id=job_id,
+        expense_report_id=report_id,
+    )
+
+    if job.expense_report.person != request.user.person:
         return Response(
-            {'error': 'Failed to process receipt files. Please try again.'},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            {'error': 'You do not have permission to access this report'},
+            status=status.HTTP_403_FORBIDDEN
         )
 
+    return Response(ReceiptUploadJobSerializer(job).data)
+
 
 
 # Staff/Admin endpoints
@@ -272,35 +273,142 @@ def all_expense_reports(request):
     """
     Get all expense reports (for staff review).
     Restricted to hq_staff, hq_finance, and executive_council roles.
+    Filters and ordering come from query params; see reporting.filter_staff_reports.
     """
     if not any(request.user.has_role(role) for role in STAFF_EXPENSE_ROLES):
         return Response(
             {'message': 'You do not have permission to view all expense reports.'},
             status=status.HTTP_403_FORBIDDEN
         )
-    # Filter by status if provided
-    status_filter = request.query_params.get('status')
-    
-    reports = ExpenseReport.objects.select_related(
-        'person',
-        'report_type',
-        'reviewer',
-        'approver'
-    ).prefetch_related('details')
-
-    if status_filter:
-        reports = reports.filter(status=status_filter)
+    reports, error = filter_staff_reports(annotate_staff_list(ExpenseReport.objects.all()), request.query_params)
+    if error:
+        return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
 
     paginator = ExpenseReportPagination()
     page = paginator.paginate_queryset(reports, request)
     if page is not None:
-        serializer = ExpenseReportListSerializer(page, many=True)
+        serializer = ExpenseReportStaffListSerializer(page, many=True)
         return paginator.get_paginated_response(serializer.data)
 
-    serializer = ExpenseReportListSerializer(reports, many=True)
+    serializer = ExpenseReportStaffListSerializer(reports, many=True)
     return Response(serializer.data)
 
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export_expense_reports(request):
+    """
+    Stream the filtered expense reports, with their detail line items, as CSV.
+    Takes the same filters as all_expense_reports.
+    """
+    if not any(request.user.has_role(role) for role in STAFF_EXPENSE_ROLES):
+        return Response(
+            {'message': 'You do not have permission to export expense reports.'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    reports, error = filter_staff_reports(ExpenseReport.objects.all(), request.query_params)
+    if error:
+        return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+
+    logger.info(
+        f"Staff {request.user.email} exported expense reports",
+        extra={'user_id': request.user.id, 'filters': dict(request.query_params.items())}
+    )
+    response = StreamingHttpResponse(expense_report_csv_rows(reports), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="expense_reports_{timezone.now():%Y%m%d}.csv"'
+    return response
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def expense_analytics(request):
+    """
+    Spend per chapter, report type, month and status for one fiscal year.
+    Query params: fiscal_year (default: the current one) and status
+    (comma-separated, default: every status but rejected).
+    """
+    if not any(request.user.has_role(role) for role in STAFF_EXPENSE_ROLES):
+        return Response(
+            {'message': 'You do not have permission to view expense analytics.'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+
+    year = request.query_params.get('fiscal_year')
+    if year is None:
+        year = fiscal_year(timezone.localdate())
+    elif not year.isdigit() or not 2000 <= int(year) <= 2100:
+        return Response({'error': 'fiscal_year must be a four-digit year.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    statuses = {s for s in request.query_params.get('status', '').split(',') if s} or set(ANALYTICS_DEFAULT_STATUSES)
+    unknown = statuses - set(STATUS_LABELS)
+    if unknown:
+        return Response({'error': f'Invalid status: {", ".join(sorted(unknown))}'}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response(get_expense_analytics(int(year), statuses))
+
+
+# Roles that may see receipts (serve_receipt) and so print them
+PRINT_PACKET_ROLES = ('hq_staff', 'hq_finance', 'hq_admin')
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def create_print_packet(request):
+    """
+    POST: Queue one PDF of cover pages and receipts for finance to print.
+    Body: {"report_ids": [...]} in print order, or no report_ids for every
+    approved, unpaid report. Returns 202 with a packet to poll; the PDF is
+    built by the build_print_packets command.
+    """
+    if not any(request.user.has_role(role) for role in PRINT_PACKET_ROLES):
+        return Response(
+            {'message': 'You do not have permission to print expense reports.'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+
+    report_ids, error = select_packet_reports(request.data.get('report_ids'))
+    if error:
+        return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+
+    packet = queue_print_packet(request.user, report_ids)
+    logger.info(
+        f"Staff {request.user.email} requested print packet {packet.id}",
+        extra={'user_id': request.user.id, 'packet_id': packet.id, 'report_count': len(report_ids)}
+    )
+    return Response(PrintPacketSerializer(packet).data, status=status.HTTP_202_ACCEPTED)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def print_packet_status(request, packet_id):
+    """GET: Status of a print packet."""
+    if not any(request.user.has_role(role) for role in PRINT_PACKET_ROLES):
+        return Response(
+            {'message': 'You do not have permission to print expense reports.'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    packet = get_object_or_404(PrintPacket, id=packet_id)
+    return Response(PrintPacketSerializer(packet).data)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def download_print_packet(request, packet_id):
+    """GET: The finished print packet PDF."""
+    if not any(request.user.has_role(role) for role in PRINT_PACKET_ROLES):
+        return Response({'error': 'Not found.'}, status=status.HTTP_404_NOT_FOUND)
+    packet = get_object_or_404(PrintPacket, id=packet_id)
+    if packet.status != 'done' or not packet.file:
+        return Response(
+            {'error': 'This print packet is not ready yet.'},
+            status=status.HTTP_409_CONFLICT
+        )
+    return protected_file_response(
+        request, packet.file, 'application/pdf', modified=packet.completed_at,
+        filename=f'print_packet_{packet.id}.pdf',
+    )
+
+
 @api_view(['GET', 'PUT'])
 @permission_classes([IsAuthenticated])
 def staff_expense_report_detail(request, report_id):
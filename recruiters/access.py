@@ -0,0 +1,118 @@
+"""
+Resolved recruiter access for the active convention.
+
+Every recruiter endpoint needs the same answers: is this an approved recruiter,
+what organization type, which active convention registration, does its booth
+package include resumes. Working that out takes four or five queries, so the
+result is cached per user for a few minutes. recruiters/signals.py drops a
+user's entry when their profile, organization, registration or roles change,
+or when a booth package they hold changes; convention changes drop everyone's.
+"""
+import uuid
+
+from django.core.cache import cache
+
+from accounts.models import ROLE_RECRUITER
+from convention.models import Convention
+from .models import RecruiterProfile, RecruiterRegistration
+from .resumes import RESUME_VISIBILITY_TIERS, resume_visibility_tier
+
+RECRUITER_ACCESS_TIMEOUT = 5 * 60
+
+# Registration statuses that still grant access to the resume pool
+ACTIVE_REGISTRATION_STATUSES = ('pending', 'approved', 'confirmed')
+
+# Bumped to drop every cached entry at once (e.g. the active convention changed)
+RECRUITER_ACCESS_GENERATION_KEY = 'recruiters:access:generation'
+
+
+def recruiter_access_cache_key(user_id):
+    return f'recruiters:access:user:{user_id}'
+
+
+class RecruiterAccess:
+    """Plain snapshot of a user's recruiter access; safe to cache."""
+
+    FIELDS = (
+        'user_id', 'is_recruiter', 'is_approved', 'profile_id', 'organization_id', 'org_type',
+        'visibility_tier', 'convention_id', 'registration_id', 'registration_status',
+        'resume_access',
+    )
+
+    def __init__(self, **values):
+        for field in self.FIELDS:
+            setattr(self, field, values.get(field))
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    @property
+    def has_registration(self):
+        return self.registration_id is not None
+
+    @property
+    def resume_visibility(self):
+        """visible_to_recruiters values this recruiter may see."""
+        return RESUME_VISIBILITY_TIERS[self.visibility_tier]
+
+
+def build_recruiter_access(user):
+    values = {'user_id': user.pk, 'is_recruiter': user.has_role(ROLE_RECRUITER)}
+    profile = RecruiterProfile.objects.select_related('organization').filter(user=user).first()
+    if profile:
+        values.update(
+            is_approved=values['is_recruiter'] and profile.is_approved,
+            profile_id=profile.pk,
+            organization_id=profile.organization_id,
+            org_type=profile.organization.org_type if profile.organization else None,
+            visibility_tier=resume_visibility_tier(profile),
+        )
+    else:
+        values['is_approved'] = False
+
+    convention = Convention.objects.filter(is_active=True).only('id').first()
+    if convention:
+        values['convention_id'] = convention.pk
+    if profile and convention:
+        registration = RecruiterRegistration.objects.select_related('booth_package').filter(
+            recruiter=profile, convention=convention,
+            status__in=ACTIVE_REGISTRATION_STATUSES,
+        ).first()
+        if registration:
+            values.update(
+                registration_id=registration.pk,
+                registration_status=registration.status,
+                resume_access=registration.booth_package.includes_resume_access,
+            )
+    values.setdefault('resume_access', False)
+    return RecruiterAccess(**values)
+
+
+def get_recruiter_access(request):
+    """Return the RecruiterAccess for request.user, from the request, cache, or database."""
+    access = getattr(request, '_recruiter_access', None)
+    if access is not None:
+        return access
+
+    key = recruiter_access_cache_key(request.user.pk)
+    cached = cache.get_many([RECRUITER_ACCESS_GENERATION_KEY, key])
+    generation = cached.get(RECRUITER_ACCESS_GENERATION_KEY)
+    entry = cached.get(key)
+    if entry is not None and entry['generation'] == generation:
+        access = RecruiterAccess(**entry['access'])
+    else:
+        access = build_recruiter_access(request.user)
+        cache.set(key, {'generation': generation, 'access': access.as_dict()}, RECRUITER_ACCESS_TIMEOUT)
+
+    request._recruiter_access = access
+    return access
+
+
+def invalidate_recruiter_access(user_ids):
+    keys = [recruiter_access_cache_key(user_id) for user_id in set(user_ids) if user_id]
+    if keys:
+        cache.delete_many(keys)
+
+
+def invalidate_all_recruiter_access():
+    cache.set(RECRUITER_ACCESS_GENERATION_KEY, uuid.uuid4().hex, None)
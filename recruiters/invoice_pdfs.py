@@ -0,0 +1,162 @@
+"""
+Invoice PDF rendering and caching.
+
+Each invoice's PDF is rendered once with reportlab and stored on the invoice
+along with the version it was rendered from: the invoice's and its
+organization's updated_at. Any edit to either changes the version, so the next
+request re-renders; otherwise the stored file is served as-is.
+
+render_invoice_pdf needs nothing but the invoice with its organization and
+convention loaded, so the render_invoice_pdfs command can fan rendering out
+over a process pool and store the results from the parent.
+"""
+
+import hashlib
+import io
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.platypus import Image, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from .models import Invoice
+
+TBP_LOGO = settings.BASE_DIR / 'static' / 'img' / 'logo_horizontal_blue.png'
+TBP_CONTACT_EMAIL = 'tbp@tbp.org'
+ACCENT = colors.HexColor('#284080')
+MUTED = colors.HexColor('#6c757d')
+
+
+def invoice_pdf_version(invoice):
+    """Token identifying the invoice and organization data a PDF was rendered from."""
+    stamp = f'{invoice.updated_at.isoformat()}|{invoice.organization.updated_at.isoformat()}'
+    return hashlib.sha256(stamp.encode()).hexdigest()[:16]
+
+
+def invoice_pdf_is_current(invoice):
+    return bool(invoice.pdf) and invoice.pdf_version == invoice_pdf_version(invoice)
+
+
+def _text(value):
+    return escape(str(value or '')).replace('\n', '<br/>')
+
+
+def _bill_to_lines(org):
+    city_line = ', '.join(filter(None, [org.city, ' '.join(filter(None, [org.state, org.zip_code]))]))
+    lines = [
+        f'<b>{_text(org.name)}</b>',
+        f'Attn: {_text(org.billing_contact_first_name)} {_text(org.billing_contact_last_name)}',
+        _text(org.address_line1),
+        _text(org.address_line2),
+        _text(city_line),
+        _text(org.country),
+        _text(org.billing_email),
+    ]
+    return '<br/>'.join(line for line in lines if line)
+
+
+def render_invoice_pdf(invoice):
+    """Render an invoice to PDF bytes."""
+    styles = getSampleStyleSheet()
+    body = ParagraphStyle('InvoiceBody', parent=styles['Normal'], fontSize=10, leading=14)
+    label = ParagraphStyle('InvoiceLabel', parent=body, textColor=MUTED)
+    title = ParagraphStyle('InvoiceTitle', parent=styles['Title'], alignment=0, textColor=ACCENT, fontSize=22)
+
+    buf = io.BytesIO()
+    doc = SimpleDocTemplate(
+        buf, pagesize=letter,
+        leftMargin=0.75 * inch, rightMargin=0.75 * inch, topMargin=0.75 * inch, bottomMargin=0.75 * inch,
+        title=f'Invoice {invoice.invoice_number}', author='Tau Beta Pi',
+    )
+    story = []
+    if TBP_LOGO.exists():
+        logo = Image(str(TBP_LOGO))
+        logo.drawWidth, logo.drawHeight = 2.4 * inch, 2.4 * inch * logo.imageHeight / logo.imageWidth
+        logo.hAlign = 'LEFT'
+        story += [logo, Spacer(1, 0.2 * inch)]
+    story.append(Paragraph(f'Invoice {_text(invoice.invoice_number)}', title))
+
+    details = [
+        [Paragraph('Issued', label), Paragraph(invoice.issued_date.strftime('%B %d, %Y'), body)],
+        [Paragraph('Payment due', label), Paragraph(f'<b>{invoice.due_date.strftime("%B %d, %Y")}</b>', body)],
+        [Paragraph('Status', label), Paragraph(invoice.get_status_display(), body)],
+    ]
+    if invoice.paid_date:
+        details.append([Paragraph('Paid', label), Paragraph(invoice.paid_date.strftime('%B %d, %Y'), body)])
+    header = Table(
+        [[Paragraph(_bill_to_lines(invoice.organization), body), Table(details, colWidths=[1.1 * inch, 1.9 * inch])]],
+        colWidths=[3.8 * inch, 3.2 * inch],
+    )
+    header.setStyle(TableStyle([('VALIGN', (0, 0), (-1, -1), 'TOP'), ('LEFTPADDING', (0, 0), (0, 0), 0)]))
+    story += [Paragraph('Bill to', label), header, Spacer(1, 0.35 * inch)]
+
+    amount = f'${invoice.amount:,.2f}'
+    lines = Table(
+        [
+            ['Description', 'Convention', 'Amount'],
+            [Paragraph(_text(invoice.description), body), str(invoice.convention.year), amount],
+            ['', 'Amount due', amount],
+        ],
+        colWidths=[4.2 * inch, 1.3 * inch, 1.5 * inch],
+    )
+    lines.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), ACCENT),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTNAME', (1, -1), (-1, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('ALIGN', (2, 0), (2, -1), 'RIGHT'),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('LINEBELOW', (0, 1), (-1, 1), 0.5, MUTED),
+        ('TOPPADDING', (0, 0), (-1, -1), 6),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+    ]))
+    story += [lines, Spacer(1, 0.35 * inch)]
+
+    if invoice.payment_link:
+        link = _text(invoice.payment_link)
+        story.append(Paragraph(f'Pay online: <link href="{link}" color="#284080">{link}</link>', body))
+    if invoice.notes:
+        story += [Spacer(1, 0.15 * inch), Paragraph('Notes', label), Paragraph(_text(invoice.notes), body)]
+    story += [
+        Spacer(1, 0.35 * inch),
+        Paragraph(
+            'Questions about this invoice or payment arrangements? Contact us at '
+            f'<link href="mailto:{TBP_CONTACT_EMAIL}" color="#284080">{TBP_CONTACT_EMAIL}</link>.',
+            body,
+        ),
+    ]
+    doc.build(story)
+    return buf.getvalue()
+
+
+def store_invoice_pdf(invoice, data, version=None):
+    """Save rendered bytes and point the invoice at them, replacing any older file."""
+    version = version or invoice_pdf_version(invoice)
+    filename = invoice.pdf.field.generate_filename(invoice, f'{invoice.invoice_number}_{version}.pdf')
+    name = default_storage.save(filename, ContentFile(data))
+    old_name = invoice.pdf.name if invoice.pdf else ''
+    # .update() so the cache columns don't bump updated_at and invalidate themselves
+    Invoice.objects.filter(pk=invoice.pk).update(pdf=name, pdf_version=version)
+    invoice.pdf.name, invoice.pdf_version = name, version
+    if old_name and old_name != name:
+        default_storage.delete(old_name)
+    return name
+
+
+def get_invoice_pdf(invoice, force=False):
+    """Return the storage name of an up-to-date PDF for `invoice`, rendering it if needed."""
+    version = invoice_pdf_version(invoice)
+    if not force and invoice.pdf_version == version and invoice.pdf and default_storage.exists(invoice.pdf.name):
+        return invoice.pdf.name
+    return store_invoice_pdf(invoice, render_invoice_pdf(invoice), version)
+
+
+def invoices_for_pdf():
+    """Invoices with everything render_invoice_pdf reads already joined."""
+    return Invoice.objects.select_related('organization', 'convention')
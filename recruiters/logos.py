@@ -0,0 +1,144 @@
+"""
+Organization logo processing.
+
+Uploaded logos are decoded with Pillow and re-encoded, which drops EXIF and
+other metadata, then downsized to LOGO_MAX_SIZE. Fixed-size variants are
+rendered alongside. Every file is named by a hash of its bytes, so a logo URL
+never changes meaning and nginx can serve org_logos/ with a year-long
+immutable cache header (see the nginx notes in core/settings.py).
+"""
+
+import hashlib
+import io
+
+from PIL import Image, ImageOps
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db.models import Q
+
+from .models import Organization
+
+LOGO_DIR = 'org_logos'
+LOGO_MAX_SIZE = (1600, 1600)
+LOGO_MAX_PIXELS = 40_000_000  # refuse decompression bombs before resizing
+JPEG_QUALITY = 85
+
+# Organization field -> bounding box. Images are scaled to fit, never enlarged.
+LOGO_VARIANTS = {
+    'logo_thumbnail': (200, 200),   # lists, dashboards, email headers
+    'logo_sign': (1200, 600),       # booth signs and sponsor pages
+}
+
+LOGO_FIELDS = ('logo', *LOGO_VARIANTS)
+
+
+class LogoProcessingError(Exception):
+    pass
+
+
+def _encode(image, fmt):
+    buf = io.BytesIO()
+    if fmt == 'PNG':
+        image.save(buf, format='PNG', optimize=True)
+    else:
+        image.save(buf, format='JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+    return buf.getvalue()
+
+
+def _store(data, suffix, ext):
+    """Save bytes under a content-hash name; identical content is stored once."""
+    digest = hashlib.sha256(data).hexdigest()[:20]
+    name = f'{LOGO_DIR}/{digest}_{suffix}.{ext}'
+    if not default_storage.exists(name):
+        name = default_storage.save(name, ContentFile(data))
+    return name
+
+
+def _open_logo(uploaded_file):
+    try:
+        uploaded_file.seek(0)
+        image = Image.open(uploaded_file)
+        if image.width * image.height > LOGO_MAX_PIXELS:
+            raise LogoProcessingError('Logo dimensions are too large.')
+        fmt = image.format
+        image.load()
+    except LogoProcessingError:
+        raise
+    except Exception as exc:
+        raise LogoProcessingError('Logo does not appear to be a valid PNG or JPG image.') from exc
+    if fmt not in ('PNG', 'JPEG'):
+        raise LogoProcessingError('Logo must be a PNG or JPG file.')
+
+    # Bake in camera rotation before the EXIF block is dropped
+    image = ImageOps.exif_transpose(image)
+    if fmt == 'PNG':
+        image = image.convert('RGBA' if image.mode in ('RGBA', 'LA', 'P') else 'RGB')
+    else:
+        image = image.convert('RGB')
+    return image, fmt
+
+
+def check_logo(uploaded_file):
+    """Return an error message if the upload can't be processed as a logo, else None."""
+    try:
+        _open_logo(uploaded_file)
+    except LogoProcessingError as exc:
+        return str(exc)
+    finally:
+        uploaded_file.seek(0)
+    return None
+
+
+def _fit(image, size):
+    fitted = image.copy()
+    fitted.thumbnail(size, Image.LANCZOS)
+    return fitted
+
+
+def render_logo_files(uploaded_file):
+    """
+    Decode, clean and resize an uploaded logo. Returns {field: storage name}
+    for the master and every variant. Raises LogoProcessingError.
+    """
+    image, fmt = _open_logo(uploaded_file)
+    ext = 'png' if fmt == 'PNG' else 'jpg'
+    master = _fit(image, LOGO_MAX_SIZE)
+    names = {'logo': _store(_encode(master, fmt), 'logo', ext)}
+    for field, size in LOGO_VARIANTS.items():
+        names[field] = _store(_encode(_fit(master, size), fmt), field.removeprefix('logo_'), ext)
+    return names
+
+
+def _delete_unreferenced(names, exclude_org_id):
+    """Delete logo files no other organization points at (files are shared by content hash)."""
+    for name in set(filter(None, names)):
+        in_use = Organization.objects.exclude(pk=exclude_org_id).filter(
+            Q(logo=name) | Q(logo_thumbnail=name) | Q(logo_sign=name)
+        ).exists()
+        if not in_use:
+            default_storage.delete(name)
+
+
+def set_org_logo(org, uploaded_file):
+    """Process an uploaded logo and attach it and its variants to `org`."""
+    names = render_logo_files(uploaded_file)
+    old = [getattr(org, field).name for field in LOGO_FIELDS]
+    for field, name in names.items():
+        setattr(org, field, name)
+    org.save(update_fields=list(LOGO_FIELDS))
+    _delete_unreferenced(set(old) - set(names.values()), org.pk)
+
+
+def clear_org_logo(org):
+    old = [getattr(org, field).name for field in LOGO_FIELDS]
+    for field in LOGO_FIELDS:
+        setattr(org, field, None)
+    org.save(update_fields=list(LOGO_FIELDS))
+    _delete_unreferenced(old, org.pk)
+
+
+def reprocess_org_logo(org):
+    """Rebuild an existing logo's master and variants from its stored file."""
+    with org.logo.open('rb') as f:
+        data = f.read()
+    set_org_logo(org, io.BytesIO(data))
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from convention.models import Convention
+from recruiters.resumes import (
+    RESUME_VISIBILITY_TIERS, build_bundle, claimable_bundles, prune_stale_bundles, queue_bundle,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Build queued resume bundles for recruiter bulk downloads and prune bundles '
+        'made stale by resume changes. Schedule from cron, e.g. every 5 minutes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--warm', action='store_true',
+            help='Also queue the unfiltered pool bundle for every visibility tier of the active convention(s)',
+        )
+
+    def handle(self, *args, **options):
+        removed = prune_stale_bundles()
+        if removed:
+            self.stdout.write(f'Pruned {removed} stale bundle(s).')
+
+        if options['warm']:
+            for convention in Convention.objects.filter(is_active=True):
+                for tier in RESUME_VISIBILITY_TIERS:
+                    queue_bundle(convention, tier, {'school': '', 'curriculum': None})
+
+        built = 0
+        for bundle in claimable_bundles():
+            if build_bundle(bundle):
+                built += 1
+                self.stdout.write(
+                    f'  {bundle.convention} {bundle.visibility_tier} {bundle.filters}: '
+                    f'{bundle.resume_count} resume(s), {bundle.file_size} bytes'
+                )
+        self.stdout.write(self.style.SUCCESS(f'Done. {built} bundle(s) built.'))
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F, Q
+from convention.models import ConventionRegistration
+from recruiters.resume_previews import claimable_previews, generate_resume_preview, queue_resume_preview
+
+
+class Command(BaseCommand):
+    help = (
+        'Render queued resume preview images and thumbnails. '
+        'Schedule from cron, e.g. every minute.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--backfill', action='store_true',
+            help='First queue every resume with no preview or a preview of a replaced file',
+        )
+        parser.add_argument(
+            '--limit', type=int, default=None,
+            help='Render at most this many previews in this run',
+        )
+
+    def handle(self, *args, **options):
+        if options['backfill']:
+            missing = ConventionRegistration.objects.exclude(resume='').filter(resume__isnull=False).filter(
+                Q(resume_preview__isnull=True) | ~Q(resume_preview__source_name=F('resume'))
+            )
+            queued = 0
+            for registration in missing.iterator():
+                queue_resume_preview(registration)
+                queued += 1
+            self.stdout.write(f'Queued {queued} resume(s) for preview.')
+
+        previews = claimable_previews().order_by('created_at')
+        if options['limit']:
+            previews = previews[:options['limit']]
+
+        rendered = failed = 0
+        for preview in previews:
+            if generate_resume_preview(preview):
+                rendered += 1
+            else:
+                failed += 1
+        self.stdout.write(self.style.SUCCESS(f'Done. {rendered} preview(s) rendered, {failed} skipped or failed.'))
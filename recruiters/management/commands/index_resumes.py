@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from convention.models import ConventionRegistration
+from recruiters.resume_search import index_resume
+
+
+class Command(BaseCommand):
+    help = 'Extract text from uploaded resumes and build the keyword search index'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--convention-id', type=int,
+            help='Only registrations for this convention (default: all)',
+        )
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Re-index every resume, not just ones missing from the index',
+        )
+
+    def handle(self, *args, **options):
+        registrations = ConventionRegistration.objects.exclude(resume='').filter(resume__isnull=False)
+        if options['convention_id']:
+            registrations = registrations.filter(convention_id=options['convention_id'])
+        if not options['all']:
+            registrations = registrations.filter(resume_text__isnull=True)
+
+        indexed = 0
+        for registration in registrations.iterator():
+            index_resume(registration)
+            indexed += 1
+        self.stdout.write(self.style.SUCCESS(f'Done. {indexed} resume(s) indexed.'))
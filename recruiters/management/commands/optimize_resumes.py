@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F, Q, Sum
+from convention.models import ConventionRegistration
+from recruiters.models import ResumeOptimization
+from recruiters.resume_optimization import claimable_optimizations, optimize_resume, queue_resume_optimization
+
+
+class Command(BaseCommand):
+    help = (
+        'Rewrite queued resume PDFs to smaller files, keeping the original when the '
+        'rewrite is not smaller. Schedule from cron, e.g. every 5 minutes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--backfill', action='store_true',
+            help='First queue every resume not yet optimized, or replaced since it was',
+        )
+        parser.add_argument(
+            '--limit', type=int, default=None,
+            help='Process at most this many resumes in this run',
+        )
+
+    def handle(self, *args, **options):
+        if options['backfill']:
+            missing = ConventionRegistration.objects.exclude(resume='').filter(resume__isnull=False).filter(
+                Q(resume_optimization__isnull=True) | ~Q(resume_optimization__source_name=F('resume'))
+            )
+            queued = 0
+            for registration in missing.iterator():
+                queue_resume_optimization(registration)
+                queued += 1
+            self.stdout.write(f'Queued {queued} resume(s) for optimization.')
+
+        optimizations = claimable_optimizations().order_by('created_at')
+        if options['limit']:
+            optimizations = optimizations[:options['limit']]
+
+        optimized = kept = 0
+        for optimization in optimizations:
+            if optimize_resume(optimization):
+                optimized += 1
+            else:
+                kept += 1
+
+        totals = ResumeOptimization.objects.filter(status='optimized').aggregate(
+            original=Sum('original_size'), optimized=Sum('optimized_size'),
+        )
+        saved = (totals['original'] or 0) - (totals['optimized'] or 0)
+        self.stdout.write(self.style.SUCCESS(
+            f'Done. {optimized} resume(s) optimized, {kept} kept as uploaded or skipped. '
+            f'{saved / (1024 * 1024):.1f} MB saved across all optimized resumes.'
+        ))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from recruiters.logos import LogoProcessingError, reprocess_org_logo
+from recruiters.models import Organization
+
+
+class Command(BaseCommand):
+    help = 'Clean and resize existing organization logos and render their variants'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Reprocess every logo, not just ones missing variants',
+        )
+
+    def handle(self, *args, **options):
+        orgs = Organization.objects.exclude(logo='').filter(logo__isnull=False)
+        if not options['all']:
+            orgs = orgs.filter(logo_thumbnail='') | orgs.filter(logo_thumbnail__isnull=True)
+
+        processed = failed = 0
+        for org in orgs:
+            try:
+                reprocess_org_logo(org)
+                processed += 1
+            except (LogoProcessingError, OSError) as exc:
+                failed += 1
+                self.stderr.write(f'  {org}: {exc}')
+        self.stdout.write(self.style.SUCCESS(f'Done. {processed} logo(s) processed, {failed} failed.'))
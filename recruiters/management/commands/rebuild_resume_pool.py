@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from convention.models import Convention
+from recruiters.resume_pool import rebuild_resume_pool
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the denormalized resume pool table behind the recruiter resume list. '
+        'Signals keep it current; run after deploys or bulk imports to backfill and repair drift.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--convention-id', type=int,
+            help='Only this convention (default: all)',
+        )
+
+    def handle(self, *args, **options):
+        conventions = Convention.objects.all()
+        if options['convention_id']:
+            conventions = conventions.filter(pk=options['convention_id'])
+
+        for convention in conventions:
+            created, updated, deleted = rebuild_resume_pool(convention)
+            if created or updated or deleted:
+                self.stdout.write(
+                    f'  {convention}: {created} created, {updated} updated, {deleted} deleted'
+                )
+        self.stdout.write(self.style.SUCCESS('Done.'))
@@ -0,0 +1,78 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from convention.models import Convention
+from recruiters.invoice_pdfs import (
+    invoice_pdf_is_current, invoices_for_pdf, render_invoice_pdf, store_invoice_pdf,
+)
+
+
+def _init_worker():
+    # Needed under the spawn start method; a no-op for forked workers
+    django.setup()
+
+
+class Command(BaseCommand):
+    help = (
+        'Render PDFs for every invoice of a convention whose cached PDF is missing or '
+        'out of date. Rendering runs in a process pool; files are stored by this process.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--convention-id', type=int, default=None,
+            help='Convention to render (default: the active convention)',
+        )
+        parser.add_argument(
+            '--workers', type=int, default=None,
+            help='Worker processes (default: CPU count; 1 renders in this process)',
+        )
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Re-render invoices whose cached PDF is still current',
+        )
+
+    def handle(self, *args, **options):
+        if options['convention_id']:
+            convention = Convention.objects.filter(pk=options['convention_id']).first()
+        else:
+            convention = Convention.objects.filter(is_active=True).first()
+        if convention is None:
+            raise CommandError('Convention not found.')
+
+        invoices = invoices_for_pdf().filter(convention=convention)
+        pending = [inv for inv in invoices if options['force'] or not invoice_pdf_is_current(inv)]
+        if not pending:
+            self.stdout.write(self.style.SUCCESS(f'All invoice PDFs for {convention} are current.'))
+            return
+
+        workers = max(1, min(options['workers'] or os.cpu_count() or 1, len(pending)))
+        rendered = failed = 0
+        if workers == 1:
+            for invoice in pending:
+                try:
+                    store_invoice_pdf(invoice, render_invoice_pdf(invoice))
+                    rendered += 1
+                except Exception as exc:
+                    failed += 1
+                    self.stderr.write(f'  {invoice.invoice_number}: {exc}')
+        else:
+            # Workers only render; they never touch the database, so don't hand them open connections
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+                futures = {pool.submit(render_invoice_pdf, invoice): invoice for invoice in pending}
+                for future in as_completed(futures):
+                    invoice = futures[future]
+                    try:
+                        store_invoice_pdf(invoice, future.result())
+                        rendered += 1
+                    except Exception as exc:
+                        failed += 1
+                        self.stderr.write(f'  {invoice.invoice_number}: {exc}')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Done. {rendered} invoice PDF(s) rendered for {convention} using {workers} worker(s), {failed} failed.'
+        ))
@@ -0,0 +1,42 @@
+# Generated by Django 5.0 on 2026-10-19 16:41
+
+import django.db.models.deletion
+import recruiters.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('convention', '0019_convention_resume_set_version'),
+        ('recruiters', '0008_update_resumecurriculum_reference'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeBundle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('visibility_tier', models.CharField(max_length=20)),
+                ('filters', models.JSONField(blank=True, default=dict)),
+                ('filter_hash', models.CharField(max_length=64)),
+                ('resume_set_version', models.PositiveIntegerField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('building', 'Building'), ('ready', 'Ready'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('file', models.FileField(blank=True, upload_to=recruiters.models.resume_bundle_upload_path)),
+                ('resume_count', models.IntegerField(default=0)),
+                ('file_size', models.BigIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('built_at', models.DateTimeField(blank=True, null=True)),
+                ('convention', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resume_bundles', to='convention.convention')),
+            ],
+            options={
+                'db_table': 'resume_bundle',
+                'indexes': [models.Index(fields=['status'], name='resume_bund_status_b5ea2a_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='resumebundle',
+            constraint=models.UniqueConstraint(fields=('convention', 'visibility_tier', 'filter_hash', 'resume_set_version'), name='unique_resume_bundle_key'),
+        ),
+    ]
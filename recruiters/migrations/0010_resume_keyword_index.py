@@ -0,0 +1,45 @@
+# Generated by Django 5.0 on 2026-10-19 16:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('convention', '0019_convention_resume_set_version'),
+        ('recruiters', '0009_resume_bundle'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeText',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text', models.TextField(blank=True)),
+                ('term_count', models.IntegerField(default=0)),
+                ('extracted_at', models.DateTimeField(auto_now=True)),
+                ('registration', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='resume_text', to='convention.conventionregistration')),
+            ],
+            options={
+                'db_table': 'resume_text',
+            },
+        ),
+        migrations.CreateModel(
+            name='ResumeTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64)),
+                ('weight', models.FloatField()),
+                ('registration', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resume_terms', to='convention.conventionregistration')),
+            ],
+            options={
+                'db_table': 'resume_term',
+                'indexes': [models.Index(fields=['term', 'registration'], name='resume_term_term_e55219_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='resumeterm',
+            constraint=models.UniqueConstraint(fields=('registration', 'term'), name='unique_resume_term'),
+        ),
+    ]
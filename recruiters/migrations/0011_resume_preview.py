@@ -0,0 +1,34 @@
+# Generated by Django 5.0 on 2026-10-19 16:45
+
+import django.db.models.deletion
+import recruiters.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('convention', '0019_convention_resume_set_version'),
+        ('recruiters', '0010_resume_keyword_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumePreview',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('ready', 'Ready'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('source_name', models.CharField(blank=True, max_length=255)),
+                ('preview', models.ImageField(blank=True, upload_to=recruiters.models.resume_preview_upload_path)),
+                ('thumbnail', models.ImageField(blank=True, upload_to=recruiters.models.resume_preview_upload_path)),
+                ('renderer', models.CharField(blank=True, max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('registration', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='resume_preview', to='convention.conventionregistration')),
+            ],
+            options={
+                'db_table': 'resume_preview',
+                'indexes': [models.Index(fields=['status'], name='resume_prev_status_cc56a8_idx')],
+            },
+        ),
+    ]
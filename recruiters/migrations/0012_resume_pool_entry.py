@@ -0,0 +1,40 @@
+# Generated by Django 5.0 on 2026-10-19 16:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0014_delete_staff'),
+        ('convention', '0019_convention_resume_set_version'),
+        ('recruiters', '0011_resume_preview'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumePoolEntry',
+            fields=[
+                ('registration', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='pool_entry', serialize=False, to='convention.conventionregistration')),
+                ('visible_to_recruiters', models.CharField(max_length=20)),
+                ('first_name', models.CharField(max_length=100)),
+                ('preferred_first_name', models.CharField(blank=True, max_length=100)),
+                ('last_name', models.CharField(max_length=100)),
+                ('email', models.CharField(blank=True, max_length=254)),
+                ('chapter_code', models.CharField(blank=True, max_length=100)),
+                ('school_name', models.CharField(blank=True, max_length=255)),
+                ('curriculum_key', models.CharField(blank=True, max_length=255)),
+                ('search_text', models.CharField(blank=True, max_length=800)),
+                ('has_resume', models.BooleanField(default=False)),
+                ('resume_name', models.CharField(blank=True, max_length=255)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('convention', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resume_pool', to='convention.convention')),
+                ('person', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resume_pool_entries', to='accounts.person')),
+            ],
+            options={
+                'db_table': 'resume_pool_entry',
+                'indexes': [models.Index(fields=['convention', 'visible_to_recruiters', 'last_name', 'first_name'], name='resume_pool_name_idx'), models.Index(fields=['convention', 'visible_to_recruiters', 'school_name', 'last_name'], name='resume_pool_school_idx'), models.Index(fields=['convention', 'visible_to_recruiters', 'email'], name='resume_pool_email_idx')],
+            },
+        ),
+    ]
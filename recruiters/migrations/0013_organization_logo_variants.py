@@ -0,0 +1,23 @@
+# Generated by Django 5.0 on 2026-10-19 16:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruiters', '0012_resume_pool_entry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='organization',
+            name='logo_sign',
+            field=models.ImageField(blank=True, null=True, upload_to='org_logos/'),
+        ),
+        migrations.AddField(
+            model_name='organization',
+            name='logo_thumbnail',
+            field=models.ImageField(blank=True, null=True, upload_to='org_logos/'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.0 on 2026-10-19 16:59
+
+import recruiters.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruiters', '0013_organization_logo_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='invoice',
+            name='pdf',
+            field=models.FileField(blank=True, upload_to=recruiters.models.invoice_pdf_upload_path),
+        ),
+        migrations.AddField(
+            model_name='invoice',
+            name='pdf_version',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.0 on 2026-10-19 17:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('convention', '0019_convention_resume_set_version'),
+        ('recruiters', '0014_invoice_pdf'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeOptimization',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('optimized', 'Optimized'), ('kept', 'Original kept'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('source_name', models.CharField(blank=True, max_length=255)),
+                ('method', models.CharField(blank=True, max_length=20)),
+                ('original_size', models.BigIntegerField(blank=True, null=True)),
+                ('optimized_size', models.BigIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('registration', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='resume_optimization', to='convention.conventionregistration')),
+            ],
+            options={
+                'db_table': 'resume_optimization',
+                'indexes': [models.Index(fields=['status'], name='resume_opti_status_5f8877_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.0 on 2026-10-19 17:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_pool_curricula(apps, schema_editor):
+    ResumeCurriculum = apps.get_model('accounts', 'ResumeCurriculum')
+    ResumePoolEntry = apps.get_model('recruiters', 'ResumePoolEntry')
+    ResumePoolCurriculum = apps.get_model('recruiters', 'ResumePoolCurriculum')
+    curricula = set(ResumeCurriculum.objects.values_list('pk', flat=True))
+    entries = ResumePoolEntry.objects.exclude(curriculum_key='').values_list('pk', 'curriculum_key')
+    ResumePoolCurriculum.objects.bulk_create([
+        ResumePoolCurriculum(entry_id=pk, curriculum_id=int(part))
+        for pk, key in entries.iterator(chunk_size=1000)
+        for part in key.split(',')
+        if part and int(part) in curricula
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0014_delete_staff'),
+        ('recruiters', '0015_resume_optimization'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumePoolCurriculum',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('curriculum', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resume_pool_rows', to='accounts.resumecurriculum')),
+                ('entry', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='curricula', to='recruiters.resumepoolentry')),
+            ],
+            options={
+                'db_table': 'resume_pool_curriculum',
+                'indexes': [models.Index(fields=['curriculum', 'entry'], name='resume_pool_curriculum_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='resumepoolcurriculum',
+            constraint=models.UniqueConstraint(fields=('entry', 'curriculum'), name='unique_resume_pool_curriculum'),
+        ),
+        migrations.RunPython(build_pool_curricula, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,4 @@
+import os
 from decimal import Decimal
 
 from django.db import models, transaction
@@ -69,7 +70,10 @@ class Organization(models.Model):
     billing_email = models.EmailField()
     billing_contact_first_name = models.CharField(max_length=100)
     billing_contact_last_name = models.CharField(max_length=100)
+    # Processed by recruiters/logos.py; all three are content-hash named
     logo = models.ImageField(upload_to='org_logos/', blank=True, null=True)
+    logo_thumbnail = models.ImageField(upload_to='org_logos/', blank=True, null=True)
+    logo_sign = models.ImageField(upload_to='org_logos/', blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -187,6 +191,295 @@ class RecruiterAttendee(models.Model):
         return f'{self.first_name} {self.last_name} ({self.email})'
 
 
+def resume_bundle_upload_path(instance, filename):
+    # Under resumes/ so nginx's direct-access deny rule covers bundles too
+    return f'resumes/bundles/{instance.convention.year}/{filename}'
+
+
+class ResumeBundle(models.Model):
+    """
+    Prebuilt zip of resumes for one (convention, visibility tier, filters,
+    resume-set version). Built by `python manage.py build_resume_bundles` and
+    served through X-Accel-Redirect. Any change to the resume set bumps
+    Convention.resume_set_version, so older bundles are never served again;
+    the same command prunes them.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('building', 'Building'),
+        ('ready', 'Ready'),
+        ('failed', 'Failed'),
+    ]
+
+    convention = models.ForeignKey(
+        Convention,
+        on_delete=models.CASCADE,
+        related_name='resume_bundles'
+    )
+    visibility_tier = models.CharField(max_length=20)
+    filters = models.JSONField(default=dict, blank=True)
+    filter_hash = models.CharField(max_length=64)
+    resume_set_version = models.PositiveIntegerField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    file = models.FileField(upload_to=resume_bundle_upload_path, blank=True)
+    resume_count = models.IntegerField(default=0)
+    file_size = models.BigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    built_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'resume_bundle'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['convention', 'visibility_tier', 'filter_hash', 'resume_set_version'],
+                name='unique_resume_bundle_key'
+            )
+        ]
+        indexes = [
+            models.Index(fields=['status']),
+        ]
+
+    def __str__(self):
+        return f"Resume bundle {self.visibility_tier}/{self.filter_hash[:8]} v{self.resume_set_version} ({self.status})"
+
+
+class ResumeText(models.Model):
+    """
+    Plain text extracted from a registration's resume when it is uploaded.
+    Kept so the keyword index can be rebuilt without reopening PDFs.
+    """
+    registration = models.OneToOneField(
+        'convention.ConventionRegistration',
+        on_delete=models.CASCADE,
+        related_name='resume_text'
+    )
+    text = models.TextField(blank=True)
+    term_count = models.IntegerField(default=0)
+    extracted_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'resume_text'
+
+    def __str__(self):
+        return f"Resume text for {self.registration}"
+
+
+def resume_preview_upload_path(instance, filename):
+    # Stored next to the resume so nginx's deny rule for resumes/ covers previews too
+    base = os.path.splitext(instance.registration.resume.name)[0]
+    return f'{base}_{filename}'
+
+
+class ResumePreview(models.Model):
+    """
+    First-page preview image and thumbnail for a registration's resume.
+    Queued on upload and rendered by `python manage.py generate_resume_previews`.
+    source_name records which resume file the images were rendered from, so a
+    preview for a replaced resume is never served.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('ready', 'Ready'),
+        ('failed', 'Failed'),
+    ]
+
+    registration = models.OneToOneField(
+        'convention.ConventionRegistration',
+        on_delete=models.CASCADE,
+        related_name='resume_preview'
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    source_name = models.CharField(max_length=255, blank=True)
+    preview = models.ImageField(upload_to=resume_preview_upload_path, blank=True)
+    thumbnail = models.ImageField(upload_to=resume_preview_upload_path, blank=True)
+    renderer = models.CharField(max_length=20, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'resume_preview'
+        indexes = [
+            models.Index(fields=['status']),
+        ]
+
+    def __str__(self):
+        return f"Resume preview for {self.registration} ({self.status})"
+
+    @property
+    def is_current(self):
+        return self.status == 'ready' and self.source_name == self.registration.resume.name
+
+
+class ResumeOptimization(models.Model):
+    """
+    Post-upload rewrite of a registration's resume PDF to a smaller file.
+    Queued on upload and processed by `python manage.py optimize_resumes`.
+    source_name is the resume file this record describes: the optimized file
+    when one replaced the upload, otherwise the upload that was kept.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('optimized', 'Optimized'),
+        ('kept', 'Original kept'),
+        ('failed', 'Failed'),
+    ]
+
+    registration = models.OneToOneField(
+        'convention.ConventionRegistration',
+        on_delete=models.CASCADE,
+        related_name='resume_optimization'
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    source_name = models.CharField(max_length=255, blank=True)
+    method = models.CharField(max_length=20, blank=True)
+    original_size = models.BigIntegerField(null=True, blank=True)
+    optimized_size = models.BigIntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'resume_optimization'
+        indexes = [
+            models.Index(fields=['status']),
+        ]
+
+    def __str__(self):
+        return f"Resume optimization for {self.registration} ({self.status})"
+
+    @property
+    def bytes_saved(self):
+        if self.status != 'optimized':
+            return 0
+        return self.original_size - self.optimized_size
+
+
+class ResumeTerm(models.Model):
+    """
+    Inverted index for resume keyword search: one row per distinct term per resume.
+    weight is the log-scaled term frequency; query-time ranking multiplies it by
+    the term's inverse document frequency.
+    """
+    registration = models.ForeignKey(
+        'convention.ConventionRegistration',
+        on_delete=models.CASCADE,
+        related_name='resume_terms'
+    )
+    term = models.CharField(max_length=64)
+    weight = models.FloatField()
+
+    class Meta:
+        db_table = 'resume_term'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['registration', 'term'],
+                name='unique_resume_term'
+            )
+        ]
+        indexes = [
+            models.Index(fields=['term', 'registration']),
+        ]
+
+    def __str__(self):
+        return f"{self.term} ({self.registration_id})"
+
+
+class ResumePoolEntry(models.Model):
+    """
+    Read model for the recruiter resume list: one row per attending registration
+    that is visible to recruiters, with the person, member, user and curriculum
+    fields the list filters and sorts on copied in. Kept current by signals in
+    recruiters/signals.py; `python manage.py rebuild_resume_pool` repairs drift.
+    The primary key is the registration id, so ResumeTerm lookups apply directly.
+    """
+    registration = models.OneToOneField(
+        'convention.ConventionRegistration',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='pool_entry'
+    )
+    convention = models.ForeignKey(
+        Convention,
+        on_delete=models.CASCADE,
+        related_name='resume_pool'
+    )
+    person = models.ForeignKey(
+        'accounts.Person',
+        on_delete=models.CASCADE,
+        related_name='resume_pool_entries'
+    )
+    visible_to_recruiters = models.CharField(max_length=20)
+    first_name = models.CharField(max_length=100)
+    preferred_first_name = models.CharField(max_length=100, blank=True)
+    last_name = models.CharField(max_length=100)
+    email = models.CharField(max_length=254, blank=True)
+    chapter_code = models.CharField(max_length=100, blank=True)
+    school_name = models.CharField(max_length=255, blank=True)
+    # Sorted curriculum ids wrapped in commas (",3,7,"), for display and facet
+    # grouping; filtering goes through ResumePoolCurriculum
+    curriculum_key = models.CharField(max_length=255, blank=True)
+    # Lowercased names and school, newline-separated so matches stay within a field
+    search_text = models.CharField(max_length=800, blank=True)
+    has_resume = models.BooleanField(default=False)
+    resume_name = models.CharField(max_length=255, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'resume_pool_entry'
+        indexes = [
+            models.Index(
+                fields=['convention', 'visible_to_recruiters', 'last_name', 'first_name'],
+                name='resume_pool_name_idx'
+            ),
+            models.Index(
+                fields=['convention', 'visible_to_recruiters', 'school_name', 'last_name'],
+                name='resume_pool_school_idx'
+            ),
+            models.Index(
+                fields=['convention', 'visible_to_recruiters', 'email'],
+                name='resume_pool_email_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f"Resume pool entry for {self.first_name} {self.last_name}"
+
+
+class ResumePoolCurriculum(models.Model):
+    """
+    One row per curriculum of a ResumePoolEntry, so the curriculum filter is an
+    indexed equality lookup. Written alongside the entry by recruiters/resume_pool.py.
+    """
+    entry = models.ForeignKey(
+        ResumePoolEntry,
+        on_delete=models.CASCADE,
+        related_name='curricula'
+    )
+    curriculum = models.ForeignKey(
+        'accounts.ResumeCurriculum',
+        on_delete=models.CASCADE,
+        related_name='resume_pool_rows'
+    )
+
+    class Meta:
+        db_table = 'resume_pool_curriculum'
+        constraints = [
+            models.UniqueConstraint(fields=['entry', 'curriculum'], name='unique_resume_pool_curriculum'),
+        ]
+        indexes = [
+            models.Index(fields=['curriculum', 'entry'], name='resume_pool_curriculum_idx'),
+        ]
+
+    def __str__(self):
+        return f"Curriculum {self.curriculum_id} for resume pool entry {self.entry_id}"
+
+
+def invoice_pdf_upload_path(instance, filename):
+    return f'invoices/{instance.convention.year}/{filename}'
+
+
 class Invoice(models.Model):
     STATUS_CHOICES = [
         ('draft', 'Draft'),
@@ -217,6 +510,9 @@ class Invoice(models.Model):
     paid_date = models.DateField(null=True, blank=True)
     payment_link = models.URLField(blank=True, default='')
     notes = models.TextField(blank=True)
+    # Rendered by recruiters/invoice_pdfs.py; pdf_version records the data it was rendered from
+    pdf = models.FileField(upload_to=invoice_pdf_upload_path, blank=True)
+    pdf_version = models.CharField(max_length=64, blank=True)
     created_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.SET_NULL,
@@ -0,0 +1,95 @@
+"""
+Filter-panel facets for the recruiter resume list.
+
+Each facet counts the pool under every active filter except its own, so the
+panel can show "School X (42)" for the choices that would still return results.
+Results without a free-text search are cached per (convention, visibility tier,
+filters) under the convention's pool version (recruiters/resumes.py), which
+moves after any committed change to what the facets count; a new version
+simply misses the old keys.
+"""
+from collections import Counter
+
+from django.core.cache import cache
+from django.db.models import Count
+
+from accounts.models import ResumeCurriculum
+from .models import ResumePoolEntry
+from .resume_pool import normalize_search, parse_curriculum_key
+from .resumes import RESUME_VISIBILITY_TIERS, bundle_filter_hash, get_resume_pool_version
+
+RESUME_FACETS_TIMEOUT = 60 * 60  # safety net; the version in the key handles invalidation
+
+
+def resume_facets_cache_key(convention_id, version, tier, filters):
+    return (
+        f'recruiters:{convention_id}:resume_facets:{tier}:'
+        f'v{version}:{bundle_filter_hash(filters)[:16]}'
+    )
+
+
+def _filtered_pool(convention_id, tier, search='', school='', curriculum_id=None):
+    pool = ResumePoolEntry.objects.filter(
+        convention_id=convention_id,
+        visible_to_recruiters__in=RESUME_VISIBILITY_TIERS[tier],
+    )
+    if search:
+        pool = pool.filter(search_text__contains=normalize_search(search))
+    if school:
+        pool = pool.filter(school_name=school)
+    if curriculum_id is not None:
+        pool = pool.filter(curricula__curriculum_id=curriculum_id)
+    return pool
+
+
+def build_resume_facets(convention_id, tier, search='', school='', curriculum_id=None):
+    school_rows = (
+        _filtered_pool(convention_id, tier, search=search, curriculum_id=curriculum_id)
+        .exclude(school_name='')
+        .values('school_name')
+        .annotate(count=Count('pk'))
+        .order_by('school_name')
+    )
+    schools = [{'name': row['school_name'], 'count': row['count']} for row in school_rows]
+
+    # The database groups identical curriculum sets; only those are expanded here
+    curriculum_counts = Counter()
+    key_rows = (
+        _filtered_pool(convention_id, tier, search=search, school=school)
+        .exclude(curriculum_key='')
+        .values('curriculum_key')
+        .annotate(count=Count('pk'))
+        .order_by()
+    )
+    for row in key_rows:
+        for curriculum in parse_curriculum_key(row['curriculum_key']):
+            curriculum_counts[curriculum] += row['count']
+    curricula = [
+        {**row, 'count': curriculum_counts[row['id']]}
+        for row in ResumeCurriculum.objects
+        .filter(id__in=curriculum_counts)
+        .values('id', 'full_name', 'abbreviated')
+        .order_by('full_name')
+    ]
+
+    return {'schools': schools, 'curricula': curricula}
+
+
+def get_resume_facets(convention_id, tier, search='', school='', curriculum_id=None):
+    """
+    Return facets for the pool under these filters. Free-text searches are
+    computed directly on the pool table; caching every typed prefix would only
+    churn the cache.
+    """
+    if search:
+        return build_resume_facets(convention_id, tier, search, school, curriculum_id)
+
+    key = resume_facets_cache_key(
+        convention_id, get_resume_pool_version(convention_id), tier,
+        {'school': school, 'curriculum': curriculum_id},
+    )
+    facets = cache.get(key)
+    if facets is None:
+        facets = build_resume_facets(convention_id, tier, school=school, curriculum_id=curriculum_id)
+        cache.set(key, facets, RESUME_FACETS_TIMEOUT)
+    return facets
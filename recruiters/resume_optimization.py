@@ -0,0 +1,218 @@
+"""
+Post-upload compression of resume PDFs.
+
+member_resume queues a ResumeOptimization when a resume is uploaded (unless
+settings.RESUME_PDF_OPTIMIZATION is off); the optimize_resumes command (run
+from cron) rewrites the PDF and swaps the smaller file in. The upload is kept
+whenever the rewrite isn't smaller or doesn't read back with the same pages.
+
+Ghostscript's pdfwrite is used when `gs` is installed: it recompresses and
+downsamples the embedded scans that make up most oversized resumes. Without
+it, PyPDF2 merges identical image streams and compresses page content.
+"""
+
+import hashlib
+import io
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+from datetime import timedelta
+
+from PyPDF2 import PdfReader, PdfWriter
+from PyPDF2.generic import NameObject, StreamObject
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from convention.models import ConventionRegistration
+from .models import ResumeOptimization, ResumePreview
+
+logger = logging.getLogger(__name__)
+
+GHOSTSCRIPT_PDF_SETTINGS = '/printer'   # 300 dpi images; keeps printed resumes sharp
+GHOSTSCRIPT_TIMEOUT = 60                # seconds allowed per resume
+
+# An optimization left in 'processing' this long is assumed abandoned by a crashed run
+STALE_PROCESSING_AGE = timedelta(minutes=15)
+
+
+def queue_resume_optimization(registration):
+    if not settings.RESUME_PDF_OPTIMIZATION:
+        return
+    ResumeOptimization.objects.update_or_create(
+        registration=registration,
+        defaults={'status': 'pending', 'source_name': registration.resume.name},
+    )
+
+
+def clear_resume_optimization(registration):
+    ResumeOptimization.objects.filter(registration=registration).delete()
+
+
+def _optimize_with_ghostscript(data):
+    binary = shutil.which('gs')
+    if not binary:
+        return None
+    with tempfile.TemporaryDirectory() as tmpdir:
+        src, dst = os.path.join(tmpdir, 'in.pdf'), os.path.join(tmpdir, 'out.pdf')
+        with open(src, 'wb') as f:
+            f.write(data)
+        subprocess.run(
+            [binary, '-q', '-dNOPAUSE', '-dBATCH', '-dSAFER', '-sDEVICE=pdfwrite',
+             '-dCompatibilityLevel=1.5', f'-dPDFSETTINGS={GHOSTSCRIPT_PDF_SETTINGS}',
+             '-dDetectDuplicateImages=true', '-dCompressFonts=true', f'-sOutputFile={dst}', src],
+            check=True, capture_output=True, timeout=GHOSTSCRIPT_TIMEOUT,
+        )
+        with open(dst, 'rb') as f:
+            return f.read()
+
+
+def _stream_key(stream):
+    # Raw (still encoded) bytes plus the stream dictionary, minus its length
+    entries = sorted((key, repr(value)) for key, value in stream.items() if key != '/Length')
+    return hashlib.sha256(repr(entries).encode() + stream._data).digest()
+
+
+def _dedupe_xobjects(writer):
+    """Point every page at a single copy of each identical image or form XObject."""
+    seen = {}
+    for page in writer.pages:
+        resources = page.get('/Resources')
+        xobjects = resources.get_object().get('/XObject') if resources else None
+        if not xobjects:
+            continue
+        xobjects = xobjects.get_object()
+        for name, ref in list(xobjects.items()):
+            stream = ref.get_object()
+            if not isinstance(stream, StreamObject):
+                continue
+            first = seen.setdefault(_stream_key(stream), ref)
+            if first is not ref:
+                xobjects[NameObject(name)] = first
+
+
+def _write(writer):
+    buf = io.BytesIO()
+    writer.write(buf)
+    return buf.getvalue()
+
+
+def _optimize_with_pypdf(data):
+    reader = PdfReader(io.BytesIO(data))
+    if reader.is_encrypted:
+        return None
+    writer = PdfWriter()
+    for page in reader.pages:
+        writer.add_page(page)
+    _dedupe_xobjects(writer)
+    for page in writer.pages:
+        page.compress_content_streams()
+    # Copy once more so the duplicates orphaned above are left behind
+    final = PdfWriter()
+    for page in PdfReader(io.BytesIO(_write(writer))).pages:
+        final.add_page(page)
+    return _write(final)
+
+
+def _page_count(data):
+    return len(PdfReader(io.BytesIO(data)).pages)
+
+
+def optimize_pdf(data):
+    """
+    Return (smallest valid rewrite of `data`, method), or (None, None) when no
+    rewrite beats the original.
+    """
+    expected_pages = _page_count(data)
+    best, method = None, None
+    for name, optimizer in (('ghostscript', _optimize_with_ghostscript), ('pypdf', _optimize_with_pypdf)):
+        try:
+            candidate = optimizer(data)
+            if candidate is None or _page_count(candidate) != expected_pages:
+                continue
+        except Exception:
+            logger.warning('%s could not rewrite PDF', name, exc_info=True)
+            continue
+        if len(candidate) < len(best or data):
+            best, method = candidate, name
+    return best, method
+
+
+def claimable_optimizations():
+    """Optimizations waiting to run, including ones abandoned mid-run."""
+    return ResumeOptimization.objects.filter(
+        Q(status='pending') |
+        Q(status='processing', updated_at__lt=timezone.now() - STALE_PROCESSING_AGE)
+    ).select_related('registration')
+
+
+def _finish(optimization, **fields):
+    # No-op if a new upload re-queued the row while this run held it
+    fields['updated_at'] = timezone.now()
+    ResumeOptimization.objects.filter(pk=optimization.pk, status='processing').update(**fields)
+
+
+def optimize_resume(optimization):
+    """
+    Rewrite one queued resume. Returns True if a smaller file replaced it,
+    False if the original was kept, another worker claimed it, or the resume
+    changed or went away meanwhile.
+    """
+    claimed = ResumeOptimization.objects.filter(
+        pk=optimization.pk, status=optimization.status, updated_at=optimization.updated_at
+    ).update(status='processing', updated_at=timezone.now())
+    if not claimed:
+        return False
+
+    registration = optimization.registration
+    original_name = registration.resume.name if registration.resume else ''
+    if not original_name or original_name != optimization.source_name:
+        # Removed or replaced since it was queued; a fresh upload queues itself
+        _finish(optimization, status='kept', source_name=original_name)
+        return False
+
+    try:
+        with registration.resume.open('rb') as f:
+            data = f.read()
+        optimized, method = optimize_pdf(data)
+    except Exception:
+        logger.exception('Failed to optimize resume %s', original_name)
+        _finish(optimization, status='failed')
+        return False
+
+    if optimized is None:
+        _finish(optimization, status='kept', original_size=len(data), optimized_size=len(data), method='')
+        return False
+
+    new_name = registration.resume.storage.save(
+        registration.resume.field.generate_filename(registration, os.path.basename(original_name)),
+        ContentFile(optimized),
+    )
+    with transaction.atomic():
+        current = ConventionRegistration.objects.select_for_update().filter(pk=registration.pk).first()
+        swapped = current is not None and current.resume.name == original_name
+        if swapped:
+            current.resume.name = new_name
+            # Through save() so the resume pool and bundle versions follow the new file
+            current.save(update_fields=['resume'])
+            # Same pages, so an existing preview still applies to the new file
+            ResumePreview.objects.filter(registration=current, source_name=original_name).update(
+                source_name=new_name, updated_at=timezone.now()
+            )
+
+    if not swapped:
+        registration.resume.storage.delete(new_name)
+        _finish(optimization, status='kept', source_name=(current.resume.name or '') if current else '')
+        return False
+
+    registration.resume.storage.delete(original_name)
+    _finish(
+        optimization, status='optimized', source_name=new_name, method=method,
+        original_size=len(data), optimized_size=len(optimized),
+    )
+    logger.info('Optimized resume %s with %s: %d -> %d bytes', new_name, method, len(data), len(optimized))
+    return True
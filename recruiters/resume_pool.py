@@ -0,0 +1,218 @@
+"""
+Maintenance of the ResumePoolEntry read model behind the recruiter resume list.
+
+Signals call sync_pool_entries whenever a registration, its curricula, or the
+person, member or user it points at changes. rebuild_resume_pool recomputes a
+whole convention in bulk for backfills and drift repair. Both also keep each
+entry's ResumePoolCurriculum rows, which the curriculum filter joins on, in
+line with its curriculum_key.
+
+sync_pool_entries reports which conventions' cached facets and which
+conventions' bundles a change affects, so an entry without a resume never
+invalidates bundles and a name edit never invalidates facets.
+"""
+
+from django.db.models import Q
+from django.utils import timezone
+
+from convention.models import ConventionRegistration
+from .models import ResumePoolCurriculum, ResumePoolEntry
+from .resumes import ATTENDING_STATUSES, invalidate_resume_pool
+
+# ConventionRegistration fields copied into or deciding membership of the pool
+POOL_REGISTRATION_FIELDS = frozenset({'resume', 'visible_to_recruiters', 'status_code', 'person', 'convention'})
+
+POOL_ENTRY_FIELDS = (
+    'convention_id', 'person_id', 'visible_to_recruiters', 'first_name', 'preferred_first_name',
+    'last_name', 'email', 'chapter_code', 'school_name', 'curriculum_key', 'search_text',
+    'has_resume', 'resume_name',
+)
+
+# Entry fields the cached (search-free) facets count on
+FACET_FIELDS = ('convention_id', 'visible_to_recruiters', 'school_name', 'curriculum_key')
+
+# Entry fields that decide a bundle's contents and file names, for entries with a resume
+BUNDLE_FIELDS = (
+    'convention_id', 'visible_to_recruiters', 'first_name', 'preferred_first_name', 'last_name',
+    'school_name', 'curriculum_key', 'resume_name',
+)
+
+
+def normalize_search(text):
+    return ' '.join(text.lower().split())
+
+
+def curriculum_key(curriculum_ids):
+    ids = sorted(set(curriculum_ids))
+    return f",{','.join(map(str, ids))}," if ids else ''
+
+
+def parse_curriculum_key(key):
+    return [int(part) for part in key.split(',') if part]
+
+
+def _pool_registrations():
+    return ConventionRegistration.objects.filter(
+        status_code__in=ATTENDING_STATUSES,
+    ).exclude(visible_to_recruiters='none').select_related(
+        'person', 'person__member', 'person__user'
+    ).prefetch_related('resume_curricula')
+
+
+def pool_entry_values(registration):
+    """Field values of the ResumePoolEntry for an eligible registration."""
+    person = registration.person
+    member = getattr(person, 'member', None)
+    user = getattr(person, 'user', None)
+    school_name = member.school_name if member else ''
+    return {
+        'convention_id': registration.convention_id,
+        'person_id': person.pk,
+        'visible_to_recruiters': registration.visible_to_recruiters,
+        'first_name': person.first_name,
+        'preferred_first_name': person.preferred_first_name,
+        'last_name': person.last_name,
+        'email': user.email if user else '',
+        'chapter_code': member.chapter_code if member else '',
+        'school_name': school_name,
+        'curriculum_key': curriculum_key(c.pk for c in registration.resume_curricula.all()),
+        'search_text': '\n'.join(
+            normalize_search(value)
+            for value in (person.first_name, person.last_name, person.preferred_first_name, school_name)
+        ),
+        'has_resume': bool(registration.resume),
+        'resume_name': registration.resume.name if registration.resume else '',
+    }
+
+
+def _entry_differs(entry, values):
+    return any(getattr(entry, field) != value for field, value in values.items())
+
+
+def _entry_values(entry):
+    return {field: getattr(entry, field) for field in POOL_ENTRY_FIELDS}
+
+
+def _facet_state(values):
+    return tuple(values[field] for field in FACET_FIELDS) if values else None
+
+
+def _bundle_state(values):
+    return tuple(values[field] for field in BUNDLE_FIELDS) if values and values['has_resume'] else None
+
+
+def _note_change(before, after, pools, bundles):
+    """
+    Add to `pools` and `bundles` the conventions whose facets or bundles differ
+    between two entry states (value dicts, or None for no entry).
+    """
+    for state, changed in ((_facet_state, pools), (_bundle_state, bundles)):
+        old, new = state(before), state(after)
+        if old != new:
+            if old is not None:
+                changed.add(before['convention_id'])
+            if new is not None:
+                changed.add(after['convention_id'])
+
+
+def _sync_curricula(existing_rows, keys):
+    """
+    Make the ResumePoolCurriculum rows match `keys` ({entry id: curriculum_key}).
+    `existing_rows` is the queryset of rows currently held by those entries.
+    """
+    wanted = {(pk, curriculum) for pk, key in keys.items() for curriculum in parse_curriculum_key(key)}
+    existing = {
+        (row['entry_id'], row['curriculum_id']): row['pk']
+        for row in existing_rows.values('pk', 'entry_id', 'curriculum_id')
+    }
+    stale = [row_pk for pair, row_pk in existing.items() if pair not in wanted]
+    if stale:
+        ResumePoolCurriculum.objects.filter(pk__in=stale).delete()
+    ResumePoolCurriculum.objects.bulk_create(
+        [ResumePoolCurriculum(entry_id=pk, curriculum_id=curriculum) for pk, curriculum in wanted - set(existing)],
+        batch_size=500,
+    )
+
+
+def sync_pool_entries(registration_ids):
+    """
+    Bring the pool rows for these registrations in line with their source data,
+    writing only rows that differ. Returns (ids of conventions whose facets
+    changed, ids of conventions whose set of visible resumes changed), ready
+    for invalidate_resume_pool.
+    """
+    pools, bundles = set(), set()
+    registration_ids = set(registration_ids)
+    if not registration_ids:
+        return pools, bundles
+    existing = {entry.pk: entry for entry in ResumePoolEntry.objects.filter(pk__in=registration_ids)}
+    eligible = list(_pool_registrations().filter(pk__in=registration_ids))
+    keys = {}
+    for registration in eligible:
+        values = pool_entry_values(registration)
+        entry = existing.get(registration.pk)
+        if entry is None:
+            ResumePoolEntry.objects.create(registration_id=registration.pk, **values)
+            before = None
+        elif _entry_differs(entry, values):
+            ResumePoolEntry.objects.filter(pk=entry.pk).update(updated_at=timezone.now(), **values)
+            before = _entry_values(entry)
+        else:
+            continue
+        _note_change(before, values, pools, bundles)
+        if (before['curriculum_key'] if before else '') != values['curriculum_key']:
+            keys[registration.pk] = values['curriculum_key']
+    if keys:
+        _sync_curricula(ResumePoolCurriculum.objects.filter(entry_id__in=keys), keys)
+    gone = set(existing) - {r.pk for r in eligible}
+    if gone:
+        for pk in gone:
+            _note_change(_entry_values(existing[pk]), None, pools, bundles)
+        ResumePoolEntry.objects.filter(pk__in=gone).delete()
+    return pools, bundles
+
+
+def sync_person_pool_entries(person_id):
+    return sync_pool_entries(
+        ConventionRegistration.objects.filter(person_id=person_id).values_list('pk', flat=True)
+    )
+
+
+def rebuild_resume_pool(convention):
+    """
+    Recompute every pool row for a convention, writing only rows that differ.
+    Returns (created, updated, deleted).
+    """
+    # Includes entries still filed under another convention the registration moved from
+    existing = {
+        entry.pk: entry for entry in ResumePoolEntry.objects.filter(
+            Q(convention=convention) | Q(registration__convention=convention)
+        )
+    }
+    to_create, to_update = [], []
+    pools, bundles = set(), set()
+    keys = {}
+    for registration in _pool_registrations().filter(convention=convention).iterator(chunk_size=500):
+        values = pool_entry_values(registration)
+        keys[registration.pk] = values['curriculum_key']
+        entry = existing.get(registration.pk)
+        if entry is None:
+            to_create.append(ResumePoolEntry(registration_id=registration.pk, **values))
+            _note_change(None, values, pools, bundles)
+        elif _entry_differs(entry, values):
+            _note_change(_entry_values(entry), values, pools, bundles)
+            for field, value in values.items():
+                setattr(entry, field, value)
+            entry.updated_at = timezone.now()
+            to_update.append(entry)
+
+    ResumePoolEntry.objects.bulk_create(to_create, batch_size=500)
+    ResumePoolEntry.objects.bulk_update(to_update, (*POOL_ENTRY_FIELDS, 'updated_at'), batch_size=500)
+    stale = set(existing) - set(keys)
+    if stale:
+        for pk in stale:
+            _note_change(_entry_values(existing[pk]), None, pools, bundles)
+        ResumePoolEntry.objects.filter(pk__in=stale).delete()
+    _sync_curricula(ResumePoolCurriculum.objects.filter(entry__convention=convention), keys)
+    invalidate_resume_pool(pools, bundles)
+    return len(to_create), len(to_update), len(stale)
@@ -0,0 +1,188 @@
+"""
+Resume preview and thumbnail generation.
+
+member_resume queues a ResumePreview when a resume is uploaded; the
+generate_resume_previews command (run from cron) renders the first page to a
+JPEG preview and a small thumbnail stored next to the resume. Recruiters browse
+these instead of downloading full PDFs.
+
+Pages are rasterised with poppler's pdftoppm when it is installed on the host.
+Without it, the preview is drawn from the text extracted at upload time, which
+is enough to skim a candidate.
+"""
+
+import io
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import textwrap
+from datetime import timedelta
+
+from PIL import Image, ImageDraw, ImageFont
+from django.core.files.base import ContentFile
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import ResumePreview, ResumeText
+from .resume_search import extract_resume_text
+
+logger = logging.getLogger(__name__)
+
+PREVIEW_WIDTH = 850           # ~100 dpi letter page
+THUMBNAIL_WIDTH = 200
+JPEG_QUALITY = 80
+RENDER_DPI = 100
+RENDER_TIMEOUT = 30           # seconds allowed for pdftoppm per resume
+
+# A preview left in 'processing' this long is assumed abandoned by a crashed run
+STALE_PROCESSING_AGE = timedelta(minutes=15)
+
+
+def queue_resume_preview(registration):
+    """Mark the registration's preview for (re)generation from its current resume."""
+    ResumePreview.objects.update_or_create(
+        registration=registration,
+        defaults={'status': 'pending', 'source_name': registration.resume.name},
+    )
+
+
+def clear_resume_preview(registration):
+    for preview in ResumePreview.objects.filter(registration=registration):
+        _delete_images(preview)
+        preview.delete()
+
+
+def _delete_images(preview):
+    for field in (preview.preview, preview.thumbnail):
+        if field:
+            field.delete(save=False)
+
+
+def _render_with_pdftoppm(file_field):
+    binary = shutil.which('pdftoppm')
+    if not binary:
+        return None
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pdf_path = os.path.join(tmpdir, 'resume.pdf')
+        with file_field.open('rb') as src, open(pdf_path, 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        out_root = os.path.join(tmpdir, 'page')
+        subprocess.run(
+            [binary, '-f', '1', '-l', '1', '-r', str(RENDER_DPI), '-png', '-singlefile', pdf_path, out_root],
+            check=True, capture_output=True, timeout=RENDER_TIMEOUT,
+        )
+        with Image.open(f'{out_root}.png') as page:
+            page.load()
+            return page.convert('RGB')
+
+
+def _load_font(size):
+    try:
+        return ImageFont.load_default(size=size)
+    except (TypeError, ImportError, OSError):
+        # Pillow built without FreeType only has the fixed bitmap font
+        return ImageFont.load_default()
+
+
+def _render_text_page(registration):
+    """Draw the resume's extracted text onto a letter-proportioned page."""
+    text_row = ResumeText.objects.filter(registration=registration).only('text').first()
+    text = text_row.text if text_row else extract_resume_text(registration.resume)
+
+    width, height, margin, font_size = PREVIEW_WIDTH, int(PREVIEW_WIDTH * 11 / 8.5), 50, 14
+    page = Image.new('RGB', (width, height), 'white')
+    draw = ImageDraw.Draw(page)
+    font = _load_font(font_size)
+    line_height = font_size + 4
+    max_lines = (height - 2 * margin) // line_height
+
+    lines = []
+    for paragraph in (text or 'No text could be extracted from this resume.').splitlines():
+        lines.extend(textwrap.wrap(paragraph, width=95) or [''])
+        if len(lines) >= max_lines:
+            break
+    for i, line in enumerate(lines[:max_lines]):
+        draw.text((margin, margin + i * line_height), line, fill='black', font=font)
+    return page
+
+
+def _jpeg(image, width):
+    resized = image.copy()
+    resized.thumbnail((width, width * 2), Image.LANCZOS)
+    buf = io.BytesIO()
+    resized.save(buf, format='JPEG', quality=JPEG_QUALITY, optimize=True)
+    return ContentFile(buf.getvalue())
+
+
+def claimable_previews():
+    """Previews waiting to be rendered, including ones abandoned mid-render."""
+    return ResumePreview.objects.filter(
+        Q(status='pending') |
+        Q(status='processing', updated_at__lt=timezone.now() - STALE_PROCESSING_AGE)
+    ).select_related('registration')
+
+
+def _finish(resume_preview, **fields):
+    """Record the outcome. No-op if the row was re-queued or deleted while this run held it."""
+    fields['updated_at'] = timezone.now()
+    return ResumePreview.objects.filter(pk=resume_preview.pk, status='processing').update(**fields)
+
+
+def _delete_new_images(preview, old_images):
+    for field in (preview.preview, preview.thumbnail):
+        if field and field.name not in old_images:
+            field.storage.delete(field.name)
+
+
+def generate_resume_preview(preview):
+    """
+    Render one queued preview. Returns False if another worker claimed it, the
+    resume is gone, or a new upload re-queued it while rendering.
+    """
+    claimed = ResumePreview.objects.filter(
+        pk=preview.pk, status=preview.status, updated_at=preview.updated_at
+    ).update(status='processing', updated_at=timezone.now())
+    if not claimed:
+        return False
+
+    registration = preview.registration
+    if not registration.resume:
+        clear_resume_preview(registration)
+        return False
+
+    try:
+        page = _render_with_pdftoppm(registration.resume)
+        renderer = 'pdftoppm'
+    except Exception:
+        logger.warning('pdftoppm failed for resume %s; falling back to text preview',
+                       registration.resume.name, exc_info=True)
+        page = None
+    if page is None:
+        page = _render_text_page(registration)
+        renderer = 'text'
+
+    old_images = [field.name for field in (preview.preview, preview.thumbnail) if field]
+    try:
+        preview.preview.save('preview.jpg', _jpeg(page, PREVIEW_WIDTH), save=False)
+        preview.thumbnail.save('thumb.jpg', _jpeg(page, THUMBNAIL_WIDTH), save=False)
+    except Exception:
+        logger.exception('Failed to store preview for registration %s', registration.pk)
+        _delete_new_images(preview, old_images)
+        _finish(preview, status='failed')
+        return False
+
+    finished = _finish(
+        preview, status='ready', source_name=registration.resume.name, renderer=renderer,
+        preview=preview.preview.name, thumbnail=preview.thumbnail.name,
+    )
+    if not finished:
+        # Re-queued by a new upload or removed with the resume while rendering
+        _delete_new_images(preview, old_images)
+        return False
+    storage = preview.preview.storage
+    for name in old_images:
+        if name not in (preview.preview.name, preview.thumbnail.name):
+            storage.delete(name)
+    return True
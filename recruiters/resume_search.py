@@ -0,0 +1,138 @@
+"""
+Keyword search over resume contents.
+
+Text is pulled out of the PDF once, when the member uploads it, and stored as
+ResumeText plus an inverted index of ResumeTerm rows. Recruiter searches only
+touch the index, never the PDFs. Ranking is tf-idf: each term's stored
+log-scaled frequency times its inverse document frequency within the convention.
+"""
+
+import logging
+import math
+import re
+from collections import Counter
+
+from PyPDF2 import PdfReader
+from django.db import transaction
+from django.db.models import Case, Count, FloatField, OuterRef, Subquery, Sum, Value, When, F
+
+from .models import ResumeText, ResumeTerm
+
+logger = logging.getLogger(__name__)
+
+# Extraction limits — resumes are short; anything past these is noise
+MAX_PAGES = 10
+MAX_TEXT_LENGTH = 100_000
+MAX_TERMS_PER_RESUME = 2000
+MAX_TERM_LENGTH = 64
+MAX_QUERY_TERMS = 8
+
+# Keeps "c++", "c#", "node.js", "co-op" and "3.5" as single terms
+TERM_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:[.\-][a-z0-9+#]+)*")
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it of on or that the this to was were will with
+""".split())
+
+
+def tokenize(text):
+    return [
+        term for term in TERM_RE.findall(text.lower())
+        if term not in STOPWORDS and len(term) <= MAX_TERM_LENGTH
+    ]
+
+
+def parse_query(query):
+    """Distinct query terms in order, capped at MAX_QUERY_TERMS."""
+    return list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TERMS]
+
+
+def extract_resume_text(file_field):
+    """Return the text of the first MAX_PAGES pages of a PDF, or '' if unreadable."""
+    try:
+        with file_field.open('rb') as f:
+            reader = PdfReader(f)
+            parts = []
+            length = 0
+            for page in reader.pages[:MAX_PAGES]:
+                text = page.extract_text() or ''
+                parts.append(text)
+                length += len(text)
+                if length >= MAX_TEXT_LENGTH:
+                    break
+        return '\n'.join(parts)[:MAX_TEXT_LENGTH]
+    except Exception:
+        logger.warning('Could not extract text from resume %s', getattr(file_field, 'name', ''), exc_info=True)
+        return ''
+
+
+def index_resume(registration):
+    """Extract and index the registration's current resume, replacing any previous index."""
+    if not registration.resume:
+        clear_resume_index(registration)
+        return
+    text = extract_resume_text(registration.resume)
+    counts = Counter(tokenize(text)).most_common(MAX_TERMS_PER_RESUME)
+    with transaction.atomic():
+        ResumeTerm.objects.filter(registration=registration).delete()
+        ResumeTerm.objects.bulk_create([
+            ResumeTerm(registration=registration, term=term, weight=1 + math.log(n))
+            for term, n in counts
+        ], batch_size=500)
+        ResumeText.objects.update_or_create(
+            registration=registration,
+            defaults={'text': text, 'term_count': len(counts)},
+        )
+
+
+def clear_resume_index(registration):
+    with transaction.atomic():
+        ResumeTerm.objects.filter(registration=registration).delete()
+        ResumeText.objects.filter(registration=registration).delete()
+
+
+def keyword_search(queryset, convention, terms):
+    """
+    Restrict `queryset` (ConventionRegistrations, or ResumePoolEntries, which
+    share their primary key) to resumes containing every term and annotate
+    `search_rank`. Two indexed lookups on ResumeTerm: one
+    GROUP BY for document frequencies, then a correlated SUM per matching row.
+    """
+    if not terms:
+        return queryset
+
+    convention_terms = ResumeTerm.objects.filter(registration__convention=convention)
+    doc_freq = dict(
+        convention_terms.filter(term__in=terms)
+        .values('term').annotate(n=Count('id')).order_by()
+        .values_list('term', 'n')
+    )
+    if len(doc_freq) < len(terms):
+        # Some term appears in no resume, so no resume contains all of them
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField())).none()
+
+    total_docs = ResumeText.objects.filter(registration__convention=convention).count()
+    idf = {term: math.log(1 + total_docs / n) for term, n in doc_freq.items()}
+
+    matching_ids = (
+        convention_terms.filter(term__in=terms)
+        .values('registration')
+        .annotate(matched=Count('id'))
+        .filter(matched=len(terms))
+        .values('registration')
+    )
+    rank = (
+        ResumeTerm.objects.filter(registration=OuterRef('pk'), term__in=terms)
+        .order_by()
+        .values('registration')
+        .annotate(score=Sum(
+            Case(
+                *[When(term=term, then=F('weight') * Value(idf[term])) for term in terms],
+                output_field=FloatField(),
+            )
+        ))
+        .values('score')
+    )
+    return queryset.filter(pk__in=matching_ids).annotate(
+        search_rank=Subquery(rank, output_field=FloatField())
+    )
@@ -0,0 +1,262 @@
+"""
+Resume pool queries and prebuilt bulk-download bundles.
+
+The bulk download view and the build_resume_bundles command share the same
+queryset and archive naming, so a bundle built in the background is byte-for-byte
+what the view would have streamed for the same filters.
+
+Two versions invalidate cached resume artifacts: Convention.resume_set_version
+keys the bundles and only moves when the set of visible resumes changes, while
+a cache-held pool version keys the filter facets and moves on any change to
+what they count. Both are bumped after commit by invalidate_resume_pool.
+"""
+
+import hashlib
+import json
+import logging
+import tempfile
+import uuid
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.core.files import File
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from convention.models import Convention, ConventionRegistration
+from .models import ResumeBundle, ResumePoolEntry
+from .utils import stream_zip
+
+logger = logging.getLogger(__name__)
+
+# visible_to_recruiters values each organization tier may see
+RESUME_VISIBILITY_TIERS = {
+    'business': ('business', 'both'),
+    'graduate_school': ('graduate_school', 'both'),
+    'both': ('both',),
+}
+
+ATTENDING_STATUSES = ('registered', 'confirmed', 'checked_in')
+
+# A bundle left in 'building' this long is assumed abandoned by a crashed run
+STALE_BUILD_AGE = timedelta(minutes=30)
+
+
+def resume_visibility_tier(profile):
+    """Return the RESUME_VISIBILITY_TIERS key for this recruiter's org type."""
+    org_type = profile.organization.org_type if profile.organization else None
+    return org_type if org_type in ('business', 'graduate_school') else 'both'
+
+
+def resume_pool_version_key(convention_id):
+    return f'recruiters:{convention_id}:resume_pool_version'
+
+
+def get_resume_pool_version(convention_id):
+    """Version of a convention's pool for keying cached facets, created on first use."""
+    key = resume_pool_version_key(convention_id)
+    version = cache.get(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        cache.set(key, version, None)
+    return version
+
+
+class ResumePoolInvalidation:
+    """
+    on_commit callback that drops cached facets for `pools` and prebuilt
+    bundles for `bundles` (sets of convention ids) in one go.
+    """
+
+    def __init__(self):
+        self.pools = set()
+        self.bundles = set()
+        self.done = False
+
+    def __call__(self):
+        self.done = True
+        if self.pools:
+            cache.set_many({resume_pool_version_key(pk): uuid.uuid4().hex for pk in self.pools}, None)
+        if self.bundles:
+            Convention.objects.filter(pk__in=self.bundles).update(
+                resume_set_version=F('resume_set_version') + 1
+            )
+
+
+def invalidate_resume_pool(pools=(), bundles=()):
+    """
+    Once the current transaction commits, drop the cached facets of the
+    conventions in `pools` and bump resume_set_version for those in `bundles`,
+    i.e. whose set of visible resumes changed. Calls within one transaction
+    share a single callback, so each convention is bumped at most once and the
+    Convention row is never locked by a registration's transaction.
+    """
+    pools = {pk for pk in pools if pk}
+    bundles = {pk for pk in bundles if pk}
+    if not pools and not bundles:
+        return
+    connection = transaction.get_connection()
+    pending = next(
+        (
+            callback for _, callback, _ in connection.run_on_commit
+            if isinstance(callback, ResumePoolInvalidation) and not callback.done
+        ),
+        None,
+    )
+    if pending is None:
+        pending = ResumePoolInvalidation()
+        pending.pools, pending.bundles = pools, bundles
+        # Runs straight away outside a transaction
+        transaction.on_commit(pending)
+    else:
+        pending.pools |= pools
+        pending.bundles |= bundles
+
+
+def bulk_download_queryset(convention, tier, search='', school='', curriculum_id=None):
+    """Registrations with a resume on file that a recruiter in `tier` may download."""
+    resumes = ConventionRegistration.objects.filter(
+        convention=convention,
+        visible_to_recruiters__in=RESUME_VISIBILITY_TIERS[tier],
+        status_code__in=ATTENDING_STATUSES,
+    ).exclude(resume='').filter(resume__isnull=False).select_related('person', 'person__member')
+
+    if search:
+        resumes = resumes.filter(
+            Q(person__first_name__icontains=search) |
+            Q(person__last_name__icontains=search) |
+            Q(person__preferred_first_name__icontains=search) |
+            Q(person__member__school_name__icontains=search)
+        )
+    if school:
+        resumes = resumes.filter(person__member__school_name=school)
+    if curriculum_id is not None:
+        resumes = resumes.filter(resume_curricula__id=curriculum_id)
+
+    return resumes.distinct().order_by('person__last_name', 'person__first_name', 'id')
+
+
+def pool_school_name(convention, tier, school):
+    """
+    The school name as stored in the pool a recruiter in `tier` sees, or None if
+    no one there lists it. Bundles are keyed by this stored name, so spelling
+    variants the database collation matches can't each queue their own bundle.
+    """
+    return ResumePoolEntry.objects.filter(
+        convention=convention,
+        visible_to_recruiters__in=RESUME_VISIBILITY_TIERS[tier],
+        school_name=school,
+    ).values_list('school_name', flat=True).first()
+
+
+def archive_entries(registrations):
+    """Yield (filename, resume, timestamp) for stream_zip with de-duplicated names."""
+    seen_names = {}
+    for entry in registrations:
+        last = entry.person.last_name
+        first = entry.person.preferred_first_name or entry.person.first_name
+        base = f"{last}_{first}_resume.pdf"
+        # Deduplicate filenames across entries with the same name
+        if base in seen_names:
+            seen_names[base] += 1
+            filename = f"{last}_{first}_{seen_names[base]}_resume.pdf"
+        else:
+            seen_names[base] = 0
+            filename = base
+        yield filename, entry.resume, entry.resume_uploaded_at or timezone.now()
+
+
+def bundle_filter_hash(filters):
+    return hashlib.sha256(json.dumps(filters, sort_keys=True).encode()).hexdigest()
+
+
+def queue_bundle(convention, tier, filters):
+    """Return the bundle row for this key at the current resume-set version, queuing it if new."""
+    bundle, _ = ResumeBundle.objects.get_or_create(
+        convention=convention,
+        visibility_tier=tier,
+        filter_hash=bundle_filter_hash(filters),
+        resume_set_version=convention.resume_set_version,
+        defaults={'filters': filters},
+    )
+    return bundle
+
+
+def get_ready_bundle(convention, tier, filters):
+    """
+    Return the ready bundle for these filters, or None. A missing bundle is
+    queued for the next build_resume_bundles run.
+    """
+    bundle = queue_bundle(convention, tier, filters)
+    if bundle.status == 'ready' and bundle.file:
+        return bundle
+    return None
+
+
+def claimable_bundles():
+    """Bundles waiting to be built, including ones abandoned mid-build."""
+    return ResumeBundle.objects.filter(
+        Q(status='pending') |
+        Q(status='building', updated_at__lt=timezone.now() - STALE_BUILD_AGE)
+    ).select_related('convention')
+
+
+def build_bundle(bundle):
+    """
+    Build one bundle to a temp file and store it. Returns False if another
+    worker claimed it first or the resume set has moved on since it was queued.
+    """
+    claimed = ResumeBundle.objects.filter(
+        pk=bundle.pk, status=bundle.status, updated_at=bundle.updated_at
+    ).update(status='building', updated_at=timezone.now())
+    if not claimed:
+        return False
+
+    convention = bundle.convention
+    convention.refresh_from_db(fields=['resume_set_version'])
+    if convention.resume_set_version != bundle.resume_set_version:
+        # Superseded before it was built; prune_stale_bundles removes it
+        ResumeBundle.objects.filter(pk=bundle.pk).update(status='failed', updated_at=timezone.now())
+        return False
+
+    filters = bundle.filters or {}
+    registrations = list(bulk_download_queryset(
+        convention,
+        bundle.visibility_tier,
+        school=filters.get('school', ''),
+        curriculum_id=filters.get('curriculum'),
+    ))
+
+    try:
+        with tempfile.TemporaryFile() as tmp:
+            for chunk in stream_zip(archive_entries(registrations)):
+                tmp.write(chunk)
+            tmp.seek(0)
+            name = f'bundle_{bundle.visibility_tier}_{bundle.filter_hash[:16]}_v{bundle.resume_set_version}.zip'
+            bundle.file.save(name, File(tmp), save=False)
+            bundle.file_size = bundle.file.size
+    except Exception:
+        logger.exception('Failed to build resume bundle %s', bundle.pk)
+        ResumeBundle.objects.filter(pk=bundle.pk).update(status='failed', updated_at=timezone.now())
+        return False
+
+    bundle.status = 'ready'
+    bundle.resume_count = len(registrations)
+    bundle.built_at = timezone.now()
+    bundle.save(update_fields=['file', 'file_size', 'status', 'resume_count', 'built_at', 'updated_at'])
+    return True
+
+
+def prune_stale_bundles():
+    """Delete bundles (and their files) built for an older resume-set version."""
+    stale = ResumeBundle.objects.filter(
+        resume_set_version__lt=F('convention__resume_set_version')
+    ).exclude(status='building')
+    removed = 0
+    for bundle in stale:
+        if bundle.file:
+            bundle.file.delete(save=False)
+        bundle.delete()
+        removed += 1
+    return removed
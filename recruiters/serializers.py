@@ -5,6 +5,7 @@ from .models import (
 )
 from accounts.models import User, ResumeCurriculum
 from accounts.serializers import CreateUserSerializer
+from .resume_pool import parse_curriculum_key
 import bleach
 import re
 
@@ -41,6 +42,8 @@ def validate_phone_digits(digits, field_name='Phone number'):
 
 class OrganizationSerializer(serializers.ModelSerializer):
     logo_url = serializers.SerializerMethodField()
+    logo_thumbnail_url = serializers.SerializerMethodField()
+    logo_sign_url = serializers.SerializerMethodField()
 
     class Meta:
         model = Organization
@@ -49,7 +52,7 @@ class OrganizationSerializer(serializers.ModelSerializer):
             'address_line1', 'address_line2', 'city', 'state',
             'zip_code', 'country', 'phone', 'billing_email',
             'billing_contact_first_name', 'billing_contact_last_name',
-            'logo_url',
+            'logo_url', 'logo_thumbnail_url', 'logo_sign_url',
         ]
         read_only_fields = ['id']
 
@@ -58,6 +61,13 @@ class OrganizationSerializer(serializers.ModelSerializer):
             return obj.logo.url
         return None
 
+    # Variants are missing for logos uploaded before processing existed; fall back to the original
+    def get_logo_thumbnail_url(self, obj):
+        return obj.logo_thumbnail.url if obj.logo_thumbnail else self.get_logo_url(obj)
+
+    def get_logo_sign_url(self, obj):
+        return obj.logo_sign.url if obj.logo_sign else self.get_logo_url(obj)
+
     def validate_name(self, value):
         return clean_text(value)
 
@@ -359,50 +369,67 @@ class AdminRecruiterRegistrationSerializer(serializers.ModelSerializer):
 
 
 class ResumeSerializer(serializers.Serializer):
-    """Read-only serializer for resume list visible to recruiters."""
-    id = serializers.IntegerField(source='person.id')
+    """
+    Read-only serializer for resume list visible to recruiters. Serializes
+    ResumePoolEntry rows; the view passes the page's previews and the curriculum
+    lookup in context so no row needs a further query.
+    """
+    id = serializers.IntegerField(source='person_id')
     first_name = serializers.SerializerMethodField()
-    last_name = serializers.CharField(source='person.last_name')
+    last_name = serializers.CharField()
     email = serializers.SerializerMethodField()
     chapter_code = serializers.SerializerMethodField()
     school_name = serializers.SerializerMethodField()
-    has_resume = serializers.SerializerMethodField()
+    has_resume = serializers.BooleanField()
     resume_url = serializers.SerializerMethodField()
+    preview_url = serializers.SerializerMethodField()
+    thumbnail_url = serializers.SerializerMethodField()
     resume_curricula = serializers.SerializerMethodField()
 
     def get_first_name(self, obj):
-        return obj.person.preferred_first_name or obj.person.first_name
+        return obj.preferred_first_name or obj.first_name
 
     def get_email(self, obj):
-        if hasattr(obj.person, 'user') and obj.person.user:
-            return obj.person.user.email
-        return None
+        return obj.email or None
 
     def get_chapter_code(self, obj):
-        if hasattr(obj.person, 'member') and obj.person.member:
-            return obj.person.member.chapter_code
-        return None
+        return obj.chapter_code or None
 
     def get_school_name(self, obj):
-        if hasattr(obj.person, 'member') and obj.person.member:
-            return obj.person.member.school_name or None
-        return None
-
-    def get_has_resume(self, obj):
-        return bool(obj.resume)
+        return obj.school_name or None
 
     def get_resume_url(self, obj):
         # Return the access-controlled API endpoint, never the raw media path
-        if self.context.get('includes_resume_access') and obj.resume:
-            return f'/api/recruiters/convention/resumes/{obj.person.id}/resume/'
+        if self.context.get('includes_resume_access') and obj.has_resume:
+            return f'/api/recruiters/convention/resumes/{obj.person_id}/resume/'
+        return None
+
+    def _preview_ready(self, obj):
+        if not (self.context.get('includes_resume_access') and obj.has_resume):
+            return False
+        preview = self.context.get('previews', {}).get(obj.pk)
+        return preview is not None and preview.status == 'ready' and preview.source_name == obj.resume_name
+
+    def get_preview_url(self, obj):
+        if self._preview_ready(obj):
+            return f'/api/recruiters/convention/resumes/{obj.person_id}/preview/'
+        return None
+
+    def get_thumbnail_url(self, obj):
+        if self._preview_ready(obj):
+            return f'/api/recruiters/convention/resumes/{obj.person_id}/preview/?size=thumbnail'
         return None
 
     def get_resume_curricula(self, obj):
         if not self.context.get('includes_resume_access'):
             return None
+        curricula = self.context.get('curricula', {})
         return [
             {'id': c.id, 'full_name': c.full_name, 'abbreviated': c.abbreviated}
-            for c in obj.resume_curricula.all()
+            for c in sorted(
+                (curricula[i] for i in parse_curriculum_key(obj.curriculum_key) if i in curricula),
+                key=lambda c: c.full_name
+            )
         ]
 
 
@@ -1,3 +1,145 @@
 # Signals for recruiter notifications
 # Currently email notifications are handled inline in views.
-# This file exists for future signal-based notifications if needed.
+#
+# Resume pool read model: changes to a registration, its curricula, or the
+# person, member or user behind it re-sync its ResumePoolEntry. The sync
+# reports which conventions' cached facets and which conventions' bundles the
+# change affected, and invalidate_resume_pool bumps those versions once per
+# transaction after it commits; a sign-up without a resume leaves bundles alone.
+#
+# Recruiter access: cached per-user access snapshots (recruiters/access.py) are
+# dropped when anything they were resolved from changes.
+
+from django.db.models.signals import pre_delete, post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from accounts.models import Member, Person, User
+from convention.models import Convention, ConventionRegistration
+from .access import invalidate_all_recruiter_access, invalidate_recruiter_access
+from .models import BoothPackage, Organization, RecruiterProfile, RecruiterRegistration, ResumePoolEntry
+from .resume_pool import POOL_REGISTRATION_FIELDS, sync_person_pool_entries, sync_pool_entries
+from .resumes import invalidate_resume_pool
+
+
+@receiver(post_save, sender=ConventionRegistration)
+def registration_pool_entry_saved(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and not set(update_fields) & POOL_REGISTRATION_FIELDS:
+        return
+    invalidate_resume_pool(*sync_pool_entries([instance.pk]))
+
+
+@receiver(pre_delete, sender=ConventionRegistration)
+def capture_pool_entry_before_delete(sender, instance, **kwargs):
+    # The pool entry is cascade-deleted before post_delete runs
+    instance._pool_entry_before = (
+        ResumePoolEntry.objects.filter(pk=instance.pk).values_list('convention_id', 'has_resume').first()
+    )
+
+
+@receiver(post_delete, sender=ConventionRegistration)
+def registration_pool_entry_deleted(sender, instance, **kwargs):
+    entry = instance.__dict__.pop('_pool_entry_before', None)
+    if entry:
+        convention_id, has_resume = entry
+        invalidate_resume_pool([convention_id], [convention_id] if has_resume else [])
+
+
+@receiver(m2m_changed, sender=ConventionRegistration.resume_curricula.through)
+def resume_curricula_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            invalidate_resume_pool(*sync_pool_entries([instance.pk]))
+        return
+    # instance is a ResumeCurriculum; clearing it is caught before the links go
+    if action == 'pre_clear':
+        instance._resume_pool_cleared = list(
+            ConventionRegistration.objects.filter(resume_curricula=instance).values_list('pk', flat=True)
+        )
+    elif action == 'post_clear':
+        invalidate_resume_pool(*sync_pool_entries(instance.__dict__.pop('_resume_pool_cleared', [])))
+    elif action in ('post_add', 'post_remove'):
+        invalidate_resume_pool(*sync_pool_entries(pk_set))
+
+
+@receiver(post_save, sender=Person)
+def person_pool_entries_saved(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or created:
+        return
+    if update_fields is not None and not set(update_fields) & {'first_name', 'preferred_first_name', 'last_name'}:
+        return
+    # Names appear in bundle file names
+    invalidate_resume_pool(*sync_person_pool_entries(instance.pk))
+
+
+@receiver(post_save, sender=Member)
+def member_pool_entries_saved(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and not set(update_fields) & {'school_name', 'chapter_code'}:
+        return
+    # School is a bundle filter and a facet
+    invalidate_resume_pool(*sync_person_pool_entries(instance.person_id))
+
+
+@receiver(post_save, sender=User)
+def user_pool_entries_saved(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Logins save last_login only; those must not touch the pool
+    if raw or not instance.person_id:
+        return
+    if update_fields is not None and not set(update_fields) & {'email', 'person'}:
+        return
+    invalidate_resume_pool(*sync_person_pool_entries(instance.person_id))
+
+
+@receiver(post_save, sender=RecruiterProfile)
+@receiver(post_delete, sender=RecruiterProfile)
+def recruiter_profile_access_changed(sender, instance, **kwargs):
+    invalidate_recruiter_access([instance.user_id])
+
+
+@receiver(post_save, sender=Organization)
+def organization_access_changed(sender, instance, created, update_fields=None, **kwargs):
+    if created or (update_fields is not None and 'org_type' not in update_fields):
+        return
+    invalidate_recruiter_access(instance.recruiters.values_list('user_id', flat=True))
+
+
+@receiver(post_save, sender=RecruiterRegistration)
+@receiver(post_delete, sender=RecruiterRegistration)
+def recruiter_registration_access_changed(sender, instance, **kwargs):
+    invalidate_recruiter_access(
+        RecruiterProfile.objects.filter(pk=instance.recruiter_id).values_list('user_id', flat=True)
+    )
+
+
+@receiver(post_save, sender=BoothPackage)
+def booth_package_access_changed(sender, instance, created, **kwargs):
+    if created:
+        return
+    invalidate_recruiter_access(
+        RecruiterRegistration.objects.filter(booth_package=instance)
+        .values_list('recruiter__user_id', flat=True)
+    )
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def user_roles_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear', 'pre_clear'):
+        return
+    if not reverse:
+        if action != 'pre_clear':
+            invalidate_recruiter_access([instance.pk])
+    elif action in ('post_add', 'post_remove'):
+        invalidate_recruiter_access(pk_set)
+    elif action == 'pre_clear':
+        # instance is a Group; its members are gone by post_clear
+        invalidate_recruiter_access(instance.user_set.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=Convention)
+@receiver(post_delete, sender=Convention)
+def convention_access_changed(sender, instance, **kwargs):
+    # The active convention may have changed
+    invalidate_all_recruiter_access()
@@ -32,6 +32,7 @@ urlpatterns = [
     path('convention/resumes/filters/', views.recruiter_resume_filters, name='recruiter_resume_filters'),
     path('convention/resumes/bulk-download/', views.recruiter_resumes_bulk_download, name='recruiter_resumes_bulk_download'),
     path('convention/resumes/<int:member_id>/resume/', views.recruiter_resume_download, name='recruiter_resume_download'),
+    path('convention/resumes/<int:member_id>/preview/', views.recruiter_resume_preview, name='recruiter_resume_preview'),
 
     # Member resume upload (used by members, not recruiters)
     path('member/resume/', views.member_resume, name='member_resume'),
@@ -39,5 +40,7 @@ urlpatterns = [
     # Invoices
     path('admin/invoices/', views.admin_invoices, name='admin_invoices'),
     path('admin/invoices/<int:pk>/', views.admin_update_invoice, name='admin_update_invoice'),
+    path('admin/invoices/<int:pk>/pdf/', views.admin_invoice_pdf, name='admin_invoice_pdf'),
     path('invoices/', views.recruiter_invoices, name='recruiter_invoices'),
+    path('invoices/<int:pk>/pdf/', views.recruiter_invoice_pdf, name='recruiter_invoice_pdf'),
 ]
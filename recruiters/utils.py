@@ -0,0 +1,84 @@
+"""
+Utility functions for recruiter resume downloads.
+Builds zip archives as a stream so bulk downloads never hold the whole archive in memory.
+"""
+
+import logging
+import zipfile
+
+logger = logging.getLogger(__name__)
+
+# Bytes read from storage per chunk when copying a file into the archive
+ZIP_READ_CHUNK_SIZE = 64 * 1024
+
+
+class _ZipStreamSink:
+    """
+    Write-only file object for zipfile.ZipFile.
+
+    It has tell() but no seek(), so zipfile writes sizes and CRCs in data
+    descriptors after each entry instead of seeking back to patch headers.
+    Whatever zipfile writes is collected here until the generator drains it.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._offset = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._offset
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_zip(entries):
+    """
+    Generate a zip archive chunk by chunk.
+
+    Args:
+        entries: iterable of (arcname, file_field, date_time) tuples. file_field is
+            a Django FieldFile; date_time is a datetime used as the entry timestamp.
+            Entries that cannot be read are logged and left out.
+
+    Yields:
+        bytes chunks of the archive, at most ZIP_READ_CHUNK_SIZE plus header overhead.
+
+    Entries are ZIP_STORED: PDFs are already compressed, so deflating them costs
+    CPU for almost no size reduction. Memory use is bounded by the chunk size
+    regardless of how many entries the archive holds.
+    """
+    sink = _ZipStreamSink()
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_STORED) as zf:
+        for arcname, file_field, date_time in entries:
+            info = zipfile.ZipInfo(arcname, date_time=date_time.timetuple()[:6])
+            info.compress_type = zipfile.ZIP_STORED
+            info.external_attr = 0o644 << 16
+            try:
+                source = file_field.open('rb')
+            except Exception:
+                logger.warning('Could not open %s for zip stream', getattr(file_field, 'name', arcname))
+                continue
+            with source, zf.open(info, 'w') as dest:
+                for chunk in iter(lambda: source.read(ZIP_READ_CHUNK_SIZE), b''):
+                    dest.write(chunk)
+                    data = sink.drain()
+                    if data:
+                        yield data
+            data = sink.drain()
+            if data:
+                yield data
+    # Central directory
+    data = sink.drain()
+    if data:
+        yield data
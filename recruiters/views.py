@@ -23,10 +23,12 @@ from accounts.throttles import RegisterThrottle, RecruiterThrottle
 
 from accounts.models import User, Code, ROLE_RECRUITER, ROLE_HQ_RECRUITING
 from accounts.tokens import account_activation_token
+from core.protected_files import protected_file_response
+from core.uploads import upload_error, validated_uploads
 from convention.models import Convention, ConventionRegistration
 from .models import (
     BoothPackage, MealOption, Organization, RecruiterProfile,
-    RecruiterRegistration, Invoice
+    RecruiterRegistration, Invoice, ResumePoolEntry, ResumePreview
 )
 from .serializers import (
     RecruiterRegistrationSerializer, RecruiterProfileSerializer,
@@ -36,6 +38,18 @@ from .serializers import (
     ResumeSerializer, InvoiceSerializer, RecruiterInvoiceSerializer,
     OrganizationSerializer
 )
+from .access import get_recruiter_access
+from .invoice_pdfs import get_invoice_pdf, invoice_pdf_is_current, invoices_for_pdf
+from .logos import check_logo, clear_org_logo, set_org_logo
+from .resume_search import clear_resume_index, index_resume, keyword_search, parse_query
+from .resume_facets import get_resume_facets
+from .resume_optimization import clear_resume_optimization, queue_resume_optimization
+from .resume_pool import normalize_search
+from .resume_previews import clear_resume_preview, queue_resume_preview
+from .resumes import (
+    ATTENDING_STATUSES, archive_entries, bulk_download_queryset, get_ready_bundle, pool_school_name,
+)
+from .utils import stream_zip
 
 FRONTEND_URL = settings.FRONTEND_URL
 DOMAIN = settings.DOMAIN
@@ -45,6 +59,7 @@ _LOGO_ALLOWED_CONTENT_TYPES = {'image/png', 'image/jpeg'}
 _LOGO_MAX_SIZE = 5 * 1024 * 1024  # 5MB
 _LOGO_PNG_SIG = b'\x89PNG'
 _LOGO_JPEG_SIG = b'\xff\xd8\xff'
+_RESUME_MAX_SIZE = 5 * 1024 * 1024  # 5MB
 
 
 def _validate_org_logo(file):
@@ -67,7 +82,8 @@ def _validate_org_logo(file):
     if not (header.startswith(_LOGO_PNG_SIG) or header.startswith(_LOGO_JPEG_SIG)):
         return 'Logo does not appear to be a valid PNG or JPG image.'
 
-    return None
+    # Fully decode it now so processing can't fail after records are created
+    return check_logo(file)
 
 
 # ============================================================
@@ -78,14 +94,6 @@ def is_recruiter(user):
     return user.has_role(ROLE_RECRUITER)
 
 
-def is_approved_recruiter(user):
-    return (
-        is_recruiter(user) and
-        hasattr(user, 'recruiter_profile') and
-        user.recruiter_profile.is_approved
-    )
-
-
 def is_staff_or_admin(user):
     return any(user.has_role(r) for r in ('hq_staff', 'hq_admin', 'hq_recruiting'))
 
@@ -102,6 +110,7 @@ def get_active_convention():
 # Recruiter Self-Registration
 # ============================================================
 
+@validated_uploads({'org_logo': {'png', 'jpeg'}}, max_file_size=_LOGO_MAX_SIZE)
 @api_view(['POST'])
 @permission_classes([AllowAny])
 @throttle_classes([RegisterThrottle])
@@ -109,6 +118,9 @@ def get_active_convention():
 def recruiter_register(request):
     """Register a new recruiter with organization info."""
     serializer = RecruiterRegistrationSerializer(data=request.data)
+    logo_rejected = upload_error(request)
+    if logo_rejected:
+        return Response({'errors': {'org_logo': logo_rejected}}, status=status.HTTP_400_BAD_REQUEST)
     if not serializer.is_valid():
         return Response({'errors': serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -161,8 +173,7 @@ def recruiter_register(request):
     # Save logo to the org if provided (only set on newly created orgs to avoid
     # overwriting an existing org's logo when a second recruiter joins the same org)
     if logo_file and created:
-        org.logo = logo_file
-        org.save(update_fields=['logo'])
+        set_org_logo(org, logo_file)
 
     # If org already existed, block self-registration if it has approved recruiters
     # from other users. Prevents unauthorized org association.
@@ -290,6 +301,7 @@ def update_organization(request):
     return Response(serializer.data)
 
 
+@validated_uploads({'logo': {'png', 'jpeg'}}, max_file_size=_LOGO_MAX_SIZE)
 @api_view(['POST', 'DELETE'])
 @permission_classes([IsAuthenticated])
 def organization_logo(request):
@@ -306,12 +318,13 @@ def organization_logo(request):
 
     if request.method == 'DELETE':
         if org.logo:
-            org.logo.delete(save=False)
-            org.logo = None
-            org.save(update_fields=['logo'])
+            clear_org_logo(org)
         return Response({'success': 'Logo removed.'})
 
     # POST: upload new logo
+    rejected = upload_error(request)
+    if rejected:
+        return Response({'error': rejected}, status=status.HTTP_400_BAD_REQUEST)
     file = request.FILES.get('logo')
     if not file:
         return Response({'error': 'No file provided.'}, status=status.HTTP_400_BAD_REQUEST)
@@ -320,15 +333,16 @@ def organization_logo(request):
     if logo_error:
         return Response({'error': logo_error}, status=status.HTTP_400_BAD_REQUEST)
 
-    # Delete old logo before saving new one
-    if org.logo:
-        org.logo.delete(save=False)
-
-    org.logo = file
-    org.save(update_fields=['logo'])
+    # Stores a cleaned, resized copy plus variants and removes the previous files
+    set_org_logo(org, file)
 
     serializer = OrganizationSerializer(org)
-    return Response({'success': 'Logo uploaded.', 'logo_url': serializer.data['logo_url']})
+    return Response({
+        'success': 'Logo uploaded.',
+        'logo_url': serializer.data['logo_url'],
+        'logo_thumbnail_url': serializer.data['logo_thumbnail_url'],
+        'logo_sign_url': serializer.data['logo_sign_url'],
+    })
 
 
 # ============================================================
@@ -461,14 +475,14 @@ def meal_options(request):
 @permission_classes([IsAuthenticated])
 def recruiter_convention_register(request):
     """Register recruiter for the current convention."""
-    if not is_approved_recruiter(request.user):
+    access = get_recruiter_access(request)
+    if not access.is_approved:
         return Response(
             {'error': 'You must be an approved recruiter to register.'},
             status=status.HTTP_403_FORBIDDEN
         )
 
-    convention = get_active_convention()
-    if not convention:
+    if not access.convention_id:
         return Response({'error': 'No active convention.'}, status=status.HTTP_404_NOT_FOUND)
 
     serializer = RecruiterConventionRegistrationSerializer(data=request.data)
@@ -487,13 +501,13 @@ def recruiter_convention_register(request):
                     status=status.HTTP_403_FORBIDDEN
                 )
 
-            if RecruiterRegistration.objects.filter(recruiter=profile, convention=convention).exists():
+            if RecruiterRegistration.objects.filter(recruiter=profile, convention_id=access.convention_id).exists():
                 return Response(
                     {'error': 'You are already registered for this convention.'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            registration = serializer.save(recruiter=profile, convention=convention, status='pending')
+            registration = serializer.save(recruiter=profile, convention_id=access.convention_id, status='pending')
     except IntegrityError:
         return Response(
             {'error': 'You are already registered for this convention.'},
@@ -509,7 +523,7 @@ def recruiter_convention_register(request):
         if hq_emails:
             message = render_to_string('recruiters/new_convention_registration_notification_email.html', {
                 'registration': registration,
-                'convention': convention,
+                'convention': registration.convention,
                 'frontend_url': FRONTEND_URL,
                 'domain': DOMAIN,
             })
@@ -530,19 +544,22 @@ def recruiter_convention_register(request):
 @permission_classes([IsAuthenticated])
 def recruiter_my_registration(request):
     """View or update own convention registration."""
-    if not is_recruiter(request.user):
+    access = get_recruiter_access(request)
+    if not access.is_recruiter:
         return Response({'error': 'Not a recruiter.'}, status=status.HTTP_403_FORBIDDEN)
 
-    convention = get_active_convention()
-    if not convention:
+    if not access.convention_id:
         return Response({'error': 'No active convention.'}, status=status.HTTP_404_NOT_FOUND)
 
+    if not access.profile_id:
+        return Response({'has_registration': False})
+
+    # Cancelled registrations are shown too, so this isn't access.registration_id
     try:
-        profile = request.user.recruiter_profile
         registration = RecruiterRegistration.objects.select_related(
             'booth_package', 'meal_option'
-        ).prefetch_related('attendees').get(recruiter=profile, convention=convention)
-    except (RecruiterProfile.DoesNotExist, RecruiterRegistration.DoesNotExist):
+        ).prefetch_related('attendees').get(recruiter_id=access.profile_id, convention_id=access.convention_id)
+    except RecruiterRegistration.DoesNotExist:
         return Response({'has_registration': False})
 
     if request.method == 'GET':
@@ -580,12 +597,13 @@ def admin_registrations(request):
     if not is_staff_or_admin(request.user):
         return Response({'error': 'Permission denied.'}, status=status.HTTP_403_FORBIDDEN)
 
-    convention = get_active_convention()
-    if not convention:
+    # The cached access carries the active convention for staff users too
+    convention_id = get_recruiter_access(request).convention_id
+    if not convention_id:
         return Response({'error': 'No active convention.'}, status=status.HTTP_404_NOT_FOUND)
 
     registrations = RecruiterRegistration.objects.filter(
-        convention=convention
+        convention_id=convention_id
     ).select_related(
         'recruiter__organization', 'recruiter__user',
         'booth_package', 'meal_option'
@@ -662,64 +680,59 @@ class AdminPagination(PageNumberPagination):
 
 
 _RESUME_ORDERING = {
-    'last_name':    ('person__last_name', 'person__first_name'),
-    '-last_name':   ('-person__last_name', '-person__first_name'),
-    'email':        ('person__user__email',),
-    '-email':       ('-person__user__email',),
-    'school_name':  ('person__member__school_name', 'person__last_name'),
-    '-school_name': ('-person__member__school_name', '-person__last_name'),
+    'last_name':    ('last_name', 'first_name'),
+    '-last_name':   ('-last_name', '-first_name'),
+    'email':        ('email',),
+    '-email':       ('-email',),
+    'school_name':  ('school_name', 'last_name'),
+    '-school_name': ('-school_name', '-last_name'),
 }
 
 
-def _resume_visibility_filter(profile):
-    """Return the visible_to_recruiters values this recruiter's org type can see."""
-    org_type = profile.organization.org_type if profile.organization else None
-    if org_type == 'business':
-        return ['business', 'both']
-    if org_type == 'graduate_school':
-        return ['graduate_school', 'both']
-    return ['both']
+def _resume_pool_access(request, no_registration_error='No active registration.'):
+    """
+    Gate shared by the resume pool endpoints, answered from the cached
+    RecruiterAccess. Returns (access, None) or (None, error Response).
+    """
+    access = get_recruiter_access(request)
+    if not access.is_approved:
+        return None, Response({'error': 'Access denied.'}, status=status.HTTP_403_FORBIDDEN)
+    if not access.convention_id:
+        return None, Response({'error': 'No active convention.'}, status=status.HTTP_404_NOT_FOUND)
+    if not access.has_registration:
+        return None, Response({'error': no_registration_error}, status=status.HTTP_403_FORBIDDEN)
+    return access, None
+
+
+def _require_resume_access(access):
+    if not access.resume_access:
+        return Response(
+            {'error': 'Your booth package does not include resume access.'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    return None
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 @throttle_classes([RecruiterThrottle])
 def recruiter_resumes(request):
-    """List members attending the convention (visible to recruiters)."""
-    if not is_approved_recruiter(request.user):
-        return Response({'error': 'Access denied.'}, status=status.HTTP_403_FORBIDDEN)
-
-    convention = get_active_convention()
-    if not convention:
-        return Response({'error': 'No active convention.'}, status=status.HTTP_404_NOT_FOUND)
-
-    try:
-        profile = request.user.recruiter_profile
-    except RecruiterProfile.DoesNotExist:
-        return Response({'error': 'Recruiter profile not found.'}, status=status.HTTP_404_NOT_FOUND)
-
-    try:
-        reg = RecruiterRegistration.objects.select_related('booth_package').get(
-            recruiter=profile, convention=convention,
-            status__in=['pending', 'approved', 'confirmed']
-        )
-    except RecruiterRegistration.DoesNotExist:
-        return Response(
-            {'error': 'You must be registered for the convention to view resumes.'},
-            status=status.HTTP_403_FORBIDDEN
-        )
+    """
+    List members attending the convention (visible to recruiters).
+    ?keywords= searches resume contents and ranks by relevance unless ?ordering= is given.
+    """
+    access, error = _resume_pool_access(
+        request, 'You must be registered for the convention to view resumes.'
+    )
+    if error:
+        return error
 
-    includes_resume = reg.booth_package.includes_resume_access
-    visibility_filter = _resume_visibility_filter(profile)
+    includes_resume = access.resume_access
 
-    resumes = ConventionRegistration.objects.filter(
-        convention=convention,
-        visible_to_recruiters__in=visibility_filter,
-        status_code__in=['registered', 'confirmed', 'checked_in']
-    ).select_related(
-        'person', 'person__user', 'person__member'
-    ).prefetch_related(
-        'resume_curricula'
+    # Reads the denormalized pool table; no person/member/user joins per request
+    resumes = ResumePoolEntry.objects.filter(
+        convention_id=access.convention_id,
+        visible_to_recruiters__in=access.resume_visibility,
     )
 
     # Search filter — require at least 2 characters to prevent enumeration
@@ -730,40 +743,48 @@ def recruiter_resumes(request):
                 {'error': 'Search query must be at least 2 characters.'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        from django.db.models import Q
-        resumes = resumes.filter(
-            Q(person__first_name__icontains=search) |
-            Q(person__last_name__icontains=search) |
-            Q(person__preferred_first_name__icontains=search) |
-            Q(person__member__school_name__icontains=search)
-        )
+        resumes = resumes.filter(search_text__contains=normalize_search(search))
 
     # Exact school filter
     school = request.query_params.get('school', '').strip()
     if school:
-        resumes = resumes.filter(person__member__school_name=school)
+        resumes = resumes.filter(school_name=school)
 
     # Curriculum filter
     curriculum_id = request.query_params.get('curriculum', '').strip()
     if curriculum_id:
         try:
-            resumes = resumes.filter(resume_curricula__id=int(curriculum_id))
+            resumes = resumes.filter(curricula__curriculum_id=int(curriculum_id))
         except ValueError:
             return Response({'error': 'Invalid curriculum ID.'}, status=status.HTTP_400_BAD_REQUEST)
 
-    ordering = _RESUME_ORDERING.get(
-        request.query_params.get('ordering', '').strip(),
-        _RESUME_ORDERING['last_name']
-    )
+    # Keyword search over resume contents (indexed at upload), best matches first
+    keyword_terms = parse_query(request.query_params.get('keywords', ''))
+    if keyword_terms:
+        error = _require_resume_access(access)
+        if error:
+            return error
+        resumes = keyword_search(resumes, access.convention_id, keyword_terms)
+
+    ordering_param = request.query_params.get('ordering', '').strip()
+    if keyword_terms and ordering_param not in _RESUME_ORDERING:
+        ordering = ('-search_rank', *_RESUME_ORDERING['last_name'])
+    else:
+        ordering = _RESUME_ORDERING.get(ordering_param, _RESUME_ORDERING['last_name'])
     resumes = resumes.order_by(*ordering)
 
     paginator = ResumePagination()
     page = paginator.paginate_queryset(resumes, request)
 
-    serializer = ResumeSerializer(
-        page, many=True,
-        context={'request': request, 'includes_resume_access': includes_resume}
-    )
+    context = {'request': request, 'includes_resume_access': includes_resume}
+    if includes_resume:
+        from accounts.models import ResumeCurriculum
+        context['curricula'] = ResumeCurriculum.objects.in_bulk()
+        context['previews'] = {
+            preview.registration_id: preview
+            for preview in ResumePreview.objects.filter(registration_id__in=[entry.pk for entry in page])
+        }
+    serializer = ResumeSerializer(page, many=True, context=context)
     return paginator.get_paginated_response(serializer.data)
 
 
@@ -771,53 +792,32 @@ def recruiter_resumes(request):
 @permission_classes([IsAuthenticated])
 @throttle_classes([RecruiterThrottle])
 def recruiter_resume_filters(request):
-    """Return distinct school and curriculum filter options for the resume pool."""
-    if not is_approved_recruiter(request.user):
-        return Response({'error': 'Access denied.'}, status=status.HTTP_403_FORBIDDEN)
-
-    convention = get_active_convention()
-    if not convention:
-        return Response({'error': 'No active convention.'}, status=status.HTTP_404_NOT_FOUND)
-
-    try:
-        profile = request.user.recruiter_profile
-    except RecruiterProfile.DoesNotExist:
-        return Response({'error': 'Recruiter profile not found.'}, status=status.HTTP_404_NOT_FOUND)
+    """
+    Return school and curriculum filter options for the resume pool with result
+    counts. Accepts the list's search, school and curriculum params; each facet's
+    counts reflect every other active filter.
+    """
+    access, error = _resume_pool_access(request)
+    if error:
+        return error
 
-    try:
-        RecruiterRegistration.objects.get(
-            recruiter=profile, convention=convention,
-            status__in=['pending', 'approved', 'confirmed']
+    search = request.query_params.get('search', '').strip()
+    if search and len(search) < 2:
+        return Response(
+            {'error': 'Search query must be at least 2 characters.'},
+            status=status.HTTP_400_BAD_REQUEST
         )
-    except RecruiterRegistration.DoesNotExist:
-        return Response({'error': 'No active registration.'}, status=status.HTTP_403_FORBIDDEN)
-
-    visibility_filter = _resume_visibility_filter(profile)
-
-    resume_qs = ConventionRegistration.objects.filter(
-        convention=convention,
-        visible_to_recruiters__in=visibility_filter,
-        status_code__in=['registered', 'confirmed', 'checked_in']
-    )
-
-    schools = list(
-        resume_qs
-        .exclude(person__member__school_name='')
-        .values_list('person__member__school_name', flat=True)
-        .distinct()
-        .order_by('person__member__school_name')
-    )
-
-    from accounts.models import ResumeCurriculum
-    curricula = list(
-        ResumeCurriculum.objects
-        .filter(resume_registrations__in=resume_qs)
-        .values('id', 'full_name', 'abbreviated')
-        .distinct()
-        .order_by('full_name')
-    )
+    school = request.query_params.get('school', '').strip()
+    curriculum_id = request.query_params.get('curriculum', '').strip()
+    try:
+        curriculum_id = int(curriculum_id) if curriculum_id else None
+    except ValueError:
+        return Response({'error': 'Invalid curriculum ID.'}, status=status.HTTP_400_BAD_REQUEST)
 
-    return Response({'schools': schools, 'curricula': curricula})
+    return Response(get_resume_facets(
+        access.convention_id, access.visibility_tier,
+        search=search, school=school, curriculum_id=curriculum_id,
+    ))
 
 
 @api_view(['GET'])
@@ -825,171 +825,143 @@ def recruiter_resume_filters(request):
 @throttle_classes([RecruiterThrottle])
 def recruiter_resumes_bulk_download(request):
     """Download a zip of resumes matching the current filters."""
-    if not is_approved_recruiter(request.user):
-        return Response({'error': 'Access denied.'}, status=status.HTTP_403_FORBIDDEN)
-
-    convention = get_active_convention()
-    if not convention:
-        return Response({'error': 'No active convention.'}, status=status.HTTP_404_NOT_FOUND)
-
-    try:
-        profile = request.user.recruiter_profile
-    except RecruiterProfile.DoesNotExist:
-        return Response({'error': 'Recruiter profile not found.'}, status=status.HTTP_404_NOT_FOUND)
-
-    try:
-        reg = RecruiterRegistration.objects.select_related('booth_package').get(
-            recruiter=profile, convention=convention,
-            status__in=['pending', 'approved', 'confirmed']
-        )
-    except RecruiterRegistration.DoesNotExist:
-        return Response({'error': 'No active registration.'}, status=status.HTTP_403_FORBIDDEN)
-
-    if not reg.booth_package.includes_resume_access:
-        return Response(
-            {'error': 'Your booth package does not include resume access.'},
-            status=status.HTTP_403_FORBIDDEN
-        )
-
-    visibility_filter = _resume_visibility_filter(profile)
-
-    resumes = ConventionRegistration.objects.filter(
-        convention=convention,
-        visible_to_recruiters__in=visibility_filter,
-        status_code__in=['registered', 'confirmed', 'checked_in']
-    ).exclude(resume='').filter(resume__isnull=False).select_related('person', 'person__member')
+    access, error = _resume_pool_access(request)
+    if error:
+        return error
+    error = _require_resume_access(access)
+    if error:
+        return error
 
     search = request.query_params.get('search', '').strip()
-    if search:
-        if len(search) < 2:
-            return Response(
-                {'error': 'Search query must be at least 2 characters.'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        from django.db.models import Q
-        resumes = resumes.filter(
-            Q(person__first_name__icontains=search) |
-            Q(person__last_name__icontains=search) |
-            Q(person__preferred_first_name__icontains=search) |
-            Q(person__member__school_name__icontains=search)
+    if search and len(search) < 2:
+        return Response(
+            {'error': 'Search query must be at least 2 characters.'},
+            status=status.HTTP_400_BAD_REQUEST
         )
 
-    school = request.query_params.get('school', '').strip()
-    if school:
-        resumes = resumes.filter(person__member__school_name=school)
-
     curriculum_id = request.query_params.get('curriculum', '').strip()
     if curriculum_id:
         try:
-            resumes = resumes.filter(resume_curricula__id=int(curriculum_id))
+            curriculum_id = int(curriculum_id)
         except ValueError:
             return Response({'error': 'Invalid curriculum ID.'}, status=status.HTTP_400_BAD_REQUEST)
+    else:
+        curriculum_id = None
 
-    resumes = list(resumes.distinct())
+    convention = Convention.objects.get(pk=access.convention_id)
+    tier = access.visibility_tier
 
-    if not resumes:
+    # Only schools in the pool are accepted, since each one gets its own bundle
+    school = request.query_params.get('school', '').strip()
+    if school:
+        school = pool_school_name(convention, tier, school)
+        if school is None:
+            return Response({'error': 'Invalid school.'}, status=status.HTTP_400_BAD_REQUEST)
+    resumes = bulk_download_queryset(
+        convention, tier, search=search, school=school, curriculum_id=curriculum_id
+    )
+
+    if not resumes.exists():
         return Response({'error': 'No resumes found matching your filters.'}, status=status.HTTP_404_NOT_FOUND)
 
-    import io
-    import zipfile
-
-    buf = io.BytesIO()
-    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as zf:
-        seen_names = {}
-        for entry in resumes:
-            last = entry.person.last_name
-            first = entry.person.preferred_first_name or entry.person.first_name
-            base = f"{last}_{first}_resume.pdf"
-            # Deduplicate filenames across entries with the same name
-            if base in seen_names:
-                seen_names[base] += 1
-                filename = f"{last}_{first}_{seen_names[base]}_resume.pdf"
-            else:
-                seen_names[base] = 0
-                filename = base
-            try:
-                with entry.resume.open('rb') as f:
-                    zf.writestr(filename, f.read())
-            except Exception:
-                logger.warning('Could not read resume for person %s during bulk download', entry.person_id)
-
-    buf.seek(0)
-    from django.http import HttpResponse
     zip_filename = f"tbp_resumes_{convention.year}.zip"
-    response = HttpResponse(buf.read(), content_type='application/zip')
-    response['Content-Disposition'] = f'attachment; filename="{zip_filename}"'
-    return response
-
-
-@api_view(['GET'])
-@permission_classes([IsAuthenticated])
-@throttle_classes([RecruiterThrottle])
-def recruiter_resume_download(request, member_id):
-    """Download a member's resume PDF."""
-    if not is_approved_recruiter(request.user):
-        return Response({'error': 'Access denied.'}, status=status.HTTP_403_FORBIDDEN)
 
-    convention = get_active_convention()
-    if not convention:
-        return Response({'error': 'No active convention.'}, status=status.HTTP_404_NOT_FOUND)
+    # Pool-wide, school and curriculum downloads repeat across recruiters, so
+    # they are served from prebuilt bundles once build_resume_bundles has run.
+    # Free-text searches are too varied to cache and always stream.
+    if not search:
+        bundle = get_ready_bundle(convention, tier, {'school': school, 'curriculum': curriculum_id})
+        if bundle:
+            return protected_file_response(
+                request, bundle.file, 'application/zip', modified=bundle.built_at,
+                filename=zip_filename, as_attachment=True,
+            )
 
-    profile = request.user.recruiter_profile
+    from django.http import StreamingHttpResponse
+    response = StreamingHttpResponse(stream_zip(archive_entries(list(resumes))), content_type='application/zip')
+    # Let nginx pass chunks straight through instead of buffering the archive
+    response['X-Accel-Buffering'] = 'no'
+    response['Content-Disposition'] = f'attachment; filename="{zip_filename}"'
+    return response
 
-    # Verify resume access
-    try:
-        reg = RecruiterRegistration.objects.select_related('booth_package').get(
-            recruiter=profile, convention=convention,
-            status__in=['pending', 'approved', 'confirmed']
-        )
-    except RecruiterRegistration.DoesNotExist:
-        return Response({'error': 'No active registration.'}, status=status.HTTP_403_FORBIDDEN)
 
-    if not reg.booth_package.includes_resume_access:
-        return Response(
-            {'error': 'Your booth package does not include resume access.'},
-            status=status.HTTP_403_FORBIDDEN
-        )
+def _visible_member_registration(request, member_id):
+    """
+    Resolve the ConventionRegistration of a member whose resume the requesting
+    recruiter may see. Returns (registration, None) or (None, error Response).
+    """
+    access, error = _resume_pool_access(request)
+    if error:
+        return None, error
+    error = _require_resume_access(access)
+    if error:
+        return None, error
 
     # Check person is attending and visible
     from accounts.models import Person
     try:
         person = Person.objects.get(pk=member_id)
     except Person.DoesNotExist:
-        return Response({'error': 'Person not found.'}, status=status.HTTP_404_NOT_FOUND)
-
-    org_type = profile.organization.org_type if profile.organization else None
-    if org_type == 'business':
-        resume_visibility_filter = ['business', 'both']
-    elif org_type == 'graduate_school':
-        resume_visibility_filter = ['graduate_school', 'both']
-    else:
-        resume_visibility_filter = ['both']
+        return None, Response({'error': 'Person not found.'}, status=status.HTTP_404_NOT_FOUND)
 
     member_reg = ConventionRegistration.objects.filter(
-        convention=convention,
+        convention_id=access.convention_id,
         person=person,
-        visible_to_recruiters__in=resume_visibility_filter,
-        status_code__in=['registered', 'confirmed', 'checked_in']
+        visible_to_recruiters__in=access.resume_visibility,
+        status_code__in=ATTENDING_STATUSES
     ).first()
 
     if not member_reg:
-        return Response({'error': 'Member not available.'}, status=status.HTTP_404_NOT_FOUND)
+        return None, Response({'error': 'Member not available.'}, status=status.HTTP_404_NOT_FOUND)
 
     if not member_reg.resume:
-        return Response({'error': 'No resume on file.'}, status=status.HTTP_404_NOT_FOUND)
+        return None, Response({'error': 'No resume on file.'}, status=status.HTTP_404_NOT_FOUND)
 
-    from django.http import FileResponse, HttpResponse
-    if settings.DEBUG:
-        return FileResponse(member_reg.resume.open('rb'), content_type='application/pdf')
-    response = HttpResponse(content_type='application/pdf')
-    response['X-Accel-Redirect'] = f'/protected-media/{member_reg.resume.name}'
-    return response
+    return member_reg, None
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@throttle_classes([RecruiterThrottle])
+def recruiter_resume_download(request, member_id):
+    """Download a member's resume PDF."""
+    member_reg, error = _visible_member_registration(request, member_id)
+    if error:
+        return error
+
+    return protected_file_response(
+        request, member_reg.resume, 'application/pdf', modified=member_reg.resume_uploaded_at,
+    )
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@throttle_classes([RecruiterThrottle])
+def recruiter_resume_preview(request, member_id):
+    """
+    First-page preview image of a member's resume. ?size=thumbnail returns the
+    small list thumbnail; the default is the full page preview.
+    """
+    member_reg, error = _visible_member_registration(request, member_id)
+    if error:
+        return error
+
+    preview = ResumePreview.objects.filter(registration=member_reg).first()
+    if not preview or not preview.is_current:
+        return Response({'error': 'Preview not available yet.'}, status=status.HTTP_404_NOT_FOUND)
+
+    image = preview.thumbnail if request.query_params.get('size') == 'thumbnail' else preview.preview
+    # Image names change whenever the resume does, so a short private cache is safe
+    return protected_file_response(
+        request, image, 'image/jpeg', modified=preview.updated_at, cache_control='private, max-age=300',
+    )
 
 
 # ============================================================
 # Member Resume Upload
 # ============================================================
 
+@validated_uploads({'resume': {'pdf'}}, max_file_size=_RESUME_MAX_SIZE)
 @api_view(['GET', 'POST', 'DELETE'])
 @permission_classes([IsAuthenticated])
 def member_resume(request):
@@ -1013,24 +985,28 @@ def member_resume(request):
     if request.method == 'GET':
         if not reg.resume:
             return Response({'error': 'No resume on file.'}, status=status.HTTP_404_NOT_FOUND)
-        from django.http import FileResponse, HttpResponse
-        if settings.DEBUG:
-            return FileResponse(reg.resume.open('rb'), content_type='application/pdf')
-        response = HttpResponse(content_type='application/pdf')
-        response['X-Accel-Redirect'] = f'/protected-media/{reg.resume.name}'
-        return response
+        return protected_file_response(request, reg.resume, 'application/pdf', modified=reg.resume_uploaded_at)
 
     if request.method == 'DELETE':
         if reg.resume:
-            reg.resume.delete()
+            old_name = reg.resume.name
+            reg.resume = None
             reg.resume_uploaded_at = None
-            reg.save(update_fields=['resume_uploaded_at'])
+            reg.save(update_fields=['resume', 'resume_uploaded_at'])
+            # Resumes are shared by content hash; the file goes once nothing points at it
+            reg.resume.storage.delete(old_name)
             reg.resume_curricula.clear()
+            clear_resume_index(reg)
+            clear_resume_preview(reg)
+            clear_resume_optimization(reg)
         return Response({'success': 'Resume removed.'})
 
     # POST: upload
     from accounts.models import ResumeCurriculum
 
+    rejected = upload_error(request)
+    if rejected:
+        return Response({'error': rejected}, status=status.HTTP_400_BAD_REQUEST)
     file = request.FILES.get('resume')
     if not file:
         return Response({'error': 'No file provided.'}, status=status.HTTP_400_BAD_REQUEST)
@@ -1060,17 +1036,20 @@ def member_resume(request):
         return Response({'error': 'File does not appear to be a valid PDF.'}, status=status.HTTP_400_BAD_REQUEST)
 
     # Max 5MB
-    if file.size > 5 * 1024 * 1024:
+    if file.size > _RESUME_MAX_SIZE:
         return Response({'error': 'File size must be under 5MB.'}, status=status.HTTP_400_BAD_REQUEST)
 
-    # Delete old resume if exists
-    if reg.resume:
-        reg.resume.delete(save=False)
-
+    old_name = reg.resume.name if reg.resume else ''
     reg.resume = file
     reg.resume_uploaded_at = timezone.now()
     reg.save()
+    # Delete the old resume unless it's the same file or another registration shares it
+    if old_name and old_name != reg.resume.name:
+        reg.resume.storage.delete(old_name)
     reg.resume_curricula.set(curricula)
+    index_resume(reg)
+    queue_resume_preview(reg)
+    queue_resume_optimization(reg)
 
     return Response({
         'success': 'Resume uploaded.',
@@ -1185,22 +1164,63 @@ def admin_update_invoice(request, pk):
 @permission_classes([IsAuthenticated])
 def recruiter_invoices(request):
     """Recruiter: view own organization's invoices."""
-    if not is_recruiter(request.user):
+    access = get_recruiter_access(request)
+    if not access.is_recruiter:
         return Response({'error': 'Not a recruiter.'}, status=status.HTTP_403_FORBIDDEN)
 
-    try:
-        profile = request.user.recruiter_profile
-    except RecruiterProfile.DoesNotExist:
+    if not access.profile_id:
         return Response({'error': 'Profile not found.'}, status=status.HTTP_404_NOT_FOUND)
 
     invoices = Invoice.objects.filter(
-        organization=profile.organization
+        organization_id=access.organization_id
     ).select_related('organization', 'convention')
 
     serializer = RecruiterInvoiceSerializer(invoices, many=True)
     return Response(serializer.data)
 
 
+def _invoice_pdf_response(request, invoice):
+    """Serve an invoice's cached PDF, rendering it first if the invoice changed since."""
+    if not invoice_pdf_is_current(invoice):
+        get_invoice_pdf(invoice)
+    return protected_file_response(
+        request, invoice.pdf, 'application/pdf',
+        modified=max(invoice.updated_at, invoice.organization.updated_at),
+        filename=f'{invoice.invoice_number}.pdf',
+    )
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@throttle_classes([RecruiterThrottle])
+def recruiter_invoice_pdf(request, pk):
+    """Recruiter: PDF of one of their organization's invoices."""
+    access = get_recruiter_access(request)
+    if not access.is_recruiter:
+        return Response({'error': 'Not a recruiter.'}, status=status.HTTP_403_FORBIDDEN)
+
+    if not access.profile_id:
+        return Response({'error': 'Profile not found.'}, status=status.HTTP_404_NOT_FOUND)
+
+    invoice = invoices_for_pdf().filter(pk=pk, organization_id=access.organization_id).first()
+    if not invoice:
+        return Response({'error': 'Invoice not found.'}, status=status.HTTP_404_NOT_FOUND)
+    return _invoice_pdf_response(request, invoice)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def admin_invoice_pdf(request, pk):
+    """Staff: PDF of any invoice."""
+    if not is_staff_or_finance(request.user):
+        return Response({'error': 'Permission denied.'}, status=status.HTTP_403_FORBIDDEN)
+
+    invoice = invoices_for_pdf().filter(pk=pk).first()
+    if not invoice:
+        return Response({'error': 'Invoice not found.'}, status=status.HTTP_404_NOT_FOUND)
+    return _invoice_pdf_response(request, invoice)
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def admin_organizations(request):